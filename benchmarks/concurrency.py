@@ -0,0 +1,58 @@
+"""
+Benchmark batch parsing sequentially, in a thread pool and in a process pool.
+
+Run with a regular and with a free-threaded (no-GIL) build of Python 3.13+:
+
+    python benchmarks/concurrency.py --documents 200 --blocks 10 --workers 4
+"""
+
+import argparse
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import logging
+import os
+import sys
+import sysconfig
+import time
+
+# synthetic documents are shared with the tests
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "tests"))
+
+from pyargdown import parse_argdown, parse_argdown_batch  # noqa: E402
+from synthetic import make_document  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--documents", type=int, default=200)
+    parser.add_argument("--blocks", type=int, default=10)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+    logging.getLogger("pyargdown").setLevel(logging.ERROR)
+
+    documents = [make_document(args.blocks, seed=i) for i in range(args.documents)]
+    gil_enabled = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print(
+        f"Python {sys.version.split()[0]}, "
+        f"free-threaded build: {bool(sysconfig.get_config_var('Py_GIL_DISABLED'))}, "
+        f"GIL enabled: {gil_enabled}, workers: {args.workers}"
+    )
+
+    # warm up parsers in the main thread
+    parse_argdown(documents[0])
+
+    def run(name, parse):
+        start = time.perf_counter()
+        argdowns = parse()
+        elapsed = time.perf_counter() - start
+        assert len(argdowns) == len(documents)
+        print(f"{name:<12} {elapsed:8.2f}s {len(documents) / elapsed:10.1f} docs/s")
+
+    run("sequential", lambda: [parse_argdown(document) for document in documents])
+    with ThreadPoolExecutor(max_workers=args.workers) as executor:
+        run("threads", lambda: parse_argdown_batch(documents, executor=executor))
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        run("processes", lambda: parse_argdown_batch(documents, executor=executor))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+Benchmark parsing a bundled corpus of realistic Argdown snippets against a stored baseline.
+
+    python benchmarks/corpus.py --repeat 20
+    python benchmarks/corpus.py --mode single_pass --update-baseline
+
+Each snippet of the offline corpus of the tests (`tests/data/snippets.jsonl`) is
+parsed as a document of its own, `--repeat` times. The benchmark reports documents per second, the median (p50) and 99th
+percentile (p99) latency per document, and the error rate, that is the share of
+documents that raise an error (or, in tolerant mode, that have diagnostics).
+Throughput and latencies worse than the baseline by more than `--threshold`
+(relative), as well as any change of the error rate, are reported as regressions,
+and the command exits with status 1. Timings depend on the machine: update the
+baseline with `--update-baseline` before comparing results on a new machine.
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import time
+
+# the corpus is shared with the tests
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "tests"))
+
+from pyargdown import parse_argdown  # noqa: E402
+from snippets import load_snippets  # noqa: E402
+
+BASELINE = os.path.join(os.path.dirname(__file__), "data", "corpus_baseline.json")
+
+MODES = {
+    "blockwise": {},
+    "single_pass": {"single_pass": True},
+    "tolerant": {"tolerant": True},
+}
+# metrics, and whether higher values are better
+METRICS = {
+    "documents_per_second": True,
+    "p50_ms": False,
+    "p99_ms": False,
+}
+
+
+def run(snippets: list[dict], mode: str = "blockwise", repeat: int = 1) -> dict:
+    "Parses the snippets `repeat` times and returns the metrics of the run"
+    kwargs = MODES[mode]
+    latencies = []
+    errors = 0
+    for _ in range(repeat):
+        for snippet in snippets:
+            start = time.perf_counter()
+            try:
+                argdown = parse_argdown(snippet["argdown"], **kwargs)
+            except Exception:
+                failed = True
+            else:
+                failed = bool(argdown.diagnostics)
+            latencies.append(time.perf_counter() - start)
+            errors += failed
+    percentiles = statistics.quantiles(latencies, n=100, method="inclusive")
+    return {
+        "documents": len(latencies),
+        "documents_per_second": len(latencies) / sum(latencies),
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": percentiles[98] * 1000,
+        "error_rate": errors / len(latencies),
+    }
+
+
+def compare(metrics: dict, baseline: dict, threshold: float) -> list[str]:
+    "Lists the regressions of the metrics with respect to the baseline"
+    regressions = []
+    for name, higher_is_better in METRICS.items():
+        change = (metrics[name] - baseline[name]) / baseline[name]
+        if (-change if higher_is_better else change) > threshold:
+            regressions.append(f"{name}: {metrics[name]:.3f} vs. baseline {baseline[name]:.3f} ({change:+.1%})")
+    if abs(metrics["error_rate"] - baseline["error_rate"]) > 1e-9:
+        regressions.append(
+            f"error_rate: {metrics['error_rate']:.3f} vs. baseline {baseline['error_rate']:.3f}"
+        )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--mode", choices=list(MODES), default="blockwise")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument("--threshold", type=float, default=0.2)
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args()
+    # illegal premise conclusion structures are logged as errors
+    logging.getLogger("pyargdown").setLevel(logging.CRITICAL)
+
+    snippets = load_snippets()
+    # warm up parsers
+    run(snippets, args.mode)
+    metrics = run(snippets, args.mode, args.repeat)
+    print(
+        f"{args.mode:<12} {metrics['documents']:6d} docs {metrics['documents_per_second']:8.1f} docs/s "
+        f"p50 {metrics['p50_ms']:6.2f} ms  p99 {metrics['p99_ms']:6.2f} ms  "
+        f"errors {metrics['error_rate']:6.1%}"
+    )
+
+    baselines = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            baselines = json.load(f)
+    if args.update_baseline:
+        baselines[args.mode] = {"python": platform.python_version(), **metrics}
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(baselines, f, indent=2)
+            f.write("\n")
+        print(f"updated baseline {args.baseline}")
+        return
+    if args.mode not in baselines:
+        print(f"no baseline for mode {args.mode} in {args.baseline}")
+        return
+    regressions = compare(metrics, baselines[args.mode], args.threshold)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    if regressions:
+        sys.exit(1)
+    print(f"no regressions beyond {args.threshold:.0%} of the baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Benchmark full parsing against topology-only parsing (no texts and yaml data).
+
+    python benchmarks/topology.py --documents 50 --blocks 20
+"""
+
+import argparse
+import logging
+import os
+import pickle
+import sys
+import time
+import tracemalloc
+
+# synthetic documents are shared with the tests
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "tests"))
+
+from pyargdown import parse_argdown  # noqa: E402
+from synthetic import make_document  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--documents", type=int, default=50)
+    parser.add_argument("--blocks", type=int, default=20)
+    args = parser.parse_args()
+    logging.getLogger("pyargdown").setLevel(logging.ERROR)
+
+    documents = [make_document(args.blocks, seed=i) for i in range(args.documents)]
+    # warm up parsers
+    parse_argdown(documents[0])
+
+    def run(name, **kwargs):
+        start = time.perf_counter()
+        argdowns = [parse_argdown(document, **kwargs) for document in documents]
+        elapsed = time.perf_counter() - start
+
+        tracemalloc.start()
+        for document in documents:
+            parse_argdown(document, **kwargs)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        size = sum(len(pickle.dumps(argdown)) for argdown in argdowns) / len(argdowns)
+        print(
+            f"{name:<14} {elapsed:8.2f}s {len(documents) / elapsed:8.1f} docs/s "
+            f"peak {peak / 2**20:7.1f} MiB  map {size / 2**10:7.1f} KiB"
+        )
+        return argdowns
+
+    full = run("full")
+    topology = run("topology only", topology_only=True)
+    for argdown, expected in zip(topology, full):
+        assert list(argdown.nodes) == list(expected.nodes)
+        assert list(argdown.edges(keys=True)) == list(expected.edges(keys=True))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,12 @@
 
-from pyargdown.parser.main import parse_argdown
+from pyargdown.parser.main import parse_argdown, parse_argdown_batch, stream_argdown
+from pyargdown.parser.lazy import LazyArgdown
 from pyargdown.model import *
+from pyargdown.diff import ArgdownDiff, diff_argdown
+from pyargdown.writer import dump_argdown, write_argdown
+from pyargdown.memory import MemoryProfile
+from pyargdown.handler import ArgdownHandler
+from pyargdown.parser.limits import ArgdownLimitError, ParseLimits
 
 __all__ = [
     "Argdown",
@@ -0,0 +1,219 @@
+"Closure of axiomatic entailment and contradiction between propositions"
+
+from typing import TYPE_CHECKING, Iterator
+
+import networkx as nx  # type: ignore
+
+if TYPE_CHECKING:
+    from pyargdown.model import Valence
+
+
+def _iter_bits(bits: int) -> Iterator[int]:
+    while bits:
+        low = bits & -bits
+        yield low.bit_length() - 1
+        bits ^= low
+
+
+class AxiomaticClosure:
+    """
+    Index over AXIOMATIC relations between propositions.
+
+    Support relations are read as entailment, attack and contradict relations
+    as (symmetric) contradiction. Relations are registered incrementally as
+    edges are added to or removed from an argument map; queries are answered
+    from a cached closure that is rebuilt lazily after changes. The closure
+    condenses strongly connected components of the entailment graph and stores
+    reachability and contradiction sets as bitsets per component, so that
+    `entails` and `contradicts` are O(1) lookups.
+
+    If `transitive` is False, only direct relations are taken into account.
+    """
+
+    def __init__(self, transitive: bool = True):
+        self.transitive = transitive
+        self._relations: set[tuple[str, str, "Valence"]] = set()
+        self._support: dict[str, dict[str, None]] = {}
+        self._supported_by: dict[str, dict[str, None]] = {}
+        self._conflict: dict[str, dict[str, int]] = {}
+        self._dirty = True
+        self._component: dict[str, int] = {}
+        self._members: list[list[str]] = []
+        self._reach: list[int] = []
+        self._ancestors: list[int] = []
+        self._conflicts: list[int] = []
+
+    def __len__(self) -> int:
+        return len(self._relations)
+
+    def add_relation(self, source: str, target: str, valence: "Valence"):
+        """
+        Registers an axiomatic relation between two propositions.
+        Relations with valence UNDERCUT are ignored.
+        """
+        key = (source, target, valence)
+        if key in self._relations or valence.name == "UNDERCUT":
+            return
+        self._relations.add(key)
+        if valence.name == "SUPPORT":
+            self._support.setdefault(source, {})[target] = None
+            self._supported_by.setdefault(target, {})[source] = None
+        else:
+            for a, b in ((source, target), (target, source)):
+                counts = self._conflict.setdefault(a, {})
+                counts[b] = counts.get(b, 0) + 1
+                if a == b:
+                    break
+        self._dirty = True
+
+    def discard_relation(self, source: str, target: str, valence: "Valence"):
+        """
+        Removes an axiomatic relation, if registered.
+        """
+        key = (source, target, valence)
+        if key not in self._relations:
+            return
+        self._relations.remove(key)
+        if valence.name == "SUPPORT":
+            del self._support[source][target]
+            if not self._support[source]:
+                del self._support[source]
+            del self._supported_by[target][source]
+            if not self._supported_by[target]:
+                del self._supported_by[target]
+        else:
+            for a, b in ((source, target), (target, source)):
+                counts = self._conflict[a]
+                counts[b] -= 1
+                if not counts[b]:
+                    del counts[b]
+                if not counts:
+                    del self._conflict[a]
+                if a == b:
+                    break
+        self._dirty = True
+
+    def _build(self):
+        graph = nx.DiGraph()
+        graph.add_nodes_from(self._support)
+        graph.add_nodes_from(self._conflict)
+        for source, targets in self._support.items():
+            graph.add_edges_from((source, target) for target in targets)
+        condensed = nx.condensation(graph)
+        order = list(nx.topological_sort(condensed))
+        n = len(order)
+
+        reach = [0] * n
+        for c in reversed(order):
+            bits = 1 << c
+            for d in condensed.successors(c):
+                bits |= reach[d]
+            reach[c] = bits
+        ancestors = [0] * n
+        for c in order:
+            bits = 1 << c
+            for d in condensed.predecessors(c):
+                bits |= ancestors[d]
+            ancestors[c] = bits
+
+        component = condensed.graph["mapping"]
+        direct = [0] * n
+        for a, others in self._conflict.items():
+            for b in others:
+                direct[component[a]] |= 1 << component[b]
+        # propositions contradicted by some consequence of c ...
+        contradicted = [0] * n
+        for c in reversed(order):
+            bits = direct[c]
+            for d in condensed.successors(c):
+                bits |= contradicted[d]
+            contradicted[c] = bits
+        # ... are contradicted, together with everything that entails them
+        conflicts = [0] * n
+        for c in range(n):
+            bits = 0
+            for d in _iter_bits(contradicted[c]):
+                bits |= ancestors[d]
+            conflicts[c] = bits
+
+        self._component = component
+        self._members = [sorted(condensed.nodes[c]["members"]) for c in range(n)]
+        self._reach = reach
+        self._ancestors = ancestors
+        self._conflicts = conflicts
+        self._dirty = False
+
+    def _ensure_built(self):
+        if self.transitive and self._dirty:
+            self._build()
+
+    def _labels(self, bits: int) -> Iterator[str]:
+        for c in _iter_bits(bits):
+            yield from self._members[c]
+
+    def entails(self, source: str, target: str) -> bool:
+        """
+        Checks whether `source` (axiomatically) entails `target`.
+        Every proposition entails itself.
+        """
+        if source == target:
+            return True
+        if not self.transitive:
+            return target in self._support.get(source, {})
+        self._ensure_built()
+        cs = self._component.get(source)
+        ct = self._component.get(target)
+        if cs is None or ct is None:
+            return False
+        return bool(self._reach[cs] >> ct & 1)
+
+    def contradicts(self, source: str, target: str) -> bool:
+        """
+        Checks whether `source` and `target` (axiomatically) contradict each other.
+        """
+        if not self.transitive:
+            return target in self._conflict.get(source, {})
+        self._ensure_built()
+        cs = self._component.get(source)
+        ct = self._component.get(target)
+        if cs is None or ct is None:
+            return False
+        return bool(self._conflicts[cs] >> ct & 1)
+
+    def consequences(self, label: str) -> Iterator[str]:
+        """
+        Yields all propositions entailed by `label`, including `label` itself.
+        """
+        yield label
+        if not self.transitive:
+            yield from (other for other in self._support.get(label, {}) if other != label)
+            return
+        self._ensure_built()
+        c = self._component.get(label)
+        if c is not None:
+            yield from (other for other in self._labels(self._reach[c]) if other != label)
+
+    def antecedents(self, label: str) -> Iterator[str]:
+        """
+        Yields all propositions entailing `label`, including `label` itself.
+        """
+        yield label
+        if not self.transitive:
+            yield from (other for other in self._supported_by.get(label, {}) if other != label)
+            return
+        self._ensure_built()
+        c = self._component.get(label)
+        if c is not None:
+            yield from (other for other in self._labels(self._ancestors[c]) if other != label)
+
+    def conflicts(self, label: str) -> Iterator[str]:
+        """
+        Yields all propositions contradicting `label`.
+        """
+        if not self.transitive:
+            yield from self._conflict.get(label, {})
+            return
+        self._ensure_built()
+        c = self._component.get(label)
+        if c is not None:
+            yield from self._labels(self._conflicts[c])
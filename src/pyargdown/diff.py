@@ -0,0 +1,115 @@
+"Structural differences between two argument maps"
+
+from dataclasses import dataclass, field
+
+from pyargdown.model import Argdown, Argument, Proposition, Valence
+
+_RelationKey = tuple[str, str, Valence]
+
+
+@dataclass
+class ArgdownDiff:
+    """
+    Differences between an old and a new argument map. Propositions and arguments
+    are identified by label, dialectical relations by (source, target, valence).
+    A node that is a proposition in one map and an argument in the other is
+    reported as removed and added.
+    """
+    added_propositions: list[str] = field(default_factory=list)
+    removed_propositions: list[str] = field(default_factory=list)
+    changed_propositions: list[str] = field(default_factory=list)
+    added_arguments: list[str] = field(default_factory=list)
+    removed_arguments: list[str] = field(default_factory=list)
+    changed_arguments: list[str] = field(default_factory=list)
+    # changed arguments whose premise conclusion structures differ
+    changed_pcs: list[str] = field(default_factory=list)
+    added_relations: list[_RelationKey] = field(default_factory=list)
+    removed_relations: list[_RelationKey] = field(default_factory=list)
+    changed_relations: list[_RelationKey] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return any(bool(changes) for changes in vars(self).values())
+
+
+def _nodes_by_type(argdown: Argdown) -> dict[str, dict[str, dict]]:
+    nodes: dict[str, dict[str, dict]] = {Proposition.__name__: {}, Argument.__name__: {}}
+    for label, data in argdown.nodes(data=True):  # type: ignore
+        nodes[data["type"]][label] = data
+    return nodes
+
+
+def _edge_payload(data: dict, include_grounded: bool) -> tuple[frozenset[str], dict]:
+    dialectics = frozenset(data["dialectics"])
+    if not include_grounded:
+        dialectics -= {"GROUNDED"}
+    return dialectics, data["data"]
+
+
+def _diff_nodes(
+    old: dict[str, dict], new: dict[str, dict]
+) -> tuple[list[str], list[str], list[str]]:
+    added = [label for label in new if label not in old]
+    removed = [label for label in old if label not in new]
+    changed = [
+        label for label, data in new.items()
+        if label in old and old[label] != data
+    ]
+    return added, removed, changed
+
+
+def diff_argdown(old: Argdown, new: Argdown, include_grounded: bool = True) -> ArgdownDiff:
+    """
+    Computes the structural differences between two argument maps.
+
+    Nodes and edges are matched through the label and edge indexes of both maps
+    and compared by their payloads, so the diff takes time linear in the size of
+    the maps. Texts, gists and dialectical types are compared as sets.
+
+    Args:
+        old (Argdown): The argument map to compare against, e.g. a reference map.
+        new (Argdown): The argument map to compare.
+        include_grounded (bool): If False, relations that are merely grounded are
+            ignored, and relations only differing in being grounded count as equal.
+
+    Returns:
+        ArgdownDiff: Labels of added, removed and changed propositions and
+            arguments, and keys of added, removed and changed relations.
+    """
+    diff = ArgdownDiff()
+
+    old_nodes = _nodes_by_type(old)
+    new_nodes = _nodes_by_type(new)
+    (
+        diff.added_propositions, diff.removed_propositions, diff.changed_propositions
+    ) = _diff_nodes(old_nodes[Proposition.__name__], new_nodes[Proposition.__name__])
+    (
+        diff.added_arguments, diff.removed_arguments, diff.changed_arguments
+    ) = _diff_nodes(old_nodes[Argument.__name__], new_nodes[Argument.__name__])
+    diff.changed_pcs = [
+        label for label in diff.changed_arguments
+        if old_nodes[Argument.__name__][label]["pcs"] != new_nodes[Argument.__name__][label]["pcs"]
+    ]
+
+    old_edges = {
+        (s, t, key): _edge_payload(data, include_grounded)
+        for s, t, key, data in old.edges(keys=True, data=True)  # type: ignore
+    }
+    new_edges = {
+        (s, t, key): _edge_payload(data, include_grounded)
+        for s, t, key, data in new.edges(keys=True, data=True)  # type: ignore
+    }
+    if not include_grounded:
+        old_edges = {edge: payload for edge, payload in old_edges.items() if payload[0]}
+        new_edges = {edge: payload for edge, payload in new_edges.items() if payload[0]}
+    diff.added_relations = [
+        (s, t, Valence[key]) for (s, t, key) in new_edges if (s, t, key) not in old_edges
+    ]
+    diff.removed_relations = [
+        (s, t, Valence[key]) for (s, t, key) in old_edges if (s, t, key) not in new_edges
+    ]
+    diff.changed_relations = [
+        (s, t, Valence[key]) for (s, t, key), payload in new_edges.items()
+        if (s, t, key) in old_edges and old_edges[s, t, key] != payload
+    ]
+
+    return diff
@@ -0,0 +1,92 @@
+"Canonical content hashes of argument maps"
+
+import hashlib
+import json
+from typing import Any
+
+import networkx as nx  # type: ignore
+
+_MODULUS = 1 << 256
+
+
+def _encode(value: Any) -> str:
+    """
+    Canonical string encoding of yaml-like data. Keys of dicts are sorted by
+    their encoding, so that dicts (and the ordered sets of texts and gists)
+    are encoded independently of insertion order.
+    """
+    if isinstance(value, dict):
+        items = sorted(f"{_encode(k)}:{_encode(v)}" for k, v in value.items())
+        return "{" + ",".join(items) + "}"
+    if isinstance(value, (list, tuple)):
+        return "[" + ",".join(_encode(v) for v in value) + "]"
+    return json.dumps(value, default=str, ensure_ascii=False)
+
+
+def _digest(*parts: Any) -> int:
+    encoded = _encode(list(parts)).encode("utf-8")
+    return int.from_bytes(hashlib.sha256(encoded).digest(), "big")
+
+
+class MerkleFingerprint:
+    """
+    Content hash of an argument map, composed of subhashes of its nodes and edges.
+
+    A node hash covers label, type, texts or gists (as sets), inline data and PCS;
+    an edge hash covers source, target, valence, dialectical types (as a set)
+    and data. The fingerprint of the map is the hash of the sum of all node and
+    edge hashes modulo 2**256, and thus independent of the order in which nodes
+    and edges have been added. The owning argument map marks nodes and edges
+    as changed; only these are rehashed when the fingerprint is requested next.
+    """
+
+    def __init__(self):
+        self._nodes: dict[str, int] = {}
+        self._edges: dict[tuple[str, str, str], int] = {}
+        self._dirty_nodes: dict[str, None] = {}
+        self._dirty_edges: dict[tuple[str, str, str], None] = {}
+        self._sum = 0
+
+    def mark_node(self, label: str):
+        self._dirty_nodes[label] = None
+
+    def mark_edge(self, source: str, target: str, key: str):
+        self._dirty_edges[(source, target, key)] = None
+
+    def _refresh(self, graph: nx.MultiDiGraph):
+        for label in self._dirty_nodes:
+            self._sum -= self._nodes.pop(label, 0)
+            if label in graph.nodes:
+                data = graph.nodes[label]
+                texts = data.get("texts", data.get("gists", {}))
+                digest = _digest(
+                    "node", label, data["type"], dict.fromkeys(texts), data["data"], data.get("pcs")
+                )
+                self._nodes[label] = digest
+                self._sum += digest
+        for edge in self._dirty_edges:
+            self._sum -= self._edges.pop(edge, 0)
+            data = graph.get_edge_data(*edge)
+            if data is not None:
+                digest = _digest(
+                    "edge", *edge, sorted(data["dialectics"]), data["data"]
+                )
+                self._edges[edge] = digest
+                self._sum += digest
+        self._sum %= _MODULUS
+        self._dirty_nodes = {}
+        self._dirty_edges = {}
+
+    def hexdigest(self, graph: nx.MultiDiGraph) -> str:
+        self._refresh(graph)
+        return hashlib.sha256(self._sum.to_bytes(32, "big")).hexdigest()
+
+    def node_hexdigest(self, graph: nx.MultiDiGraph, label: str) -> str | None:
+        self._refresh(graph)
+        digest = self._nodes.get(label)
+        return None if digest is None else digest.to_bytes(32, "big").hex()
+
+    def edge_hexdigest(self, graph: nx.MultiDiGraph, source: str, target: str, key: str) -> str | None:
+        self._refresh(graph)
+        digest = self._edges.get((source, target, key))
+        return None if digest is None else digest.to_bytes(32, "big").hex()
@@ -0,0 +1,62 @@
+"Handlers of the propositions, arguments and relations found while parsing"
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from pyargdown.model import ArgdownEdge, Argument, Proposition, PropositionReference
+
+
+class ArgdownHandler:
+    """
+    Receives the items of Argdown codeblocks as they are parsed, in document
+    order, from the transformers of the parsers (see `stream_argdown`). Every
+    argument map (`Argdown`) is a handler that adds the items to itself;
+    subclasses may instead stream them into a store of their own.
+
+    - `on_proposition`: a proposition is mentioned, with the texts and data
+      of this mention (a proposition is reported once per mention)
+    - `on_argument`: an argument is mentioned, with gists, data and (in
+      argument codeblocks) its premise conclusion structure
+    - `on_pcs_item`: a premise or conclusion of an argument
+    - `on_relation`: a dialectical relation (SKETCHED or AXIOMATIC) is stated
+    - `on_error`: a codeblock cannot be parsed or handled; items of the codeblock
+      may have been reported already
+
+    Propositions and arguments are reported before any relation between them,
+    and the propositions of an argument's premises and conclusions before the
+    argument, whose PCS items follow right after it. All methods do nothing,
+    except for `on_error`, which raises the error.
+
+    Subclasses that define `__init__` must call `super().__init__()`.
+    """
+
+    def __init__(self, *args, **kwargs):
+        # passed on, as argument maps are also networkx graphs
+        super().__init__(*args, **kwargs)
+        # last number appended to each label by `make_label_unique`
+        self._label_numbers: dict[str, int] = {}
+
+    def make_label_unique(self, label: str) -> str:
+        """
+        Makes a label generated for an unlabeled item unique by appending a
+        number to it, if it has been generated before. Labels of the document
+        are not taken into account.
+        """
+        i = self._label_numbers.get(label, -1) + 1
+        self._label_numbers[label] = i
+        return label if i == 0 else f"{label}_{i}"
+
+    def on_proposition(self, proposition: "Proposition"):
+        pass
+
+    def on_argument(self, argument: "Argument"):
+        pass
+
+    def on_pcs_item(self, argument_label: str, item: "PropositionReference"):
+        pass
+
+    def on_relation(self, edge: "ArgdownEdge"):
+        pass
+
+    def on_error(self, error: Exception):
+        raise error
@@ -0,0 +1,143 @@
+"Inverted indexes for structural queries on argument maps"
+
+from typing import TYPE_CHECKING, Iterator
+
+if TYPE_CHECKING:
+    from pyargdown.model import PropositionReference
+
+_EdgeKey = tuple[str, str, str]
+
+
+class StructuralIndex:
+    """
+    Inverted indexes over the premise conclusion structures and the
+    dialectical relations of an argument map.
+
+    Premises and conclusions are indexed by proposition label, edges
+    (source, target, key) by valence, dialectical type and by source
+    or target together with valence. The owning argument map keeps the
+    index in sync by calling `index_argument` and `index_edge` whenever
+    a PCS or an edge changes.
+    """
+
+    def __init__(self):
+        self._pcs: dict[str, tuple[list[str], list[str]]] = {}
+        self._premise_users: dict[str, dict[str, None]] = {}
+        self._concluding: dict[str, dict[str, None]] = {}
+        self._finally_concluding: dict[str, dict[str, None]] = {}
+        self._edges: dict[_EdgeKey, tuple[str, ...]] = {}
+        self._by_valence: dict[str, dict[_EdgeKey, None]] = {}
+        self._by_dialectic: dict[str, dict[_EdgeKey, None]] = {}
+        self._into: dict[tuple[str, str], dict[_EdgeKey, None]] = {}
+        self._out_of: dict[tuple[str, str], dict[_EdgeKey, None]] = {}
+
+    @staticmethod
+    def _add(index: dict, key, item):
+        index.setdefault(key, {})[item] = None
+
+    @staticmethod
+    def _discard(index: dict, key, item):
+        items = index.get(key)
+        if items is None:
+            return
+        items.pop(item, None)
+        if not items:
+            del index[key]
+
+    def index_argument(self, label: str, pcs: "list[PropositionReference]"):
+        """
+        (Re-)indexes the premise conclusion structure of argument `label`.
+        """
+        # avoid circular import
+        from pyargdown.model import Conclusion
+
+        self.unindex_argument(label)
+        premises = [pr.proposition_label for pr in pcs if not isinstance(pr, Conclusion)]
+        conclusions = [pr.proposition_label for pr in pcs if isinstance(pr, Conclusion)]
+        self._pcs[label] = (premises, conclusions)
+        for prop_label in premises:
+            self._add(self._premise_users, prop_label, label)
+        for prop_label in conclusions:
+            self._add(self._concluding, prop_label, label)
+        if pcs and isinstance(pcs[-1], Conclusion):
+            self._add(self._finally_concluding, pcs[-1].proposition_label, label)
+
+    def unindex_argument(self, label: str):
+        premises, conclusions = self._pcs.pop(label, ([], []))
+        for prop_label in premises:
+            self._discard(self._premise_users, prop_label, label)
+        for prop_label in conclusions:
+            self._discard(self._concluding, prop_label, label)
+            self._discard(self._finally_concluding, prop_label, label)
+
+    def index_edge(self, source: str, target: str, key: str, dialectics: list[str] | None):
+        """
+        (Re-)indexes edge (source, target, key), whose key is the name of its valence.
+        `dialectics` is None if the edge has been removed.
+        """
+        edge = (source, target, key)
+        old_dialectics = self._edges.pop(edge, None)
+        if old_dialectics is not None:
+            self._discard(self._by_valence, key, edge)
+            self._discard(self._into, (target, key), edge)
+            self._discard(self._out_of, (source, key), edge)
+            for dialectic in old_dialectics:
+                self._discard(self._by_dialectic, dialectic, edge)
+        if dialectics is None:
+            return
+        self._edges[edge] = tuple(dialectics)
+        self._add(self._by_valence, key, edge)
+        self._add(self._into, (target, key), edge)
+        self._add(self._out_of, (source, key), edge)
+        for dialectic in dialectics:
+            self._add(self._by_dialectic, dialectic, edge)
+
+    def premise_users(self, label: str) -> list[str]:
+        return list(self._premise_users.get(label, {}))
+
+    def concluding(self, label: str, final_only: bool = False) -> list[str]:
+        index = self._finally_concluding if final_only else self._concluding
+        return list(index.get(label, {}))
+
+    def edges(
+        self,
+        source: str | None = None,
+        target: str | None = None,
+        valence: str | None = None,
+        dialectic: str | None = None,
+    ) -> Iterator[_EdgeKey]:
+        """
+        Yields the keys of all edges that match the given criteria, using
+        the most selective index available for the combination of criteria.
+        """
+        # avoid circular import
+        from pyargdown.model import Valence
+
+        if valence is None and (source is not None or target is not None):
+            for v in Valence:
+                yield from self.edges(source, target, v.name, dialectic)
+            return
+
+        candidates: dict[_EdgeKey, None] | dict[_EdgeKey, tuple[str, ...]]
+        if source is not None and target is not None and valence is not None:
+            edge = (source, target, valence)
+            candidates = {edge: None} if edge in self._edges else {}
+        elif target is not None and valence is not None:
+            candidates = self._into.get((target, valence), {})
+        elif source is not None and valence is not None:
+            candidates = self._out_of.get((source, valence), {})
+        elif dialectic is not None:
+            candidates = self._by_dialectic.get(dialectic, {})
+        elif valence is not None:
+            candidates = self._by_valence.get(valence, {})
+        else:
+            candidates = self._edges
+        for edge in candidates:
+            s, t, key = edge
+            if (
+                (source is None or s == source)
+                and (target is None or t == target)
+                and (valence is None or key == valence)
+                and (dialectic is None or dialectic in self._edges[edge])
+            ):
+                yield edge
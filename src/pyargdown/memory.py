@@ -0,0 +1,191 @@
+"Memory accounting of argument maps and memory profiles of parsing"
+
+import enum
+import sys
+import threading
+import tracemalloc
+import types
+from contextlib import nullcontext
+from typing import Any, ContextManager, NamedTuple
+
+# objects that are shared globally rather than owned by an argument map
+_SHARED = (type, enum.Enum, types.ModuleType, types.FunctionType, types.BuiltinFunctionType)
+_ATOMIC = (str, bytes, int, float, complex, bool, type(None))
+
+
+class _Sizer:
+    """
+    Sums up the sizes of objects and of everything they refer to, counting each
+    object only once across calls, so that consecutive calls attribute shared
+    objects to the first caller.
+    """
+
+    def __init__(self):
+        self._seen: set[int] = set()
+
+    def size(self, *objects: Any) -> int:
+        total = 0
+        stack = list(objects)
+        while stack:
+            obj = stack.pop()
+            if id(obj) in self._seen or isinstance(obj, _SHARED):
+                continue
+            self._seen.add(id(obj))
+            total += sys.getsizeof(obj, 0)
+            if isinstance(obj, _ATOMIC):
+                continue
+            if isinstance(obj, dict):
+                stack.extend(obj.keys())
+                stack.extend(obj.values())
+            elif isinstance(obj, (list, tuple, set, frozenset)):
+                stack.extend(obj)
+            else:
+                if hasattr(obj, "__dict__"):
+                    stack.append(vars(obj))
+                for slot in getattr(type(obj), "__slots__", ()):
+                    if hasattr(obj, slot):
+                        stack.append(getattr(obj, slot))
+        return total
+
+
+class StageMemory(NamedTuple):
+    """
+    Memory traced in a stage of parsing: the number of `calls` of the stage,
+    the bytes `allocated` by the stage and still allocated at its end (summed
+    over calls, possibly negative), and the `peak` of bytes allocated beyond
+    the start of the stage (maximum over calls).
+    """
+    calls: int = 0
+    allocated: int = 0
+    peak: int = 0
+
+
+class _Frame:
+    __slots__ = ("name", "start", "peak")
+
+    def __init__(self, name: str, start: int):
+        self.name = name
+        self.start = start
+        self.peak = 0
+
+
+_local = threading.local()
+
+
+class MemoryProfile:
+    """
+    Profile of the memory allocated in the stages of `parse_argdown`, traced with
+    `tracemalloc` while the profile is active:
+
+        with MemoryProfile() as profile:
+            argdown = parse_argdown(document)
+        print(profile.format())
+
+    The stages are "split" (into codeblocks), "preprocess", "parse" (Lark
+    trees, or whole documents in a single pass), and, for each ingested
+    codeblock, "deepcopy" (of the argument map), "transform" (of the parse tree
+    into the map) and "grounding" (of dialectical relations). Only stages run in
+    the thread that activated the profile are recorded, not those run in
+    other threads or processes. Allocations of nested stages are included in the
+    enclosing stage, their peaks are not.
+
+    `top_allocations` lists the `top` source lines that allocated the most memory
+    still allocated at the end of the profile (none if `top` is 0).
+    """
+
+    def __init__(self, top: int = 10):
+        self.top = top
+        self.stages: dict[str, StageMemory] = {}
+        self.peak = 0
+        self.top_allocations: list[tracemalloc.StatisticDiff] = []
+        self._frames: list[_Frame] = []
+        self._started = False
+        self._start = 0
+        self._snapshot: tracemalloc.Snapshot | None = None
+
+    def __enter__(self) -> "MemoryProfile":
+        if getattr(_local, "profile", None) is not None:
+            raise RuntimeError("A memory profile is already active in this thread.")
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started = True
+        if self.top:
+            self._snapshot = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        self._start = tracemalloc.get_traced_memory()[0]
+        _local.profile = self
+        return self
+
+    def __exit__(self, *exc_info):
+        _local.profile = None
+        current, peak = tracemalloc.get_traced_memory()
+        self.peak = max(self.peak, peak - self._start)
+        if self._snapshot is not None:
+            snapshot = tracemalloc.take_snapshot().filter_traces(
+                [tracemalloc.Filter(False, tracemalloc.__file__)]
+            )
+            self.top_allocations = snapshot.compare_to(self._snapshot, "lineno")[:self.top]
+            self._snapshot = None
+        if self._started:
+            tracemalloc.stop()
+            self._started = False
+
+    def _fold_peak(self):
+        "Accounts the peak since the last reset to the innermost stage and the profile"
+        current, peak = tracemalloc.get_traced_memory()
+        self.peak = max(self.peak, peak - self._start)
+        if self._frames:
+            frame = self._frames[-1]
+            frame.peak = max(frame.peak, peak - frame.start)
+        tracemalloc.reset_peak()
+        return current
+
+    def _enter_stage(self, name: str):
+        self._frames.append(_Frame(name, self._fold_peak()))
+
+    def _exit_stage(self):
+        current = self._fold_peak()
+        frame = self._frames.pop()
+        calls, allocated, peak = self.stages.get(frame.name, StageMemory())
+        self.stages[frame.name] = StageMemory(
+            calls + 1, allocated + current - frame.start, max(peak, frame.peak)
+        )
+
+    def format(self) -> str:
+        "Formats the profile as a table"
+        lines = [f"{'stage':<12}{'calls':>8}{'allocated':>14}{'peak':>14}"]
+        for name, (calls, allocated, peak) in self.stages.items():
+            lines.append(f"{name:<12}{calls:>8}{allocated:>14,}{peak:>14,}")
+        lines.append(f"{'total peak':<20}{self.peak:>28,}")
+        if self.top_allocations:
+            lines.append("")
+            lines.extend(str(statistic) for statistic in self.top_allocations)
+        return "\n".join(lines)
+
+
+class _Stage:
+    __slots__ = ("profile", "name")
+
+    def __init__(self, profile: MemoryProfile, name: str):
+        self.profile = profile
+        self.name = name
+
+    def __enter__(self):
+        self.profile._enter_stage(self.name)
+
+    def __exit__(self, *exc_info):
+        self.profile._exit_stage()
+
+
+_NO_STAGE = nullcontext()
+
+
+def profile_stage(name: str) -> ContextManager:
+    """
+    Context manager that records a stage of parsing in the memory profile active
+    in the current thread, if any.
+    """
+    profile = getattr(_local, "profile", None)
+    if profile is None:
+        return _NO_STAGE
+    return _Stage(profile, name)
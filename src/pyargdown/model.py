@@ -5,12 +5,29 @@ from copy import deepcopy
 from dataclasses import dataclass, field, asdict
 import enum
 import logging
-from typing import Sequence
+import re
+from typing import TYPE_CHECKING, Iterable, Sequence
 
 import networkx as nx  # type: ignore
 
+from pyargdown.closure import AxiomaticClosure
+from pyargdown.fingerprint import MerkleFingerprint
+from pyargdown.handler import ArgdownHandler
+from pyargdown.index import StructuralIndex
+from pyargdown.memory import _Sizer
+
+if TYPE_CHECKING:
+    from pyargdown.parser.base import ArgdownDiagnostic
+    from pyargdown.sourcemap import SourceMap
+
 logger = logging.getLogger(__name__)
 
+# labels generated by the parser for unlabeled propositions and arguments,
+# possibly made unique by appending numbers
+_GENERATED_LABEL_PATTERN = re.compile(
+    r"^(.*UNNAMED_(?:ARGUMENT|PROPOSITION|(?:PREMISE|CONCLUSION)_[A-Z]*\d+))(?:_\d+)*$"
+)
+
 
 class Valence(enum.Enum):
     SUPPORT = enum.auto()
@@ -36,6 +53,13 @@ class Proposition:
     data: dict = field(default_factory=dict)
     type: str = "Proposition"
 
+    @staticmethod
+    def from_dict(data: dict) -> "Proposition":
+        data = dict(data)
+        if "texts" in data:
+            data["texts"] = list(data["texts"])
+        return Proposition(**data)
+
 
 @dataclass
 class PropositionReference:
@@ -60,6 +84,8 @@ class Argument:
     @staticmethod
     def from_dict(data: dict) -> "Argument":
         data = deepcopy(data)
+        if "gists" in data:
+            data["gists"] = list(data["gists"])
         if "pcs" in data:
             pcs = []
             for pr in data["pcs"]:
@@ -117,7 +143,20 @@ class ArgdownEdge:
         return ArgdownEdge(**data)
 
 
-class Argdown(ABC):
+class Argdown(ArgdownHandler, ABC):
+    """
+    An argument map. As an `ArgdownHandler`, it adds the propositions, arguments
+    and relations reported by the parsers to itself, uniting them by label.
+    """
+
+    def on_proposition(self, proposition: Proposition):
+        self.add_proposition(proposition, allow_exists=True)
+
+    def on_argument(self, argument: Argument):
+        self.add_argument(argument, allow_exists=True)
+
+    def on_relation(self, edge: ArgdownEdge):
+        self.add_dialectical_relation(edge)
 
     @abstractmethod
     def add_proposition(self, proposition: Proposition, allow_exists: bool = False, **kwargs):
@@ -199,6 +238,61 @@ class Argdown(ABC):
         Gets a dialectical relation from the argument map.
         """
 
+    @abstractmethod
+    def arguments_using_premise(self, label: str) -> list[str]:
+        """
+        Returns the labels of all arguments that use proposition `label` as a premise.
+        """
+
+    @abstractmethod
+    def arguments_concluding(self, label: str, final_only: bool = False) -> list[str]:
+        """
+        Returns the labels of all arguments that have proposition `label` as a
+        conclusion (or as final conclusion, if `final_only`).
+        """
+
+    @abstractmethod
+    def find_dialectical_relations(
+        self,
+        source: str | None = None,
+        target: str | None = None,
+        valence: Valence | None = None,
+        dialectic: DialecticalType | None = None,
+    ) -> list[ArgdownEdge]:
+        """
+        Returns all dialectical relations that match the given source, target,
+        valence and dialectical type (criteria that are None match any relation).
+        """
+
+    @abstractmethod
+    def merge(self, other: "Argdown", **kwargs) -> dict[str, str]:
+        """
+        Merges another argument map into this one. Propositions and arguments are
+        united by label as in `update_proposition` and `update_argument`, relations
+        are united by source, target and valence. Labels generated for unlabeled
+        items in `other` that collide with existing labels are renamed.
+        Returns a mapping of renamed labels.
+        """
+
+    @abstractmethod
+    def fingerprint(self) -> str:
+        """
+        Returns a canonical content hash of the argument map, which is independent
+        of the order in which propositions, arguments and relations were added.
+        """
+
+    @abstractmethod
+    def node_fingerprint(self, label: str) -> str | None:
+        """
+        Returns the content hash of proposition or argument `label`, if it exists.
+        """
+
+    @abstractmethod
+    def relation_fingerprint(self, source: str, target: str, valence: Valence) -> str | None:
+        """
+        Returns the content hash of a dialectical relation, if it exists.
+        """
+
     @abstractmethod
     def make_label_unique(self, label: str) -> str:
         """
@@ -211,6 +305,13 @@ class Argdown(ABC):
         Checks if the PCS of an argument is legal, returns optional error message
         """
 
+    @abstractmethod
+    def memory_usage(self) -> dict[str, int]:
+        """
+        Returns the approximate number of bytes the argument map occupies, broken
+        down by category, together with the "total".
+        """
+
     @abstractmethod
     def _update(self):
         """
@@ -241,9 +342,32 @@ class Argdown(ABC):
 
 
 
+def _ordered_set(items) -> dict:
+    """
+    Returns an insertion-ordered set of items, represented as the keys of a dict.
+    Used for proposition texts and argument gists in node payloads, so that
+    repeated mentions are deduplicated in O(1) with a stable order.
+    """
+    return dict.fromkeys(items)
+
+
 class ArgdownMultiDiGraph(Argdown, nx.MultiDiGraph):
-    def __init__(self):
+    # document positions of nodes and relations, if recorded while parsing
+    source_map: "SourceMap | None" = None
+    # problems found when parsing in tolerant mode
+    diagnostics: "list[ArgdownDiagnostic] | None" = None
+
+    def __init__(self, axiomatic_closure: bool = True):
+        """
+        Args:
+            axiomatic_closure (bool): Whether grounding takes chains of axiomatic
+                relations between propositions into account (e.g. [A] entails [B]
+                entails [C]), or only direct axiomatic relations.
+        """
         super().__init__()
+        self._axiomatic = AxiomaticClosure(transitive=axiomatic_closure)
+        self._index = StructuralIndex()
+        self._fingerprint = MerkleFingerprint()
 
     def add_proposition(self, proposition: Proposition, allow_exists: bool = False, **kwargs):
         if proposition.label is not None and proposition.label in self.nodes:
@@ -254,15 +378,18 @@ class ArgdownMultiDiGraph(Argdown, nx.MultiDiGraph):
             self.update_proposition(proposition.label, proposition)
             return
 
-        self.add_node(proposition.label, **asdict(proposition))
+        node_data = asdict(proposition)
+        node_data["texts"] = _ordered_set(node_data["texts"])
+        self.add_node(proposition.label, **node_data)
+        self._fingerprint.mark_node(proposition.label)
         if kwargs.get("update_edges", False):
             self._update()
 
     def update_proposition(self, label: str, proposition: Proposition, **kwargs):
         new_data = asdict(proposition)
-        self.nodes[label]["texts"].extend(new_data["texts"])
-        self.nodes[label]["texts"] = list(set(self.nodes[label]["texts"]))
+        self.nodes[label]["texts"].update(_ordered_set(new_data["texts"]))
         self.nodes[label]["data"].update(new_data["data"])
+        self._fingerprint.mark_node(label)
         if kwargs.get("update_edges", False):
             self._update()
 
@@ -274,12 +401,12 @@ class ArgdownMultiDiGraph(Argdown, nx.MultiDiGraph):
             return None
         if not self.nodes[label]["type"] == Proposition.__name__:
             return None
-        return Proposition(**self.nodes[label])
+        return Proposition.from_dict(self.nodes[label])
 
     @property
     def propositions(self):
         return [
-            Proposition(**data)
+            Proposition.from_dict(data)
             for _, data in self.nodes(data=True)
             if data["type"] == Proposition.__name__
         ]
@@ -310,7 +437,11 @@ class ArgdownMultiDiGraph(Argdown, nx.MultiDiGraph):
                     f"Proposition with label {pr.proposition_label} is referenced in argument {argument.label} but does not exist."
                 )
 
-        self.add_node(argument.label, **asdict(argument))
+        node_data = asdict(argument)
+        node_data["gists"] = _ordered_set(node_data["gists"])
+        self.add_node(argument.label, **node_data)
+        self._index.index_argument(argument.label, argument.pcs)
+        self._fingerprint.mark_node(argument.label)
         if kwargs.get("update_edges", False):
             self._update()
 
@@ -323,8 +454,7 @@ class ArgdownMultiDiGraph(Argdown, nx.MultiDiGraph):
                 )
                 return
         new_data = asdict(argument)
-        self.nodes[label]["gists"].extend(new_data["gists"])
-        self.nodes[label]["gists"] = list(set(self.nodes[label]["gists"]))
+        self.nodes[label]["gists"].update(_ordered_set(new_data["gists"]))
         self.nodes[label]["data"].update(new_data["data"])
 
         if new_data["pcs"]:
@@ -332,6 +462,8 @@ class ArgdownMultiDiGraph(Argdown, nx.MultiDiGraph):
                 "Overwriting PCS of argument <%s> while updating argument.", label
             )
         self.nodes[label]["pcs"] = new_data["pcs"]
+        self._index.index_argument(label, argument.pcs)
+        self._fingerprint.mark_node(label)
 
         if kwargs.get("update_edges", False):
             self._update()
@@ -373,6 +505,7 @@ class ArgdownMultiDiGraph(Argdown, nx.MultiDiGraph):
         edge_data["valence"] = edge.valence.name
         edge_data["dialectics"] = [ds.name for ds in edge.dialectics]
         self.add_edge(s, t, edge.valence.name, **edge_data)
+        self._reindex_edge(s, t, edge.valence.name)
         if kwargs.get("update_edges", False):
             self._update()
 
@@ -387,6 +520,7 @@ class ArgdownMultiDiGraph(Argdown, nx.MultiDiGraph):
         self.edges[s, t, key]["dialectics"].extend([ds.name for ds in edge.dialectics])
         self.edges[s, t, key]["dialectics"] = list(set(self.edges[s, t, key]["dialectics"]))
         self.edges[s, t, key]["data"].update(edge.data)
+        self._reindex_edge(s, t, key)
         if kwargs.get("update_edges", False):
             self._update()
 
@@ -407,6 +541,29 @@ class ArgdownMultiDiGraph(Argdown, nx.MultiDiGraph):
             ArgdownEdge.from_dict(edge_data) for _, _, edge_data in self.edges(data=True)
         ]
 
+    def arguments_using_premise(self, label: str) -> list[str]:
+        return self._index.premise_users(label)
+
+    def arguments_concluding(self, label: str, final_only: bool = False) -> list[str]:
+        return self._index.concluding(label, final_only=final_only)
+
+    def find_dialectical_relations(
+        self,
+        source: str | None = None,
+        target: str | None = None,
+        valence: Valence | None = None,
+        dialectic: DialecticalType | None = None,
+    ) -> list[ArgdownEdge]:
+        return [
+            ArgdownEdge.from_dict(self.edges[edge])
+            for edge in self._index.edges(
+                source=source,
+                target=target,
+                valence=valence.name if valence is not None else None,
+                dialectic=dialectic.name if dialectic is not None else None,
+            )
+        ]
+
     def has_legal_pcs(self, argument) -> tuple[bool, str | None]:
         pcs = argument.pcs
         if not pcs:
@@ -422,80 +579,331 @@ class ArgdownMultiDiGraph(Argdown, nx.MultiDiGraph):
             return False, "Premise conclusion structure does not end with a conclusion."
         return True, None
 
+    def merge(self, other: Argdown, **kwargs) -> dict[str, str]:
+        propositions = other.propositions
+        arguments = other.arguments
+        relations = other.dialectical_relations
+
+        # renumber generated labels, as if they had been made unique in this map
+        generated: dict[str, str] = {}
+        taken = set(self.nodes)
+        for item in [*propositions, *arguments]:
+            match = _GENERATED_LABEL_PATTERN.match(item.label)
+            if match:
+                generated[item.label] = match.group(1)
+            else:
+                taken.add(item.label)
+        renamed: dict[str, str] = {}
+        for label, base in generated.items():
+            new_label = base
+            i = 1
+            while new_label in taken:
+                new_label = f"{base}_{i}"
+                i += 1
+            taken.add(new_label)
+            if new_label != label:
+                renamed[label] = new_label
+
+        def rename(label):
+            return renamed.get(label, label)
+
+        touched: dict[str, None] = {}
+        for proposition in propositions:
+            proposition.label = rename(proposition.label)
+            self.add_proposition(proposition, allow_exists=True)
+            touched[proposition.label] = None
+        for argument in arguments:
+            argument.label = rename(argument.label)
+            for pr in argument.pcs:
+                pr.proposition_label = rename(pr.proposition_label)
+            self.add_argument(argument, allow_exists=True)
+            if argument.label in self.nodes:
+                touched[argument.label] = None
+
+        axiomatic: dict[str, None] = {}
+        for edge in relations:
+            # grounded relations are recomputed below
+            dialectics = [ds for ds in edge.dialectics if ds != DialecticalType.GROUNDED]
+            if edge.dialectics and not dialectics:
+                continue
+            edge.source = rename(edge.source)
+            edge.target = rename(edge.target)
+            edge.dialectics = dialectics
+            if edge.source not in self.nodes or edge.target not in self.nodes:
+                continue
+            self.add_dialectical_relation(edge, allow_exists=True)
+            if DialecticalType.AXIOMATIC in dialectics:
+                axiomatic[edge.source] = None
+                axiomatic[edge.target] = None
+
+        # reground the affected region: touched nodes, propositions whose
+        # axiomatic consequences or conflicts may have changed, and arguments
+        # that use these propositions as premises or final conclusions
+        affected: dict[str, None] = {}
+        for label in axiomatic:
+            affected.update(dict.fromkeys(self._axiomatic.antecedents(label)))
+        sources = dict(touched)
+        targets = dict(touched)
+        for label in affected:
+            sources[label] = targets[label] = None
+            sources.update(dict.fromkeys(self._index.concluding(label, final_only=True)))
+            targets.update(dict.fromkeys(self._index.premise_users(label)))
+        self._update_region(sources, targets)
+        return renamed
+
+    def fingerprint(self) -> str:
+        return self._fingerprint.hexdigest(self)
+
+    def node_fingerprint(self, label: str) -> str | None:
+        return self._fingerprint.node_hexdigest(self, label)
+
+    def relation_fingerprint(self, source: str, target: str, valence: Valence) -> str | None:
+        return self._fingerprint.edge_hexdigest(self, source, target, valence.name)
+
     def make_label_unique(self, label: str) -> str:
         if label not in self.nodes:
             return label
 
-        i = 1
+        # continue after the last number appended to the label, so that making
+        # many equal labels (e.g. of unnamed propositions) unique takes linear time
+        i = self._label_numbers.get(label, 0) + 1
         while f"{label}_{i}" in self.nodes:
             i += 1
+        self._label_numbers[label] = i
 
         return f"{label}_{i}"
 
+    def memory_usage(self) -> dict[str, int]:
+        """
+        Returns the approximate number of bytes the argument map occupies (as
+        measured with `sys.getsizeof`), broken down into "labels", "texts" (and
+        gists), inline "data", "pcs", "edges" (attributes of dialectical
+        relations), "indexes" (closure, structural index, fingerprint and label
+        numbers), "source_map", and "graph" (networkx containers and any other
+        overhead), together with the "total". Objects shared between categories are counted
+        in the first one.
+        """
+        sizer = _Sizer()
+        nodes = list(self._node.values())
+        usage = {
+            "labels": sizer.size(*self._node),
+            "texts": sizer.size(*(data.get("texts", data.get("gists")) for data in nodes)),
+            "data": sizer.size(*(data["data"] for data in nodes)),
+            "pcs": sizer.size(*(data["pcs"] for data in nodes if "pcs" in data)),
+            "edges": sizer.size(*(data for _, _, data in self.edges(data=True))),
+            "indexes": sizer.size(self._axiomatic, self._index, self._fingerprint, self._label_numbers),
+            "source_map": sizer.size(self.source_map) if self.source_map is not None else 0,
+        }
+        usage["graph"] = sizer.size(self)
+        usage["total"] = sum(usage.values())
+        return usage
+
+    def _is_proposition(self, label: str) -> bool:
+        return self.nodes[label]["type"] == Proposition.__name__
+
+    def _reindex_edge(self, source: str, target: str, key: str):
+        """
+        Synchronizes the indexes with the current state of the edge
+        (source, target, key), which may have been added, changed or removed.
+        """
+        valence = Valence[key]
+        edge_data = self.get_edge_data(source, target, key)
+        self._fingerprint.mark_edge(source, target, key)
+        self._index.index_edge(
+            source, target, key, edge_data["dialectics"] if edge_data is not None else None
+        )
+        if (
+            edge_data is not None
+            and DialecticalType.AXIOMATIC.name in edge_data["dialectics"]
+            and self._is_proposition(source)
+            and self._is_proposition(target)
+        ):
+            self._axiomatic.add_relation(source, target, valence)
+        else:
+            self._axiomatic.discard_relation(source, target, valence)
+
+    # networkx removals keep the indexes in sync as well
+
+    def remove_edge(self, u, v, key=None):
+        if key is None and self.has_edge(u, v):
+            # networkx removes the edge added last
+            key = next(reversed(self._adj[u][v]))
+        super().remove_edge(u, v, key)
+        self._reindex_edge(u, v, key)
+
+    def remove_node(self, n):
+        edges = []
+        if n in self:
+            edges = list(dict.fromkeys([*self.out_edges(n, keys=True), *self.in_edges(n, keys=True)]))
+        super().remove_node(n)
+        # suffixes may have become free again, which the counters of
+        # `make_label_unique` would skip
+        self._label_numbers.clear()
+        self._fingerprint.mark_node(n)
+        self._index.unindex_argument(n)
+        for u, v, key in edges:
+            self._reindex_edge(u, v, key)
+
+    def remove_nodes_from(self, nodes):
+        for n in list(nodes):
+            if n in self:
+                self.remove_node(n)
+
+    def clear_edges(self):
+        edges = list(self.edges(keys=True))
+        super().clear_edges()
+        for u, v, key in edges:
+            self._reindex_edge(u, v, key)
+
+    def clear(self):
+        super().clear()
+        self._axiomatic = AxiomaticClosure(transitive=self._axiomatic.transitive)
+        self._index = StructuralIndex()
+        self._fingerprint = MerkleFingerprint()
+        self._label_numbers.clear()
+
     def _entails(self, p1: Proposition, p2: Proposition) -> bool:
         if not isinstance(p1, Proposition) or not isinstance(p2, Proposition):
             raise ValueError(f"Can check for entailment only between propositions, but got {type(p1)} and {type(p2)}.")
         if p1.label is None or p2.label is None:
             return False
-        if p1.label == p2.label:
-            return True
-        if not self.has_edge(p1.label, p2.label):
-            return False
-        drelations = self.get_dialectical_relation(p1.label, p2.label)
-        if drelations is None:
-            return False
-        return bool([
-            r for r in drelations
-            if DialecticalType.AXIOMATIC in r.dialectics and r.valence == Valence.SUPPORT
-        ])
+        return self._axiomatic.entails(p1.label, p2.label)
     
     def _contradicts(self, p1: Proposition, p2: Proposition) -> bool:
         if not isinstance(p1, Proposition) or not isinstance(p2, Proposition):
             raise ValueError(f"Can check for contradiction only between propositions, but got {type(p1)} and {type(p2)}.")
         if p1.label is None or p2.label is None:
             return False
-        lr = self.get_dialectical_relation(p1.label, p2.label) or []
-        rl = self.get_dialectical_relation(p2.label, p1.label) or []
-        return bool([
-            r for r in lr + rl
-            if DialecticalType.AXIOMATIC in r.dialectics and r.valence in [Valence.ATTACK, Valence.CONTRADICT]
-        ])
+        return self._axiomatic.contradicts(p1.label, p2.label)
+
+    def _legal_argument(self, label: str, cache: dict[str, Argument | None]) -> Argument | None:
+        """
+        Returns argument `label` if it has a legal PCS, and None otherwise.
+        """
+        if label not in cache:
+            data = self.nodes[label]
+            argument = None
+            if data["type"] == Argument.__name__:
+                argument = Argument.from_dict({"label": label, "pcs": data["pcs"]})
+                if not self.has_legal_pcs(argument)[0]:
+                    argument = None
+                else:
+                    for pr in argument.pcs:
+                        if pr.proposition_label not in self.nodes or not self._is_proposition(pr.proposition_label):
+                            raise ValueError(
+                                f"Argument {label} references {pr.proposition_label} in its PCS, which is not a proposition."
+                            )
+            cache[label] = argument
+        return cache[label]
 
     def _update(self):
-        for u in self.nodes:
-            for v in self.nodes:
-                if u == v:
-                    continue
-                ou = Proposition(**self.nodes[u]) if self.nodes[u]["type"] == Proposition.__name__ else Argument.from_dict(self.nodes[u])
-                ov = Proposition(**self.nodes[v]) if self.nodes[v]["type"] == Proposition.__name__ else Argument.from_dict(self.nodes[v])
-                if isinstance(ou, Proposition) and isinstance(ov, Proposition):
-                    continue
-
-                # remove all grounded relations from u to v
-                if self.has_edge(u, v):
-                    for data in self.get_edge_data(u, v).values():
-                        if DialecticalType.GROUNDED.name in data["dialectics"]:
-                            data["dialectics"].remove(DialecticalType.GROUNDED.name)
-
-                if isinstance(ou, Argument) and not self.has_legal_pcs(ou)[0]:
-                    continue
-                if isinstance(ov, Argument) and not self.has_legal_pcs(ov)[0]:
-                    continue
-
-                source_anchor_proposition = ou if isinstance(ou, Proposition) else self.get_proposition(ou.pcs[-1].proposition_label)
-                target_anchor_propositions = [ov] if isinstance(ov, Proposition) else [
-                     self.get_proposition(pr.proposition_label) for pr in ov.pcs
-                     if not isinstance(pr, Conclusion)
-                ]
-
+        self._update_region(sources=self.nodes, targets=())
+
+    def _update_region(self, sources: Iterable[str], targets: Iterable[str]):
+        """
+        Recomputes all grounded relations from nodes in `sources` and to nodes in `targets`.
+        """
+        # Grounded relations hold from u to v if the anchor of u (u itself or its
+        # final conclusion) entails or contradicts an anchor of v (v itself or
+        # one of its premises). Rather than checking all pairs of nodes, we
+        # look up candidate targets (sources) in the closure of axiomatic
+        # relations and in the index of premises (conclusions).
+        full_update = sources is self.nodes
+        sources = list(sources)
+        targets = list(targets)
+        legal_arguments: dict[str, Argument | None] = {}
+
+        def is_argument(label):
+            return self._legal_argument(label, legal_arguments) is not None
+
+        def is_legal(label):
+            return self._is_proposition(label) or is_argument(label)
+
+        def anchor(label):
+            argument = self._legal_argument(label, legal_arguments)
+            return label if argument is None else argument.pcs[-1].proposition_label
+
+        def target_anchors(label):
+            argument = self._legal_argument(label, legal_arguments)
+            if argument is None:
+                return [label]
+            return [pr.proposition_label for pr in argument.pcs if not isinstance(pr, Conclusion)]
+
+        source_set = set(sources)
+        region = list(self.out_edges(sources, keys=True, data=True))
+        region.extend(
+            (u, v, key, data) for u, v, key, data in self.in_edges(targets, keys=True, data=True)
+            if u not in source_set
+        )
+        region = [
+            (u, v, key, data) for u, v, key, data in region
+            if u != v and not (self._is_proposition(u) and self._is_proposition(v))
+        ]
 
-                if any(self._entails(source_anchor_proposition, tp) for tp in target_anchor_propositions):
-                    self.add_dialectical_relation(ArgdownEdge(u, v, Valence.SUPPORT, [DialecticalType.GROUNDED]))
-                if any(self._contradicts(source_anchor_proposition, tp) for tp in target_anchor_propositions):
-                    self.add_dialectical_relation(ArgdownEdge(u, v, Valence.ATTACK, [DialecticalType.GROUNDED]))
+        # remove all grounded relations between nodes that are not both propositions
+        for u, v, key, data in region:
+            if DialecticalType.GROUNDED.name in data["dialectics"]:
+                data["dialectics"].remove(DialecticalType.GROUNDED.name)
+                self._reindex_edge(u, v, key)
+
+        if full_update:
+            position = {label: i for i, label in enumerate(self.nodes)}
+            order = position.__getitem__
+        else:
+            order = str
+
+        def add_grounded_relations(u, v, support, attack):
+            if support:
+                self.add_dialectical_relation(ArgdownEdge(u, v, Valence.SUPPORT, [DialecticalType.GROUNDED]))
+            if attack:
+                self.add_dialectical_relation(ArgdownEdge(u, v, Valence.ATTACK, [DialecticalType.GROUNDED]))
+
+        def related_targets(propositions, source):
+            found = set()
+            for proposition in propositions:
+                if is_argument(source):
+                    found.add(proposition)
+                found.update(
+                    label for label in self._index.premise_users(proposition)
+                    if is_argument(label)
+                )
+            found.discard(source)
+            return found
+
+        for u in sources:
+            if not is_legal(u):
+                continue
+            supported = related_targets(self._axiomatic.consequences(anchor(u)), u)
+            attacked = related_targets(self._axiomatic.conflicts(anchor(u)), u)
+            for v in sorted(supported | attacked, key=order):
+                add_grounded_relations(u, v, v in supported, v in attacked)
+
+        def related_sources(propositions, target):
+            found = set()
+            for proposition in propositions:
+                if is_argument(target):
+                    found.add(proposition)
+                found.update(
+                    label for label in self._index.concluding(proposition, final_only=True)
+                    if is_argument(label)
+                )
+            found.discard(target)
+            found.difference_update(source_set)
+            return found
+
+        for v in targets:
+            if not is_legal(v):
+                continue
+            supporting = related_sources(
+                (a for b in target_anchors(v) for a in self._axiomatic.antecedents(b)), v
+            )
+            attacking = related_sources(
+                (a for b in target_anchors(v) for a in self._axiomatic.conflicts(b)), v
+            )
+            for u in sorted(supporting | attacking, key=order):
+                add_grounded_relations(u, v, u in supporting, u in attacking)
 
-                # remove all edges with empty dialectics!
-                if self.has_edge(u, v):
-                    for data in list(self.get_edge_data(u, v).values()):
-                        if not data["dialectics"]:
-                            self.remove_edge(u, v, data["valence"])
\ No newline at end of file
+        # remove all edges with empty dialectics!
+        for u, v, key, data in region:
+            if not data["dialectics"] and is_legal(u) and is_legal(v) and self.has_edge(u, v, key):
+                self.remove_edge(u, v, key)
@@ -5,9 +5,12 @@ import logging
 from textwrap import dedent
 
 import lark
-from lark import Lark, Transformer, UnexpectedInput
+from lark import Lark, UnexpectedInput
+from lark.visitors import Transformer_NonRecursive
 from lark.indenter import Indenter 
 
+from pyargdown.handler import ArgdownHandler
+from pyargdown.memory import profile_stage
 from pyargdown.model import (
     Argdown,
     ArgdownEdge,
@@ -16,7 +19,16 @@ from pyargdown.model import (
     Proposition,
     Valence,
 )
-from pyargdown.parser.base import ArgdownParser, ArgdownSyntaxError, ReasonRelation, _UNNAMED_PROPOSITION
+from pyargdown.parser.base import (
+    ArgdownParser,
+    ArgdownSyntaxError,
+    Mention,
+    ReasonRelation,
+    _UNNAMED_PROPOSITION,
+    reason_token,
+    record_mention,
+)
+from pyargdown.parser.fastpath import parse_argument_map
 
 logger = logging.getLogger(__name__)
 
@@ -184,18 +196,29 @@ class ArgdownMapIndenter(Indenter):
     tab_len = 4  # type: ignore
 
 
-class ArgumentMapTreeTransformer(Transformer):
+class ArgumentMapTreeTransformer(Transformer_NonRecursive):
+    # non-recursive, so that arbitrarily deep nesting of reasons takes constant stack
 
-    def __init__(self, argdown: Argdown, *args, **kwargs):
+    def __init__(
+        self,
+        handler: ArgdownHandler,
+        *args,
+        topology_only: bool = False,
+        mentions: list[Mention] | None = None,
+        **kwargs,
+    ):
         super().__init__(*args, **kwargs)
-        self.argdown = argdown
+        self.handler = handler
+        self.topology_only = topology_only
+        self.mentions = mentions
+        # labels of the reasons that are propositions
+        self.propositions: set[str] = set()
 
     @lark.v_args(inline=True)
     def reason(self, *args):
         kwargs = {t.type: t.value for t in args}
-        text = kwargs.get("TEXT")
-        text, yaml = ArgdownParser.extract_yaml(text) if text else ("", {})
-        text = text.strip()
+        text, yaml = ArgdownParser.extract_text_and_yaml(kwargs.get("TEXT"), self.topology_only)
+        text = text.strip() if text else ""
 
         is_proposition = "ARGUMENT_LABEL" not in kwargs
 
@@ -203,23 +226,17 @@ class ArgumentMapTreeTransformer(Transformer):
             label = kwargs.get("PROPOSITION_LABEL")
             label = label[1:-1] if label else None
             if label is None:
-                label = self.argdown.make_label_unique(_UNNAMED_PROPOSITION)
-            proposition = Proposition(label=label, texts=[text] if text else [], data=yaml)
-            self.argdown.add_proposition(
-                proposition,
-                allow_exists=True,
-            )
+                label = self.handler.make_label_unique(_UNNAMED_PROPOSITION)
+            self.propositions.add(label)
+            self.handler.on_proposition(Proposition(label=label, texts=[text] if text else [], data=yaml))
         else:
             label = kwargs["ARGUMENT_LABEL"][1:-1]
-            argument = Argument(label=label, gists=[text] if text else [], data=yaml)
-            self.argdown.add_argument(
-                argument,
-                allow_exists=True,
-            )
+            self.handler.on_argument(Argument(label=label, gists=[text] if text else [], data=yaml))
+        record_mention(self.mentions, label, reason_token(args))
         return label
 
-    def process_children(self, root_label: str, children: list[tuple[ReasonRelation, str]]):
-        for child_rel, child_label in children:
+    def process_children(self, root_label: str, children: list[tuple[ReasonRelation, str, lark.Token]]):
+        for child_rel, child_label, relation_token in children:
             if child_rel in [
                 ReasonRelation.LEFT_PRO,
                 ReasonRelation.LEFT_CON,
@@ -254,9 +271,9 @@ class ArgumentMapTreeTransformer(Transformer):
                     f"Internal error: Unknown reason relation {child_rel}. Please report this issue."
                 )
             dialectic = DialecticalType.SKETCHED
-            if self.argdown.get_proposition(root_label) and self.argdown.get_proposition(child_label):
+            if root_label in self.propositions and child_label in self.propositions:
                 dialectic = DialecticalType.AXIOMATIC
-            self.argdown.add_dialectical_relation(
+            self.handler.on_relation(
                 ArgdownEdge(
                     source=source,
                     target=target,
@@ -264,12 +281,13 @@ class ArgumentMapTreeTransformer(Transformer):
                     dialectics=[dialectic],
                 )
             )
+            record_mention(self.mentions, (source, target, valence.name), relation_token)
 
     @lark.v_args(inline=True)
     def child(self, relation, reason_label, *children):
         reason_relation = ReasonRelation(relation.type)
         self.process_children(reason_label, children)  # type: ignore
-        return reason_relation, reason_label
+        return reason_relation, reason_label, relation
 
     @lark.v_args(inline=True)
     def root(self, reason_label, *children):
@@ -279,7 +297,9 @@ class ArgumentMapTreeTransformer(Transformer):
 
 
 class ArgumentMapParser(ArgdownParser):
-    def __init__(self):
+    def __init__(self, fast_path: bool = True):
+        # try the hand-written parser before falling back to Lark
+        self.fast_path = fast_path
         self.parser = Lark(
             ARGDOWN_MAP_GRAMMAR,
             parser="lalr",
@@ -290,7 +310,9 @@ class ArgumentMapParser(ArgdownParser):
     def parse(self, text: str) -> lark.Tree:
         try:
             text = text + "\n"  # Ensure the last line is terminated
-            tree = self.parser.parse(text)
+            tree = parse_argument_map(text) if self.fast_path else None
+            if tree is None:
+                tree = self.parser.parse(text)
         except UnexpectedInput as u:
             exc_class = u.match_examples(
                 self.parser.parse, _ERROR_EXAMPLES, use_accepts=True
@@ -301,14 +323,34 @@ class ArgumentMapParser(ArgdownParser):
         return tree
 
     @staticmethod
-    def ingest_in_argmap(tree: lark.Tree, argdown: Argdown) -> Argdown:
-        working_argdown = copy.deepcopy(argdown)
+    def transform(
+        tree: lark.Tree,
+        handler: ArgdownHandler,
+        topology_only: bool = False,
+        mentions: list[Mention] | None = None,
+    ):
+        ArgumentMapTreeTransformer(
+            handler=handler,
+            visit_tokens=True,
+            topology_only=topology_only,
+            mentions=mentions,
+        ).transform(tree)
+
+    @staticmethod
+    def ingest_in_argmap(
+        tree: lark.Tree,
+        argdown: Argdown,
+        topology_only: bool = False,
+        mentions: list[Mention] | None = None,
+    ) -> Argdown:
+        with profile_stage("deepcopy"):
+            working_argdown = copy.deepcopy(argdown)
         try:
-            ArgumentMapTreeTransformer(
-                argdown=working_argdown, visit_tokens=True
-            ).transform(tree)
+            with profile_stage("transform"):
+                ArgumentMapParser.transform(tree, working_argdown, topology_only=topology_only, mentions=mentions)
         except Exception as e:
             logger.error(f"Error when ingesting argdown argument: {e}. Returning original argdown document.")
             return argdown
-        working_argdown._update()
+        with profile_stage("grounding"):
+            working_argdown._update()
         return working_argdown
@@ -12,6 +12,8 @@ import uuid
 import lark
 from lark import Lark, Transformer, UnexpectedInput
 
+from pyargdown.handler import ArgdownHandler
+from pyargdown.memory import profile_stage
 from pyargdown.model import (
     Argdown,
     ArgdownEdge,
@@ -22,7 +24,17 @@ from pyargdown.model import (
     PropositionReference,
     Valence,
 )
-from pyargdown.parser.base import ArgdownParser, ArgdownSyntaxError, ReasonRelation, _UNNAMED_ARGUMENT, _UNNAMED_PROPOSITION
+from pyargdown.parser.base import (
+    ArgdownParser,
+    ArgdownSyntaxError,
+    Mention,
+    ReasonRelation,
+    _UNNAMED_ARGUMENT,
+    _UNNAMED_PROPOSITION,
+    reason_token,
+    record_mention,
+)
+from pyargdown.parser.fastpath import parse_argument
 
 logger = logging.getLogger(__name__)
 
@@ -439,10 +451,21 @@ _ERROR_EXAMPLES = {
 
 class ArgumentTreeTransformer(Transformer):
 
-    def __init__(self, argdown: Argdown, *args, **kwargs):
+    def __init__(
+        self,
+        handler: ArgdownHandler,
+        *args,
+        topology_only: bool = False,
+        mentions: list[Mention] | None = None,
+        **kwargs,
+    ):
         super().__init__(*args, **kwargs)
-        self.argdown = argdown
+        self.handler = handler
+        self.topology_only = topology_only
+        self.mentions = mentions
         self.current_argument_label = None  # Add this to track current argument
+        # relation tokens of embedded reasons, by id of the returned edge
+        self.relation_tokens: dict[int, lark.Token] = {}
 
     @lark.v_args(inline=True)
     def start(self, *args):
@@ -455,7 +478,7 @@ class ArgumentTreeTransformer(Transformer):
                 "Internal error: Argument block must have at most 2 children (head / body). Please report this issue."
             )
         if head is None:
-            label = self.argdown.make_label_unique(_UNNAMED_ARGUMENT)
+            label = self.handler.make_label_unique(_UNNAMED_ARGUMENT)
             gists = []
             data = {}
         else:
@@ -466,16 +489,18 @@ class ArgumentTreeTransformer(Transformer):
         argument = Argument(
             label=label, gists=gists, data=data, pcs=pcs
         )
-        self.argdown.add_argument(argument, allow_exists=True)
+        self.handler.on_argument(argument)
+        for pr in pcs:
+            self.handler.on_pcs_item(label, pr)
         return argument
 
     @lark.v_args(inline=True)
     def argument_head(self, label, *args):
         kwargs = {t.type: t.value for t in args}
-        text = kwargs.get("TEXT")
-        text, yaml = ArgdownParser.extract_yaml(text) if text else ("", {})
-        text = text.strip()
+        text, yaml = ArgdownParser.extract_text_and_yaml(kwargs.get("TEXT"), self.topology_only)
+        text = text.strip() if text else ""
         self.current_argument_label = label[1:-1]
+        record_mention(self.mentions, label[1:-1], label)
         return {"label": label[1:-1], "text": text, "data": yaml}
 
     @lark.v_args(inline=True)
@@ -496,7 +521,12 @@ class ArgumentTreeTransformer(Transformer):
                     raise ValueError(
                         "Internal error: Invalid references in embedded reason node. Please report this issue."
                     )
-                self.argdown.add_dialectical_relation(item)
+                self.handler.on_relation(item)
+                record_mention(
+                    self.mentions,
+                    (item.source, item.target, item.valence.name),
+                    self.relation_tokens.pop(id(item)),
+                )
             else:
                 raise ValueError(
                     "Unrecognized item in argument body. Please report this issue."
@@ -514,17 +544,13 @@ class ArgumentTreeTransformer(Transformer):
             cr_arg_lb = self.current_argument_label
             cr_arg_lb = cr_arg_lb.replace(" ", "_") if cr_arg_lb is not None else None
             prop_label = prop_label if cr_arg_lb is None else f"{cr_arg_lb}_{prop_label}"
-            prop_label = self.argdown.make_label_unique(prop_label)
-        text = kwargs.get("TEXT")
-        text, yaml = ArgdownParser.extract_yaml(text) if text else (None, {})
+            prop_label = self.handler.make_label_unique(prop_label)
+        text, yaml = ArgdownParser.extract_text_and_yaml(kwargs.get("TEXT"), self.topology_only)
         proposition = Proposition(
             label=prop_label, texts=[text] if text else [], data=yaml
         )
-        if self.argdown.get_proposition(prop_label) is None:
-            self.argdown.add_proposition(proposition, allow_exists=False)
-        else:
-            self.argdown.update_proposition(prop_label, proposition)
-                
+        self.handler.on_proposition(proposition)
+        record_mention(self.mentions, prop_label, reason_token(args))
         return PropositionReference(proposition_label=prop_label, label=label)
 
     @lark.v_args(inline=True)
@@ -538,23 +564,20 @@ class ArgumentTreeTransformer(Transformer):
             cr_arg_lb = self.current_argument_label
             cr_arg_lb = cr_arg_lb.replace(" ", "_") if cr_arg_lb is not None else None
             prop_label = prop_label if cr_arg_lb is None else f"{cr_arg_lb}_{prop_label}"
-            prop_label = self.argdown.make_label_unique(prop_label)
+            prop_label = self.handler.make_label_unique(prop_label)
         inference_info = kwargs.get("INFERENCE_INFO")
         inference_info = (
             inference_info.strip("\n ")[2:-2].strip() if inference_info else None
         )
-        inference_info, inference_data = (
-            ArgdownParser.extract_yaml(inference_info) if inference_info else (None, {})
+        inference_info, inference_data = ArgdownParser.extract_text_and_yaml(
+            inference_info, self.topology_only
         )
-        text = kwargs.get("TEXT")
-        text, yaml = ArgdownParser.extract_yaml(text) if text else (None, {})
+        text, yaml = ArgdownParser.extract_text_and_yaml(kwargs.get("TEXT"), self.topology_only)
         proposition = Proposition(
             label=prop_label, texts=[text] if text else [], data=yaml
         )
-        if self.argdown.get_proposition(prop_label) is None:
-            self.argdown.add_proposition(proposition, allow_exists=False)
-        else:
-            self.argdown.update_proposition(prop_label, proposition)
+        self.handler.on_proposition(proposition)
+        record_mention(self.mentions, prop_label, reason_token(args))
         return Conclusion(
             proposition_label=prop_label,
             label=label,
@@ -565,9 +588,8 @@ class ArgumentTreeTransformer(Transformer):
     @lark.v_args(inline=True)
     def reason(self, *args):
         kwargs = {t.type: t.value for t in args}
-        text = kwargs.get("TEXT")
-        text, yaml = ArgdownParser.extract_yaml(text) if text else ("", {})
-        text = text.strip()
+        text, yaml = ArgdownParser.extract_text_and_yaml(kwargs.get("TEXT"), self.topology_only)
+        text = text.strip() if text else ""
         rel = next(rel for rel in ReasonRelation if rel.value in kwargs.keys())
 
         is_proposition = "ARGUMENT_LABEL" not in kwargs
@@ -577,20 +599,15 @@ class ArgumentTreeTransformer(Transformer):
             label = kwargs.get("PROPOSITION_LABEL")
             label = label[1:-1] if label else None
             if label is None:
-                label = self.argdown.make_label_unique(_UNNAMED_PROPOSITION)
-            self.argdown.add_proposition(
-                Proposition(label=label, texts=[text] if text else [], data=yaml),
-                allow_exists=True,
-            )
+                label = self.handler.make_label_unique(_UNNAMED_PROPOSITION)
+            self.handler.on_proposition(Proposition(label=label, texts=[text] if text else [], data=yaml))
         else:
             label = kwargs.get("ARGUMENT_LABEL")
             label = label[1:-1] if label else None
             if label is None:
-                label = self.argdown.make_label_unique(_UNNAMED_ARGUMENT)
-            self.argdown.add_argument(
-                Argument(label=label, gists=[text] if text else [], data=yaml),
-                allow_exists=True,
-            )
+                label = self.handler.make_label_unique(_UNNAMED_ARGUMENT)
+            self.handler.on_argument(Argument(label=label, gists=[text] if text else [], data=yaml))
+        record_mention(self.mentions, label, reason_token(args))
 
         if rel in [
             ReasonRelation.LEFT_PRO,
@@ -627,16 +644,20 @@ class ArgumentTreeTransformer(Transformer):
             if "PROPOSITION_LABEL" in kwargs
             else DialecticalType.SKETCHED
         )
-        return ArgdownEdge(
+        edge = ArgdownEdge(
             source=source,
             target=target,
             valence=valence,
             dialectics=[dialectic],
         )
+        self.relation_tokens[id(edge)] = next(t for t in args if t.type == rel.value)
+        return edge
 
 
 class ArgumentParser(ArgdownParser):
-    def __init__(self):
+    def __init__(self, fast_path: bool = True):
+        # try the hand-written parser before falling back to Lark
+        self.fast_path = fast_path
         self.parser = Lark(
             ARGDOWN_ARGUMENT_GRAMMAR, parser="lalr", maybe_placeholders=False
         )
@@ -644,7 +665,9 @@ class ArgumentParser(ArgdownParser):
     def parse(self, text: str) -> lark.Tree:
         try:
             text = text.strip()
-            tree = self.parser.parse(text)
+            tree = parse_argument(text) if self.fast_path else None
+            if tree is None:
+                tree = self.parser.parse(text)
         except UnexpectedInput as u:
             exc_class = u.match_examples(
                 self.parser.parse, _ERROR_EXAMPLES, use_accepts=True
@@ -655,14 +678,34 @@ class ArgumentParser(ArgdownParser):
         return tree
 
     @staticmethod
-    def ingest_in_argmap(tree: lark.Tree, argdown: Argdown) -> Argdown:
-        working_argdown = copy.deepcopy(argdown)
+    def transform(
+        tree: lark.Tree,
+        handler: ArgdownHandler,
+        topology_only: bool = False,
+        mentions: list[Mention] | None = None,
+    ):
+        ArgumentTreeTransformer(
+            handler=handler,
+            visit_tokens=True,
+            topology_only=topology_only,
+            mentions=mentions,
+        ).transform(tree)
+
+    @staticmethod
+    def ingest_in_argmap(
+        tree: lark.Tree,
+        argdown: Argdown,
+        topology_only: bool = False,
+        mentions: list[Mention] | None = None,
+    ) -> Argdown:
+        with profile_stage("deepcopy"):
+            working_argdown = copy.deepcopy(argdown)
         try:
-            ArgumentTreeTransformer(
-                argdown=working_argdown, visit_tokens=True
-            ).transform(tree)
+            with profile_stage("transform"):
+                ArgumentParser.transform(tree, working_argdown, topology_only=topology_only, mentions=mentions)
         except Exception as e:
             logger.error(f"Error when ingesting argdown argument: {e}. Returning original argdown document.")
             return argdown
-        working_argdown._update()
+        with profile_stage("grounding"):
+            working_argdown._update()
         return working_argdown
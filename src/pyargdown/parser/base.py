@@ -3,15 +3,84 @@
 
 from abc import ABC, abstractmethod
 import enum
+import re
+from typing import NamedTuple
 import yaml  # type: ignore
 
-from lark import Tree
+from lark import Token, Tree
 
+from pyargdown.handler import ArgdownHandler
 from pyargdown.model import Argdown, Argument, Proposition
+from pyargdown.parser.preprocessor import BlockSpan
 
 _UNNAMED_ARGUMENT = "UNNAMED_ARGUMENT"
 _UNNAMED_PROPOSITION = "UNNAMED_PROPOSITION"
 
+# a mention of a node (label) or of a relation (source, target, valence name)
+# at (line, column) of a preprocessed codeblock
+Mention = tuple[str | tuple[str, str, str], int, int]
+
+
+# braces, and starts of quoted strings and comments within yaml flow mappings
+_YAML_TOKEN = re.compile(r"(?P<brace>[{}])|(?<=[{\[,:])\s*(?P<quote>[\"'])|(?<=\s)#")
+_YAML_QUOTED = {
+    '"': re.compile(r'(?:[^"\\]|\\.)*"', re.S),
+    "'": re.compile(r"(?:[^']|'')*'"),
+}
+# braces tried if the flow mapping closed by the final brace is not found
+_YAML_FALLBACK_BRACES = 8
+
+
+def _inline_yaml_start(text: str) -> int:
+    """
+    Returns the index of the brace opening the flow mapping that is closed by the
+    final brace of `text`, or -1. Quoted strings and comments count only within
+    braces, elsewhere they are part of the text.
+    """
+    stack: list[int] = []
+    unclosed: set[str] = set()
+    pos = 0
+    while (match := _YAML_TOKEN.search(text, pos)) is not None:
+        pos = match.end()
+        brace, quote = match.group("brace", "quote")
+        if brace == "{":
+            stack.append(match.start())
+        elif brace == "}":
+            if stack:
+                start = stack.pop()
+                if pos == len(text):
+                    return start
+        elif not stack:
+            pos = match.start() + 1
+        elif quote is None:
+            # comment
+            newline = text.find("\n", pos)
+            pos = len(text) if newline < 0 else newline
+        elif quote not in unclosed:
+            closing = _YAML_QUOTED[quote].match(text, pos)
+            if closing is None:
+                # so is every later quote of the same kind
+                unclosed.add(quote)
+            else:
+                pos = closing.end()
+    return -1
+
+
+def record_mention(mentions: list[Mention] | None, key: str | tuple[str, str, str], token: Token):
+    if mentions is not None:
+        mentions.append((key, token.line, token.column))  # type: ignore
+
+
+def reason_token(tokens: tuple[Token, ...]) -> Token:
+    """
+    Returns the token at which a reason's label (or else its text) starts.
+    """
+    return next(
+        (t for t in tokens if t.type in ["PROPOSITION_LABEL", "ARGUMENT_LABEL", "TEXT"]),
+        tokens[0],
+    )
+
+
 class ReasonRelation(enum.Enum):
     LEFT_PRO = "LEFT_PRO"
     LEFT_CON = "LEFT_CON"
@@ -23,9 +92,28 @@ class ReasonRelation(enum.Enum):
 
 class ArgdownSyntaxError(SyntaxError):
     label = "Base Argdown syntax error"
+    # span of the codeblock in the original document, if known
+    span: BlockSpan | None = None
+
     def __str__(self):
         context, line, column = self.args
-        return '%s at line %s, column %s.\n\n%s' % (self.label, line, column, context)
+        location = 'line %s, column %s' % (line, column)
+        if self.span is not None:
+            location += ' of the codeblock starting at line %s' % self.span.line
+        return '%s at %s.\n\n%s' % (self.label, location, context)
+
+
+class ArgdownDiagnostic(NamedTuple):
+    """
+    A problem found when parsing with `parse_argdown(..., tolerant=True)`, at
+    1-based `line` and `column` of the `text`-th parsed document (0-based).
+    `context` is the offending line of the document.
+    """
+    text: int
+    line: int
+    column: int
+    message: str
+    context: str = ""
 
 
 class ArgdownParser(ABC):
@@ -43,30 +131,73 @@ class ArgdownParser(ABC):
 
     @staticmethod
     def extract_yaml(text: str) -> tuple[str, dict]:
-        data = {}
-        if text.rstrip().endswith('}'):
-            idx = 0
-            while True:
-                try:
-                    idx = text.index('{', idx)
-                except ValueError:
-                    break
-                try:
-                    data = yaml.safe_load(text[idx:])
-                    text = text[:idx].rstrip()
-                    break
-                except yaml.YAMLError:
-                    idx += 1
-        return text, data
+        """
+        Splits inline yaml data, a flow mapping that ends the text, off the text.
+        Only the mapping closed by the final brace is parsed as yaml, so that
+        texts with many braces take linear time.
+        """
+        stripped = text.rstrip()
+        if not stripped.endswith('}'):
+            return text, {}
+        start = _inline_yaml_start(stripped)
+        candidates = [start] if start >= 0 else []
+        # fall back to the last few braces, e.g. if the text quotes a brace
+        idx = len(stripped)
+        for _ in range(_YAML_FALLBACK_BRACES):
+            idx = stripped.rfind('{', 0, idx)
+            if idx < 0:
+                break
+            if idx != start:
+                candidates.append(idx)
+        for idx in candidates[:1] + sorted(candidates[1:]):
+            try:
+                data = yaml.safe_load(text[idx:])
+            except (yaml.YAMLError, RecursionError):
+                continue
+            return text[:idx].rstrip(), data
+        return text, {}
 
     @abstractmethod
     def parse(self, text: str) -> Tree:
         pass
 
+    @staticmethod
+    def extract_text_and_yaml(text: str | None, topology_only: bool = False) -> tuple[str | None, dict]:
+        """
+        Splits inline yaml data off a text, unless only the topology of the argument
+        map is needed, in which case both text and data are dropped.
+        """
+        if topology_only or not text:
+            return None, {}
+        return ArgdownParser.extract_yaml(text)
+
     @staticmethod
     @abstractmethod
-    def ingest_in_argmap(tree: Tree, argdown: Argdown) -> Argdown:
-        pass
+    def transform(
+        tree: Tree,
+        handler: ArgdownHandler,
+        topology_only: bool = False,
+        mentions: list[Mention] | None = None,
+    ):
+        """
+        Reports the propositions, arguments and relations of a parse tree to
+        `handler`. If `mentions` is given, the positions at which nodes and
+        relations are mentioned in the tree are appended to it.
+        """
+
+    @staticmethod
+    @abstractmethod
+    def ingest_in_argmap(
+        tree: Tree,
+        argdown: Argdown,
+        topology_only: bool = False,
+        mentions: list[Mention] | None = None,
+    ) -> Argdown:
+        """
+        Ingests a parse tree into a copy of `argdown` and returns the copy, or the
+        unchanged original if ingestion fails. If `mentions` is given, the positions
+        at which nodes and relations are mentioned in the tree are appended to it.
+        """
 
     def __call__(self, text: str) -> Tree:
         return self.parse(text)
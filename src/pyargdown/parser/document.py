@@ -0,0 +1,495 @@
+"""
+Single-pass parsing of whole Argdown documents.
+
+A `DocumentLexer` scans a document once: it recognizes argument map and
+argument (PCS) blocks, removes comments and collapses lines like the
+preprocessor handlers (on the lines of each block, without copying the block
+between stages), and tokenizes the lines like the fast-path parsers, with
+positions in the document. A single LALR parser with `ARGDOWN_DOCUMENT_GRAMMAR`
+then parses the whole token stream. Each section of the resulting tree has the
+shape of the parse tree of the corresponding codeblock, so that it is ingested
+by the usual tree transformers.
+
+Documents the lexer cannot handle are left to the blockwise parsers, which
+also produce the diagnostics for invalid documents.
+
+In tolerant mode, the lines of each codeblock are fed one at a time into an
+interactive LALR parser, and lines that cannot be tokenized or are rejected by
+the parser are skipped after restoring the parser state before them.
+"""
+
+import re
+from typing import Iterator, NamedTuple
+
+from lark import Lark, Token, Tree, UnexpectedInput, UnexpectedToken
+from lark.lexer import Lexer
+from lark.parsers.lalr_interactive_parser import InteractiveParser
+
+from pyargdown.parser.base import ArgdownDiagnostic
+from pyargdown.parser.fastpath import (
+    _CHILD_LINE,
+    _HEAD_LINE,
+    _INFERENCE_LINE,
+    _PCS_LINE,
+    _RELATIONS,
+    _ROOT_LINE,
+    _Fallback,
+    _head_tokens,
+    _indentation,
+    _inference_token,
+    _labeled_tokens,
+    _token,
+)
+from pyargdown.parser.preprocessor import (
+    ArgumentBlock,
+    ArgumentMapBlock,
+    BlockSpan,
+    Preprocessor,
+    _maybe_inference_line,
+    _maybe_pcs_line,
+    _maybe_reason_line,
+)
+
+ARGDOWN_DOCUMENT_GRAMMAR = r"""
+    start: (argument_map | argument)*
+    ?section: argument_map | argument
+
+    argument_map: _MAP root+ _END
+    root: reason _NL [_INDENT child+ _DEDENT]
+    child: _relation reason _NL [_INDENT child+ _DEDENT]
+    reason: _label [TEXT] | TEXT
+
+    argument: _ARGUMENT [argument_head] argument_body _END
+    argument_head: ARGUMENT_LABEL [TEXT] _NL
+    argument_body: premise (premise | conclusion | pcs_reason)*
+    premise: PCS_LABEL _proposition _NL
+    conclusion: (INFERENCE_LINE | INFERENCE_INFO) PCS_LABEL _proposition _NL
+    _proposition: PROPOSITION_LABEL [TEXT] | TEXT
+    pcs_reason: _relation _label [TEXT] _NL -> reason
+              | _relation TEXT _NL -> reason
+
+    _label: PROPOSITION_LABEL | ARGUMENT_LABEL
+    _relation: LEFT_PRO | LEFT_CON | RIGHT_PRO | RIGHT_CON | CONTRADICT | LEFT_UNDERCUT | RIGHT_UNDERCUT
+
+    %declare _MAP _ARGUMENT _END _NL _INDENT _DEDENT
+    %declare PROPOSITION_LABEL ARGUMENT_LABEL PCS_LABEL TEXT INFERENCE_LINE INFERENCE_INFO
+    %declare LEFT_PRO LEFT_CON RIGHT_PRO RIGHT_CON CONTRADICT LEFT_UNDERCUT RIGHT_UNDERCUT
+"""
+
+_HTML_COMMENT = re.compile(r"<!--.*?-->")
+_JS_COMMENT = re.compile(r"/\*.*?\*/")
+
+# structural tokens, without positions
+_MAP = Token("_MAP", "")
+_ARGUMENT = Token("_ARGUMENT", "")
+_END = Token("_END", "")
+_NL = Token("_NL", "")
+_INDENT = Token("_INDENT", "")
+_DEDENT = Token("_DEDENT", "")
+_EOF = Token("$END", "")
+
+# a preprocessed line: text, index of its (first) line in the block, and the
+# number of leading characters stripped off that line
+_Line = tuple[str, int, int]
+
+
+def _remove_comments(lines: list[_Line]) -> list[_Line]:
+    "Like RemoveCommentsHandler"
+    result = []
+    for line in lines:
+        text = line[0]
+        if "/" not in text and "<!--" not in text:
+            result.append(line)
+            continue
+        if text.strip().startswith("//"):
+            continue
+        cleaned = _JS_COMMENT.sub("", _HTML_COMMENT.sub("", text))
+        if text.strip() and not cleaned.strip():
+            continue
+        if "//" in cleaned:
+            cleaned = cleaned.split("//")[0].rstrip()
+        result.append((cleaned, line[1], line[2]))
+    # an empty result still has one (empty) line
+    return result or [("", lines[0][1], lines[0][2])]
+
+
+def _collapse_lines(lines: list[_Line]) -> list[_Line]:
+    "Like CollapseLinesHandler"
+    result: list[_Line] = []
+    for line in lines:
+        text = line[0]
+        if (
+            not result
+            or not text.strip()
+            or _maybe_pcs_line(text)
+            or _maybe_reason_line(text)
+            or _maybe_inference_line(text)
+            or _maybe_inference_line(result[-1][0])
+        ):
+            result.append(line)
+        else:
+            previous = result[-1]
+            result[-1] = (previous[0].rstrip() + " " + text.lstrip(), previous[1], previous[2])
+    return result
+
+
+def preprocess_lines(lines: list[str], argument: bool) -> list[_Line]:
+    """
+    Preprocesses the lines of a codeblock like the handlers of the blockwise
+    parser (remove comments, remove whitespace, collapse lines, remove comments,
+    remove trailing whitespace), and keeps track of the original lines.
+    """
+    result = _remove_comments([(text, i, 0) for i, text in enumerate(lines)])
+    if argument:
+        result = [(text.strip(), i, shift + len(text) - len(text.lstrip())) for text, i, shift in result]
+    result = _remove_comments(_collapse_lines(result))
+    if argument:
+        result = [(text.rstrip(), i, shift) for text, i, shift in result]
+    return result
+
+
+class _Block(NamedTuple):
+    "A non-empty codeblock of a document, with its preprocessed lines"
+    span: BlockSpan
+    lines: list[_Line]
+    # offsets of the lines of the codeblock in the document
+    offsets: list[int]
+    raw_lines: list[str]
+
+
+def _blocks(text: str) -> Iterator[_Block]:
+    "Yields the codeblocks of a document that are not empty after preprocessing"
+    for span in Preprocessor.scan_blocks(text):
+        raw_lines = text[span.start:span.end].split("\n")
+        lines = preprocess_lines(raw_lines, argument=span.kind is ArgumentBlock)
+        if not any(line[0].strip(" ") for line in lines):
+            continue
+        offsets = [span.start]
+        for raw_line in raw_lines:
+            offsets.append(offsets[-1] + len(raw_line) + 1)
+        yield _Block(span, lines, offsets, raw_lines)
+
+
+def _map_line(
+    text: str, k: int, levels: list[int], has_root: bool, number: int, offset: int, shift: int
+) -> tuple[list[Token], list[int]]:
+    """
+    Tokens of the `k`-th (non-empty) line of an argument map, given the
+    indentation levels before the line, and the levels after it.
+    """
+    tokens = []
+    # indentation is only computed after newlines
+    indent = 0 if k == 0 else _indentation(text)
+    if indent > levels[-1]:
+        if not has_root:
+            raise _Fallback("Invalid indentation")
+        levels = levels + [indent]
+        tokens.append(_INDENT)
+    else:
+        depth = len(levels)
+        while indent < levels[depth - 1]:
+            depth -= 1
+            tokens.append(_DEDENT)
+        if indent != levels[depth - 1]:
+            raise _Fallback("Invalid indentation")
+        levels = levels[:depth]
+    if len(levels) == 1:
+        match = _ROOT_LINE.match(text)
+        if match is None:
+            raise _Fallback
+    else:
+        match = _CHILD_LINE.match(text)
+        if match is None:
+            raise _Fallback("Unrecognized dialectical relation type")
+        tokens.append(_token(_RELATIONS[match["relation"]], match, "relation", number, offset, shift))
+    tokens.extend(_labeled_tokens(match, number, offset, shift=shift))
+    tokens.append(_NL)
+    return tokens, levels
+
+
+def _argument_head(lines: list[_Line]) -> tuple[re.Match | None, int]:
+    """
+    Match of the head of the (stripped) lines of an argument, if any, and the
+    index of the first line of its body.
+    """
+    match = _HEAD_LINE.match(lines[0][0])
+    if match is None:
+        return None, 0
+    # the head is followed by at least one empty line
+    k = 1
+    while k < len(lines) and not lines[k][0].strip(" \t"):
+        k += 1
+    return match, k
+
+
+def _argument_line(text: str, number: int, offset: int, shift: int) -> list[Token]:
+    "Tokens of a line of the body of an argument"
+    match = _INFERENCE_LINE.match(text)
+    if match is not None:
+        return [_inference_token(match, number, offset, shift)]
+    match = _PCS_LINE.match(text)
+    if match is not None:
+        tokens = [_token("PCS_LABEL", match, "pcs_label", number, offset, shift)]
+        tokens.extend(_labeled_tokens(match, number, offset, brackets="[", shift=shift))
+    else:
+        match = _CHILD_LINE.match(text)
+        if match is None:
+            raise _Fallback
+        tokens = [_token(_RELATIONS[match["relation"]], match, "relation", number, offset, shift)]
+        tokens.extend(_labeled_tokens(match, number, offset, shift=shift))
+    tokens.append(_NL)
+    return tokens
+
+
+def _strip_lines(lines: list[_Line]) -> list[_Line]:
+    "Drops leading and trailing empty lines, as the argument parser strips codeblocks"
+    start, end = 0, len(lines)
+    while start < end and not lines[start][0].strip():
+        start += 1
+    while end > start and not lines[end - 1][0].strip():
+        end -= 1
+    return lines[start:end]
+
+
+class DocumentLexer(Lexer):
+    """
+    Lexer of whole Argdown documents for `ARGDOWN_DOCUMENT_GRAMMAR`. Raises
+    `_Fallback` if the document is to be parsed blockwise.
+    """
+
+    def __init__(self, lexer_conf):
+        pass
+
+    def lex(self, text: str) -> Iterator[Token]:  # type: ignore[override]
+        if "\r" in text:
+            raise _Fallback
+        for block in _blocks(text):
+            if block.span.kind is ArgumentMapBlock:
+                yield from self._map_tokens(block)
+            else:
+                yield from self._argument_tokens(block)
+
+    def _map_tokens(self, block: _Block) -> Iterator[Token]:
+        yield _MAP
+        levels = [0]
+        has_root = False
+        for k, (text, i, shift) in enumerate(block.lines):
+            if text.strip(" \t"):
+                tokens, levels = _map_line(
+                    text, k, levels, has_root, block.span.line + i, block.offsets[i], shift
+                )
+                has_root = True
+                yield from tokens
+        for _ in levels[1:]:
+            yield _DEDENT
+        yield _END
+
+    def _argument_tokens(self, block: _Block) -> Iterator[Token]:
+        lines = _strip_lines(block.lines)
+        if not lines:
+            raise _Fallback
+        yield _ARGUMENT
+        match, k = _argument_head(lines)
+        if match is not None:
+            text, i, shift = lines[0]
+            yield from _head_tokens(match, block.span.line + i, block.offsets[i], shift)
+            yield _NL
+            if k == 1:
+                raise _Fallback
+        for text, i, shift in lines[k:]:
+            yield from _argument_line(text, block.span.line + i, block.offsets[i], shift)
+        yield _END
+
+
+class DocumentSection(NamedTuple):
+    "A codeblock parsed in tolerant mode"
+    span: BlockSpan
+    # the `argument_map` or `argument` subtree, or None if the codeblock was skipped
+    tree: Tree | None
+    diagnostics: list[ArgdownDiagnostic]
+
+
+class _Recovery:
+    """
+    Feeds tokens into an interactive LALR parser of a codeblock in steps (of
+    one line, say), and restores the state before a step if the parser rejects
+    it.
+    """
+
+    def __init__(self, parser: Lark):
+        self.parser = parser.parse_interactive(start="section")
+
+    def snapshot(self) -> InteractiveParser:
+        parser = self.parser.copy(deepcopy_values=False)
+        # the LALR tree builder extends the children of expanded helper rules
+        # (of `child+`, say) in place, so these trees are copied; all other
+        # trees are never modified after reduction, and are shared
+        values = parser.parser_state.value_stack
+        for j, value in enumerate(values):
+            if isinstance(value, Tree) and value.data.startswith("_"):
+                values[j] = Tree(value.data, list(value.children))
+        return parser
+
+    def feed(self, tokens: list[Token]) -> UnexpectedInput | None:
+        "Feeds tokens, and returns the error (after restoring the state) if they are rejected"
+        snapshot = self.snapshot()
+        try:
+            for token in tokens:
+                self.parser.feed_token(token)
+        except UnexpectedInput as error:
+            self.parser = snapshot
+            return error
+        return None
+
+
+def _message(error: Exception) -> str:
+    if isinstance(error, UnexpectedToken):
+        return f"Unexpected {error.token.type.lstrip('_')} token"
+    return str(error) or "Invalid line"
+
+
+class _TolerantParse:
+    "Parses the codeblocks of a document in tolerant mode, one parser state per codeblock"
+
+    def __init__(self, parser: Lark, text: str):
+        self.sections: list[DocumentSection] = []
+        for block in _blocks(text):
+            self.block = block
+            self.diagnostics: list[ArgdownDiagnostic] = []
+            self.recovery = _Recovery(parser)
+            if block.span.kind is ArgumentMapBlock:
+                tokens = self._map()
+            else:
+                tokens = self._argument()
+            tree = None
+            if tokens is not None and self.recovery.feed(tokens) is None:
+                tree = self.recovery.parser.feed_token(_EOF)
+            else:
+                self._report(block.lines[0], "Invalid codeblock skipped", column=1)
+                # in document order
+                self.diagnostics.insert(0, self.diagnostics.pop())
+            self.sections.append(DocumentSection(block.span, tree, self.diagnostics))
+
+    def _report(self, line: _Line, message: str, token: Token | None = None, column: int | None = None):
+        text, i, shift = line
+        if token is not None and token.line is not None:
+            number, column = token.line, token.column
+        else:
+            number = self.block.span.line + i
+            if column is None:
+                column = shift + len(text) - len(text.lstrip(" \t")) + 1
+        self.diagnostics.append(ArgdownDiagnostic(0, number, column, message, self.block.raw_lines[i]))
+
+    def _reject(self, line: _Line, error: Exception):
+        token = error.token if isinstance(error, UnexpectedToken) else None
+        self._report(line, _message(error), token)
+
+    def _feed(self, line: _Line, tokens: list[Token]) -> bool:
+        "Feeds the tokens of a line, and reports the line if they are rejected"
+        error = self.recovery.feed(tokens)
+        if error is not None:
+            self._reject(line, error)
+        return error is None
+
+    def _map(self) -> list[Token]:
+        "Feeds the lines of an argument map, and returns the closing tokens"
+        block = self.block
+        self.recovery.feed([_MAP])
+        levels = [0]
+        has_root = False
+        # indentation of a skipped line, whose children are skipped as well
+        skipped: int | None = None
+        for k, line in enumerate(block.lines):
+            text, i, shift = line
+            if not text.strip(" \t"):
+                continue
+            indent = 0 if k == 0 else _indentation(text)
+            if skipped is not None:
+                if indent > skipped:
+                    self._report(line, "Child of invalid line skipped")
+                    continue
+                skipped = None
+            try:
+                tokens, next_levels = _map_line(
+                    text, k, levels, has_root, block.span.line + i, block.offsets[i], shift
+                )
+            except _Fallback as error:
+                self._reject(line, error)
+                skipped = indent
+                continue
+            if not self._feed(line, tokens):
+                skipped = indent
+                continue
+            levels = next_levels
+            has_root = True
+        return [_DEDENT] * (len(levels) - 1) + [_END]
+
+    def _argument(self) -> list[Token] | None:
+        "Feeds the lines of an argument, and returns the closing tokens"
+        block = self.block
+        lines = _strip_lines(block.lines)
+        if not lines:
+            return None
+        self.recovery.feed([_ARGUMENT])
+        match, k = _argument_head(lines)
+        if match is not None:
+            text, i, shift = lines[0]
+            self.recovery.feed(_head_tokens(match, block.span.line + i, block.offsets[i], shift) + [_NL])
+            if k == 1:
+                self._report(lines[0], "Missing empty line after argument head")
+        # an inference line still lacking its conclusion, and the state before it
+        inference: tuple[_Line, InteractiveParser] | None = None
+        for line in lines[k:]:
+            text, i, shift = line
+            if not text.strip(" \t"):
+                self._report(line, "Empty line in premise conclusion structure")
+                continue
+            try:
+                tokens = _argument_line(text, block.span.line + i, block.offsets[i], shift)
+            except _Fallback as error:
+                self._reject(line, error)
+                continue
+            snapshot = self.recovery.snapshot()
+            if self._feed(line, tokens):
+                inference = (line, snapshot) if tokens[0].type.startswith("INFERENCE") else None
+        if inference is not None:
+            self._report(inference[0], "Inference line without conclusion")
+            self.recovery.parser = inference[1]
+        return [_END]
+
+
+class DocumentParser:
+    """
+    Parser of whole Argdown documents in a single LALR pass.
+    """
+
+    def __init__(self):
+        self.parser = Lark(
+            ARGDOWN_DOCUMENT_GRAMMAR,
+            parser="lalr",
+            lexer=DocumentLexer,
+            maybe_placeholders=False,
+            start=["start", "section"],
+        )
+
+    def parse(self, text: str) -> Tree | None:
+        """
+        Parses a document into a tree with one `argument_map` or `argument`
+        subtree per codeblock. Returns None if the document is to be parsed
+        blockwise, in particular if it contains syntax errors.
+        """
+        try:
+            return self.parser.parse(text, start="start")
+        except (_Fallback, UnexpectedInput):
+            return None
+
+    def parse_tolerant(self, text: str) -> list[DocumentSection]:
+        """
+        Parses a document in a single pass like `parse`, but recovers from
+        errors: lines that cannot be tokenized or are rejected by the parser
+        are skipped (in argument maps, together with their children), as are
+        codeblocks that cannot be completed. Returns the codeblocks of the
+        document with their subtrees and the problems found, located in the
+        document (of index 0).
+        """
+        return _TolerantParse(self.parser, text).sections
@@ -0,0 +1,265 @@
+"""
+Hand-written fast-path parsers for Argdown codeblocks.
+
+The parsers scan codeblocks line by line and build the same parse trees (with
+the same token types, values and positions) as the Lark parsers, so that the
+tree transformers are shared. They only accept the common, valid cases and
+return None for anything else, in which case the caller falls back to Lark,
+which also produces the diagnostics for invalid codeblocks.
+"""
+
+import re
+
+from lark import Token, Tree
+
+_TAB_LEN = 4  # as in ArgdownMapIndenter
+
+_RULE_START = Token("RULE", "start")
+_RULE_ROOT = Token("RULE", "root")
+_RULE_CHILD = Token("RULE", "child")
+_RULE_REASON = Token("RULE", "reason")
+_RULE_ARGUMENT_HEAD = Token("RULE", "argument_head")
+_RULE_ARGUMENT_BODY = Token("RULE", "argument_body")
+_RULE_PREMISE = Token("RULE", "premise")
+_RULE_CONCLUSION = Token("RULE", "conclusion")
+
+# terminals of the relation prefixes of reasons
+_RELATIONS = {
+    "+ ": "LEFT_PRO",
+    "<+ ": "LEFT_PRO",
+    "+> ": "RIGHT_PRO",
+    "- ": "LEFT_CON",
+    "<- ": "LEFT_CON",
+    "-> ": "RIGHT_CON",
+    "<_ ": "LEFT_UNDERCUT",
+    "_> ": "RIGHT_UNDERCUT",
+    ">< ": "CONTRADICT",
+}
+
+_PROPOSITION_LABEL = r"\[[^\]]+\]"
+_ARGUMENT_LABEL = r"<[^>]+>"
+_RELATION = "(?P<relation>" + "|".join(re.escape(r) for r in _RELATIONS) + ")"
+
+
+def _labeled(label: str, text: bool = True) -> str:
+    """
+    Pattern of `_label ":" TEXT | _label | TEXT` (without the last alternative
+    unless `text`) up to the end of the line. Texts starting with a label
+    bracket are checked separately, as they may be labels.
+    """
+    pattern = (
+        rf"[ \t]*(?:(?P<label>{label})[ \t]*(?::[ \t]*(?P<labeled_text>[^ \t].*))?[ \t]*"
+    )
+    if text:
+        pattern += r"|(?P<text>[^ \t].*)"
+    return pattern + ")$"
+
+
+_ROOT_LINE = re.compile(r"[ \t]*" + _labeled(f"{_PROPOSITION_LABEL}|{_ARGUMENT_LABEL}"))
+_CHILD_LINE = re.compile(r"[ \t]*" + _RELATION + _labeled(f"{_PROPOSITION_LABEL}|{_ARGUMENT_LABEL}"))
+
+_HEAD_LINE = re.compile(_labeled(_ARGUMENT_LABEL, text=False))
+_PCS_LINE = re.compile(r"[ \t]*(?P<pcs_label>\([A-Z]*\d+\))" + _labeled(_PROPOSITION_LABEL))
+_INFERENCE_LINE = re.compile(r"[ \t]*(?P<inference>--.*)$")
+
+
+class _Fallback(Exception):
+    """
+    Raised when a codeblock is left to the Lark parser, possibly with a
+    description of the line that could not be handled.
+    """
+
+
+def _token(type_: str, match: re.Match, group: str, line: int, offset: int, shift: int = 0) -> Token:
+    """
+    Token of a matched group in a line starting at `offset`, whose columns are
+    shifted by `shift` (the indentation stripped off the line, if any).
+    """
+    start, end = match.span(group)
+    start += shift
+    end += shift
+    return Token(type_, match[group], offset + start, line, start + 1, line, end + 1, offset + end)
+
+
+def _labeled_tokens(
+    match: re.Match, line: int, offset: int, brackets: str = "[<", shift: int = 0
+) -> list[Token]:
+    """
+    Tokens of a match of a `_labeled` pattern, where `brackets` are the
+    opening brackets of the labels that may occur.
+    """
+    text = match["text"]
+    if text is not None:
+        closing = "]" if text[0] == "[" else ">"
+        if text[0] in brackets and text[1:2] != closing:
+            # a label followed by anything but a colon, or a label spanning lines
+            raise _Fallback("Missing colon after label" if closing in text else "Unclosed label")
+        return [_token("TEXT", match, "text", line, offset, shift)]
+    label = match["label"]
+    type_ = "PROPOSITION_LABEL" if label[0] == "[" else "ARGUMENT_LABEL"
+    tokens = [_token(type_, match, "label", line, offset, shift)]
+    if match["labeled_text"] is not None:
+        tokens.append(_token("TEXT", match, "labeled_text", line, offset, shift))
+    return tokens
+
+
+def _head_tokens(match: re.Match, line: int, offset: int, shift: int = 0) -> list[Token]:
+    "Tokens of a match of `_HEAD_LINE`"
+    tokens = [_token("ARGUMENT_LABEL", match, "label", line, offset, shift)]
+    if match["labeled_text"] is not None:
+        tokens.append(_token("TEXT", match, "labeled_text", line, offset, shift))
+    return tokens
+
+
+def _inference_token(match: re.Match, line: int, offset: int, shift: int = 0) -> Token:
+    """
+    Token of a match of `_INFERENCE_LINE`. Like the Lark lexer, lines of five
+    or more dashes are taken as (empty) inference information.
+    """
+    value = match["inference"]
+    if len(value) >= 5 and value.endswith("--"):
+        type_ = "INFERENCE_INFO"
+    elif len(value) >= 3 and not value.strip("-"):
+        type_ = "INFERENCE_LINE"
+    else:
+        raise _Fallback("Invalid inference line")
+    # inference tokens include the newline
+    start = match.start("inference") + shift
+    return Token(
+        type_, value + "\n", offset + start, line, start + 1, line + 1, 1, offset + start + len(value) + 1
+    )
+
+
+def _indentation(line: str) -> int:
+    "Width of the indentation of a line, as computed by ArgdownMapIndenter"
+    whitespace = line[:len(line) - len(line.lstrip(" \t"))]
+    return len(whitespace) + whitespace.count("\t") * (_TAB_LEN - 1)
+
+
+def parse_argument_map(text: str) -> Tree | None:
+    """
+    Parses an argument map codeblock (terminated by a newline) like the Lark
+    parser with `ARGDOWN_MAP_GRAMMAR` and `ArgdownMapIndenter`. Returns None if
+    the codeblock is not a plain valid argument map.
+    """
+    if "\r" in text:
+        return None
+    try:
+        return _parse_argument_map(text)
+    except _Fallback:
+        return None
+
+
+def _parse_argument_map(text: str) -> Tree:
+    roots: list[Tree] = []
+    # open nodes by depth, and the indentation levels of the indenter
+    open_nodes: list[Tree] = []
+    levels = [0]
+    offset = 0
+    for number, line in enumerate(text.split("\n"), start=1):
+        line_offset = offset
+        offset += len(line) + 1
+        if not line.strip(" \t"):
+            continue
+
+        indent = 0
+        if line_offset > 0:
+            # indentation is only computed after newlines
+            indent = _indentation(line)
+        if indent > levels[-1]:
+            if not open_nodes:
+                raise _Fallback
+            levels.append(indent)
+        else:
+            while indent < levels[-1]:
+                levels.pop()
+            if indent != levels[-1]:
+                raise _Fallback
+        depth = len(levels) - 1
+        del open_nodes[depth:]
+
+        if depth == 0:
+            match = _ROOT_LINE.match(line)
+            if match is None:
+                raise _Fallback
+            node = Tree(_RULE_ROOT, [Tree(_RULE_REASON, _labeled_tokens(match, number, line_offset))])
+            roots.append(node)
+        else:
+            match = _CHILD_LINE.match(line)
+            if match is None:
+                raise _Fallback
+            relation = _token(_RELATIONS[match["relation"]], match, "relation", number, line_offset)
+            reason = Tree(_RULE_REASON, _labeled_tokens(match, number, line_offset))
+            node = Tree(_RULE_CHILD, [relation, reason])
+            open_nodes[depth - 1].children.append(node)
+        open_nodes.append(node)
+
+    if not roots:
+        raise _Fallback
+    return Tree(_RULE_START, roots)
+
+
+def _lines(text: str):
+    "Yields the lines of a text with their 1-based numbers and offsets"
+    offset = 0
+    for number, line in enumerate(text.split("\n"), start=1):
+        yield line, number, offset
+        offset += len(line) + 1
+
+
+def parse_argument(text: str) -> Tree | None:
+    """
+    Parses a stripped premise conclusion structure codeblock like the Lark
+    parser with `ARGDOWN_ARGUMENT_GRAMMAR`. Returns None if the codeblock is not
+    a plain valid argument.
+    """
+    if "\r" in text:
+        return None
+    try:
+        return _parse_argument(text)
+    except _Fallback:
+        return None
+
+
+def _parse_argument(text: str) -> Tree:
+    lines = list(_lines(text))
+    children = []
+    i = 0
+    match = _HEAD_LINE.match(lines[0][0])
+    if match is not None:
+        children.append(Tree(_RULE_ARGUMENT_HEAD, _head_tokens(match, 1, 0)))
+        # the head is followed by at least one empty line
+        i = 1
+        while i < len(lines) and not lines[i][0].strip(" \t"):
+            i += 1
+        if i == 1:
+            raise _Fallback
+
+    body: list[Tree] = []
+    inference: Token | None = None
+    for line, number, offset in lines[i:]:
+        if inference is None:
+            match = _INFERENCE_LINE.match(line)
+            if match is not None:
+                inference = _inference_token(match, number, offset)
+                continue
+        match = _PCS_LINE.match(line)
+        if match is not None:
+            tokens = [_token("PCS_LABEL", match, "pcs_label", number, offset)]
+            tokens.extend(_labeled_tokens(match, number, offset, brackets="["))
+            if inference is None:
+                body.append(Tree(_RULE_PREMISE, tokens))
+            else:
+                body.append(Tree(_RULE_CONCLUSION, [inference] + tokens))
+                inference = None
+            continue
+        match = _CHILD_LINE.match(line)
+        if match is None or inference is not None or not body:
+            raise _Fallback
+        relation = _token(_RELATIONS[match["relation"]], match, "relation", number, offset)
+        body.append(Tree(_RULE_REASON, [relation] + _labeled_tokens(match, number, offset)))
+
+    if inference is not None or not body or body[0].data != "premise":
+        raise _Fallback
+    children.append(Tree(_RULE_ARGUMENT_BODY, body))
+    return Tree(_RULE_START, children)
@@ -0,0 +1,274 @@
+"Flat representation of parsed codeblocks, for handing them between processes"
+
+from array import array
+import copy
+import logging
+import pickle
+
+from lark import Token, Tree
+
+from pyargdown.handler import ArgdownHandler
+from pyargdown.memory import profile_stage
+from pyargdown.model import (
+    Argdown,
+    ArgdownEdge,
+    Argument,
+    Conclusion,
+    DialecticalType,
+    Proposition,
+    PropositionReference,
+    Valence,
+)
+from pyargdown.parser.argument_map_parser import ArgumentMapParser
+from pyargdown.parser.argument_parser import ArgumentParser
+from pyargdown.parser.base import Mention
+from pyargdown.parser.preprocessor import BlockSpan, LineMap
+
+logger = logging.getLogger(__name__)
+
+# kinds of node and PCS records
+_PROPOSITION, _ARGUMENT = 0, 1
+_PREMISE, _CONCLUSION = 0, 1
+
+# number of integers per node, PCS, edge and mention record
+_NODE, _PCS, _EDGE, _MENTION = 4, 2, 4, 5
+
+
+class _Recorder(ArgdownHandler):
+    """
+    Records the propositions, arguments and relations reported while a parse
+    tree is transformed. Labels generated for unlabeled items are recorded by
+    the label they are generated from, and cannot collide with labels of the
+    codeblock ("]" and ">" end labels).
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.labels: dict[str, int] = {}
+        self.generated = array("l")
+        # base labels of generated labels
+        self.bases: dict[str, str] = {}
+        self.nodes = array("l")
+        self.node_payloads: list[tuple] = []
+        self.pcs = array("l")
+        self.pcs_payloads: list[tuple] = []
+        self.edges = array("l")
+
+    def label(self, label: str) -> int:
+        return self.labels.setdefault(label, len(self.labels))
+
+    def make_label_unique(self, label: str) -> str:
+        local = f"{label}]>{len(self.generated)}"
+        self.generated.append(self.label(local))
+        self.bases[local] = label
+        return local
+
+    def on_proposition(self, proposition: Proposition):
+        self._add_node(_PROPOSITION, proposition.label, proposition.texts, proposition.data)  # type: ignore
+
+    def on_argument(self, argument: Argument):
+        start = len(self.pcs_payloads)
+        for pr in argument.pcs:
+            if isinstance(pr, Conclusion):
+                self.pcs.extend((_CONCLUSION, self.label(pr.proposition_label)))
+                self.pcs_payloads.append((pr.label, pr.inference_info, pr.inference_data))
+            else:
+                self.pcs.extend((_PREMISE, self.label(pr.proposition_label)))
+                self.pcs_payloads.append((pr.label,))
+        self._add_node(_ARGUMENT, argument.label, argument.gists, argument.data, start)  # type: ignore
+
+    def on_relation(self, edge: ArgdownEdge):
+        # the parsers report relations of a single dialectical type and without data
+        (dialectic,) = edge.dialectics
+        self.edges.extend((self.label(edge.source), self.label(edge.target), edge.valence.value, dialectic.value))
+
+    def _add_node(self, kind: int, label: str, texts: list[str], data: dict, start: int = 0):
+        self.nodes.extend((kind, self.label(label), start, len(self.pcs_payloads)))
+        self.node_payloads.append((tuple(texts), data))
+
+
+def _restore(labels, generated, nodes, node_payloads, pcs, pcs_payloads, edges, mentions, position, span, line_map):
+    buffers = []
+    for buffer in (generated, nodes, pcs, edges, mentions):
+        records = array("l")
+        # out-of-band buffers may be handed back as any (typed) buffer
+        records.frombytes(memoryview(buffer).cast("B"))
+        buffers.append(records)
+    generated, nodes, pcs, edges, mentions = buffers
+    return FlatCodeblock(
+        labels, generated, nodes, node_payloads, pcs, pcs_payloads, edges, mentions, position, span, line_map
+    )
+
+
+class FlatCodeblock:
+    """
+    A parsed codeblock as flat tables of records rather than a parse tree, so
+    that it can be handed from a worker process to the parent cheaply:
+
+    - `labels`: the label table, referenced by index in all other records;
+      labels listed in `generated` are the base labels of unlabeled items,
+      which are made unique when the codeblock is ingested
+    - `nodes`: (kind, label, pcs start, pcs stop) per proposition or argument
+      added, with texts or gists and data in `node_payloads`
+    - `pcs`: (kind, proposition label) per premise or conclusion of an
+      argument, with PCS label (and inference information) in `pcs_payloads`
+    - `edges`: (source, target, valence, dialectical type) per relation
+    - `mentions`: (label or source, -1 or target, -1 or valence, line, column)
+      per mention, if recorded
+
+    All integer records are kept in arrays of machine integers, which are
+    pickled as out-of-band buffers with pickle protocol 5 if the pickler is
+    given a `buffer_callback`.
+
+    Ingesting a codeblock adds the same propositions, arguments and relations
+    as transforming its parse tree, in the same order (except that relations
+    are added after all nodes), so the resulting argument map is the same.
+    """
+
+    __slots__ = (
+        "labels", "generated", "nodes", "node_payloads", "pcs", "pcs_payloads",
+        "edges", "mentions", "position", "span", "line_map",
+    )
+
+    def __init__(
+        self,
+        labels: tuple[str, ...],
+        generated: array,
+        nodes: array,
+        node_payloads: tuple[tuple, ...],
+        pcs: array,
+        pcs_payloads: tuple[tuple, ...],
+        edges: array,
+        mentions: array,
+        position: tuple[int, int],
+        span: BlockSpan | None = None,
+        line_map: LineMap | None = None,
+    ):
+        self.labels = labels
+        self.generated = generated
+        self.nodes = nodes
+        self.node_payloads = node_payloads
+        self.pcs = pcs
+        self.pcs_payloads = pcs_payloads
+        self.edges = edges
+        self.mentions = mentions
+        # line and column at which the codeblock starts
+        self.position = position
+        self.span = span
+        self.line_map = line_map
+
+    @classmethod
+    def from_tree(
+        cls,
+        parser_class: type[ArgumentMapParser] | type[ArgumentParser],
+        tree: Tree,
+        topology_only: bool = False,
+        mentions: bool = False,
+        span: BlockSpan | None = None,
+        line_map: LineMap | None = None,
+    ) -> "FlatCodeblock":
+        "Flattens the parse tree of a codeblock, recording mentions if `mentions`"
+        recorder = _Recorder()
+        recorded: list[Mention] | None = [] if mentions else None
+        parser_class.transform(tree, recorder, topology_only=topology_only, mentions=recorded)
+        records = array("l")
+        for key, line, column in recorded or []:
+            if isinstance(key, str):
+                records.extend((recorder.label(key), -1, -1, line, column))
+            else:
+                source, target, valence = key
+                records.extend((recorder.label(source), recorder.label(target), Valence[valence].value, line, column))
+        token = next(tree.scan_values(lambda v: isinstance(v, Token)), None)
+        return cls(
+            tuple(recorder.bases.get(label, label) for label in recorder.labels),
+            recorder.generated,
+            recorder.nodes,
+            tuple(recorder.node_payloads),
+            recorder.pcs,
+            tuple(recorder.pcs_payloads),
+            recorder.edges,
+            records,
+            (token.line, token.column) if token is not None else (1, 1),
+            span,
+            line_map,
+        )
+
+    def __reduce_ex__(self, protocol):
+        arrays = (self.generated, self.nodes, self.pcs, self.edges, self.mentions)
+        if protocol >= 5:
+            buffers = tuple(pickle.PickleBuffer(records) for records in arrays)
+        else:
+            buffers = tuple(records.tobytes() for records in arrays)
+        generated, nodes, pcs, edges, mentions = buffers
+        return _restore, (
+            self.labels, generated, nodes, self.node_payloads, pcs, self.pcs_payloads, edges, mentions,
+            self.position, self.span, self.line_map,
+        )
+
+    def ingest_in_argmap(self, argdown: Argdown, mentions: list[Mention] | None = None) -> Argdown:
+        """
+        Ingests the codeblock into a copy of `argdown` and returns the copy, or the
+        unchanged original if ingestion fails, like `ingest_in_argmap` of the
+        parsers. Recorded mentions are appended to `mentions`, if given.
+        """
+        with profile_stage("deepcopy"):
+            working_argdown = copy.deepcopy(argdown)
+        try:
+            with profile_stage("transform"):
+                labels = self._emit(working_argdown)
+        except Exception as e:
+            logger.error(f"Error when ingesting argdown argument: {e}. Returning original argdown document.")
+            return argdown
+        with profile_stage("grounding"):
+            working_argdown._update()
+        if mentions is not None:
+            records = self.mentions
+            for i in range(0, len(records), _MENTION):
+                source, target, valence, line, column = records[i:i + _MENTION]
+                key = labels[source] if target < 0 else (labels[source], labels[target], Valence(valence).name)
+                mentions.append((key, line, column))
+        return working_argdown
+
+    def _emit(self, handler: ArgdownHandler) -> list[str]:
+        "Reports the recorded items to `handler` and returns the resolved label table"
+        labels = list(self.labels)
+        unresolved = set(self.generated)
+        nodes, pcs = self.nodes, self.pcs
+        # nodes, in the order reported by the transformer; relations between them
+        # are reported after all nodes, in the order reported by the transformer
+        for i, payload in zip(range(0, len(nodes), _NODE), self.node_payloads):
+            kind, label, start, stop = nodes[i:i + _NODE]
+            if label in unresolved:
+                # generated just before the node is reported, as by the transformer
+                labels[label] = handler.make_label_unique(labels[label])
+                unresolved.discard(label)
+            texts, data = payload
+            if kind == _PROPOSITION:
+                handler.on_proposition(Proposition(label=labels[label], texts=list(texts), data=data))
+                continue
+            references: list[PropositionReference] = []
+            for j in range(start, stop):
+                pcs_kind, proposition = pcs[j * _PCS:(j + 1) * _PCS]
+                if pcs_kind == _CONCLUSION:
+                    pcs_label, inference_info, inference_data = self.pcs_payloads[j]
+                    references.append(Conclusion(
+                        proposition_label=labels[proposition],
+                        label=pcs_label,
+                        inference_info=inference_info,
+                        inference_data=inference_data,
+                    ))
+                else:
+                    references.append(PropositionReference(labels[proposition], self.pcs_payloads[j][0]))
+            handler.on_argument(Argument(label=labels[label], gists=list(texts), data=data, pcs=references))
+            for pr in references:
+                handler.on_pcs_item(labels[label], pr)
+        edges = self.edges
+        for i in range(0, len(edges), _EDGE):
+            source, target, valence, dialectic = edges[i:i + _EDGE]
+            handler.on_relation(ArgdownEdge(
+                source=labels[source],
+                target=labels[target],
+                valence=Valence(valence),
+                dialectics=[DialecticalType(dialectic)],
+            ))
+        return labels
@@ -0,0 +1,184 @@
+"Lazy argument maps that parse codeblocks on demand"
+
+import re
+from typing import TYPE_CHECKING
+
+from pyargdown.model import Argdown, ArgdownMultiDiGraph, Argument, Proposition, _GENERATED_LABEL_PATTERN
+from pyargdown.parser.preprocessor import ArgdownCodeBlock
+
+if TYPE_CHECKING:
+    from pyargdown.parser.main import _ParsedCodeblock
+
+# label (if any) at the start of a preprocessed reason or pcs line,
+# optionally preceded by a dialectical relation or a pcs label
+_LINE_LABEL_PATTERN = re.compile(
+    r"^(?:(?:<[+\-_]|[+\-_]>|><|[+\-])\s*|\([A-Z]*\d+\)\s*)?(?:\[([^\]]+)\]|<([^>]+)>)?"
+)
+# dialectical relation at the start of a line
+_RELATION_PATTERN = re.compile(r"^(?:<[+\-_]|[+\-_]>|><|[+\-])")
+
+
+def _scan_codeblock(codeblock: ArgdownCodeBlock) -> tuple[dict[str, str], bool] | None:
+    """
+    Scans a preprocessed codeblock without parsing it. Returns the labels mentioned
+    in the block together with their type, and whether parsing the block may
+    generate labels for unlabeled propositions or arguments, or None if the block
+    cannot be scanned: the parsers do not read a relation at the start of the first
+    line as such (for `<_ <E>: e`, the label is `_ <E`).
+    """
+    labels: dict[str, str] = {}
+    generates_labels = False
+    first = True
+    for line in codeblock.split("\n"):
+        line = line.strip()
+        if not line or line.startswith("--"):
+            continue
+        if first and _RELATION_PATTERN.match(line):
+            return None
+        first = False
+        match = _LINE_LABEL_PATTERN.match(line)
+        proposition_label, argument_label = match.groups()  # type: ignore
+        if proposition_label is not None:
+            labels.setdefault(proposition_label, Proposition.__name__)
+        elif argument_label is not None:
+            labels.setdefault(argument_label, Argument.__name__)
+        else:
+            generates_labels = True
+    if any(_GENERATED_LABEL_PATTERN.match(label) for label in labels):
+        # explicit labels that look like generated ones shift the numbering
+        generates_labels = True
+    return labels, generates_labels
+
+
+class LazyArgdown:
+    """
+    Argument map of an Argdown document that is split into codeblocks up front,
+    but parses codeblocks only when needed to answer a request.
+
+    Each codeblock is preprocessed and scanned for the labels it mentions. Looking
+    up a proposition or argument parses and ingests (in document order) only the
+    codeblocks that mention its label, together with all preceding codeblocks
+    that may generate labels for unlabeled items, so that the result is the same
+    as in the fully parsed map. Parse trees are cached. Syntax errors are raised
+    when the erroneous codeblock is parsed.
+
+    Lookups of generated labels and of grounded relations, which depend on the
+    entire map, need the fully parsed map returned by `materialize`. Documents
+    with a codeblock that cannot be scanned (see `_scan_codeblock`) are parsed
+    entirely on the first request.
+    """
+
+    def __init__(
+        self,
+        codeblocks: list[ArgdownCodeBlock],
+        axiomatic_closure: bool = True,
+        topology_only: bool = False,
+    ):
+        # avoid circular import
+        from pyargdown.parser.main import _get_parsers
+
+        self.axiomatic_closure = axiomatic_closure
+        self.topology_only = topology_only
+        preprocessor = _get_parsers()[0]
+        self._codeblocks = [preprocessor.process(codeblock) for codeblock in codeblocks]
+        self._trees: dict[int, "_ParsedCodeblock | None"] = {}
+        self._mentions: dict[str, list[int]] = {}
+        self._types: dict[str, str] = {}
+        self._generating: list[int] = []
+        # partial maps by the codeblocks ingested into them
+        self._partial_maps: dict[tuple[int, ...], Argdown] = {}
+        self._scanned = True
+        for i, codeblock in enumerate(self._codeblocks):
+            scanned = _scan_codeblock(codeblock)
+            if scanned is None:
+                self._scanned = False
+                break
+            labels, generates_labels = scanned
+            for label, label_type in labels.items():
+                self._mentions.setdefault(label, []).append(i)
+                self._types.setdefault(label, label_type)
+            if generates_labels:
+                self._generating.append(i)
+        self._argdown: Argdown | None = None
+
+    def _labels(self) -> dict[str, str]:
+        if not self._scanned:
+            # the labels are taken from the complete map
+            self.materialize()
+        return self._types
+
+    @property
+    def proposition_labels(self) -> list[str]:
+        """
+        Returns the labels of all labeled propositions, without parsing (if the
+        document can be scanned).
+        """
+        return [label for label, label_type in self._labels().items() if label_type == Proposition.__name__]
+
+    @property
+    def argument_labels(self) -> list[str]:
+        """
+        Returns the labels of all labeled arguments, without parsing (if the
+        document can be scanned).
+        """
+        return [label for label, label_type in self._labels().items() if label_type == Argument.__name__]
+
+    def __contains__(self, label: str) -> bool:
+        return label in self._labels()
+
+    def _parse(self, i: int):
+        # avoid circular import
+        from pyargdown.parser.main import _parse_codeblock
+
+        if i not in self._trees:
+            self._trees[i] = _parse_codeblock(self._codeblocks[i], preprocessed=True)
+        return self._trees[i]
+
+    def _ingest(self, indices: list[int]) -> Argdown:
+        # avoid circular import
+        from pyargdown.parser.main import _ingest
+
+        argdown = ArgdownMultiDiGraph(axiomatic_closure=self.axiomatic_closure)
+        return _ingest((self._parse(i) for i in indices), argdown, topology_only=self.topology_only)
+
+    def _partial_map(self, label: str) -> Argdown | None:
+        if self._argdown is not None:
+            return self._argdown
+        if not self._scanned:
+            return self.materialize()
+        mentions = self._mentions.get(label)
+        if mentions is None:
+            if _GENERATED_LABEL_PATTERN.match(label):
+                return self.materialize()
+            return None
+        last = mentions[-1]
+        indices = set(mentions)
+        indices.update(i for i in self._generating if i < last)
+        key = tuple(sorted(indices))
+        if key not in self._partial_maps:
+            self._partial_maps[key] = self._ingest(list(key))
+        return self._partial_maps[key]
+
+    def get_proposition(self, label: str) -> Proposition | None:
+        argdown = self._partial_map(label)
+        return None if argdown is None else argdown.get_proposition(label)
+
+    def get_argument(self, label: str) -> Argument | None:
+        argdown = self._partial_map(label)
+        return None if argdown is None else argdown.get_argument(label)
+
+    def materialize(self) -> Argdown:
+        """
+        Parses all remaining codeblocks and returns the complete argument map.
+        """
+        if self._argdown is None:
+            self._argdown = self._ingest(list(range(len(self._codeblocks))))
+            # partial maps are not needed anymore
+            self._partial_maps = {}
+            if not self._scanned:
+                self._types = {
+                    label: label_type
+                    for label, label_type in self._argdown.nodes(data="type")  # type: ignore
+                    if not _GENERATED_LABEL_PATTERN.match(label)
+                }
+        return self._argdown
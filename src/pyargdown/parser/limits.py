@@ -0,0 +1,107 @@
+"Resource limits for parsing single documents"
+
+import time
+from typing import NamedTuple
+
+from pyargdown.model import Argdown
+
+
+class ParseLimits(NamedTuple):
+    """
+    Limits of the resources `parse_argdown` may spend on a document (all of its
+    texts), each unlimited if None:
+
+    - `max_chars`: number of characters of the texts
+    - `max_blocks`: number of codeblocks
+    - `max_depth`: nesting depth of indented lines (such as reasons of reasons
+      in argument maps), where unindented lines have depth 1
+    - `max_nodes`: number of propositions and arguments of the argument map
+    - `timeout`: wall-clock seconds
+
+    Limits are checked cooperatively, before and between the stages of parsing
+    and between codeblocks, so a stage in progress (such as parsing a long
+    codeblock) is not interrupted, and the timeout may be exceeded by the time
+    of a single stage.
+    """
+    max_chars: int | None = None
+    max_blocks: int | None = None
+    max_depth: int | None = None
+    max_nodes: int | None = None
+    timeout: float | None = None
+
+
+class ArgdownLimitError(Exception):
+    """
+    Raised by `parse_argdown` if a document exceeds one of its `ParseLimits`, so
+    that batch jobs can skip the document. `limit` is the name of the limit,
+    `value` the value reached by the document when the limit was checked.
+    """
+
+    def __init__(self, limit: str, value: int | float, maximum: int | float):
+        super().__init__(limit, value, maximum)
+        self.limit = limit
+        self.value = value
+        self.maximum = maximum
+
+    def __str__(self):
+        return f"Document exceeds {self.limit}={self.maximum} ({self.value})"
+
+
+def nesting_depth(text: str) -> int:
+    """
+    Returns the maximum nesting depth of the non-empty lines of a text, the
+    number of enclosing lines with less indentation plus one.
+    """
+    indents: list[int] = []
+    depth = 0
+    for line in text.split("\n"):
+        content = line.lstrip()
+        if not content:
+            continue
+        indent = len(line) - len(content)
+        while indents and indents[-1] >= indent:
+            indents.pop()
+        indents.append(indent)
+        depth = max(depth, len(indents))
+    return depth
+
+
+class _Budget:
+    """
+    Tracks the resources spent on parsing a document and raises `ArgdownLimitError`
+    as soon as a check finds a limit exceeded.
+    """
+
+    # clock measuring the time spent, in seconds
+    clock = staticmethod(time.monotonic)
+
+    def __init__(self, limits: ParseLimits):
+        self.limits = limits
+        self.start = None if limits.timeout is None else self.clock()
+        self.blocks = 0
+
+    @staticmethod
+    def _check(limit: str, value: int | float, maximum: int | float | None):
+        if maximum is not None and value > maximum:
+            raise ArgdownLimitError(limit, value, maximum)
+
+    def check_texts(self, texts: list[str]):
+        "Checks the size and nesting depth of the texts before parsing"
+        self._check("max_chars", sum(len(text) for text in texts), self.limits.max_chars)
+        if self.limits.max_depth is not None:
+            for text in texts:
+                self._check("max_depth", nesting_depth(text), self.limits.max_depth)
+        self.check_time()
+
+    def add_blocks(self, n: int):
+        self.blocks += n
+        self._check("max_blocks", self.blocks, self.limits.max_blocks)
+
+    def check_argdown(self, argdown: Argdown):
+        "Checks the size of the argument map and the time after ingesting a codeblock"
+        self._check("max_nodes", len(argdown.nodes), self.limits.max_nodes)  # type: ignore
+        self.check_time()
+
+    def check_time(self):
+        if self.start is not None:
+            self._check("timeout", round(self.clock() - self.start, 3), self.limits.timeout)
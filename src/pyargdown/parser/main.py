@@ -1,37 +1,48 @@
 "Main entrypoint for parsing Argdown text documents"
 
+from concurrent.futures import Executor, ThreadPoolExecutor
+import functools
 import logging
+import threading
+from typing import Iterable, Literal, NamedTuple, overload
 
+from lark import LarkError, Token, Tree, UnexpectedInput
+
+from pyargdown.handler import ArgdownHandler
+from pyargdown.memory import profile_stage
 from pyargdown.model import Argdown, ArgdownMultiDiGraph
 from pyargdown.parser.preprocessor import (
     Preprocessor,
     ArgdownCodeBlock,
     ArgumentBlock,
     ArgumentMapBlock,
+    BlockSpan,
+    LineMap,
     RemoveCommentsHandler,
     RemoveWhitespaceHandler,
     RemoveTrailingWhitespaceHandler,
     CollapseLinesHandler,
 )
 from pyargdown.parser import ArgumentMapParser, ArgumentParser
+from pyargdown.parser.base import ArgdownDiagnostic, ArgdownSyntaxError
+from pyargdown.parser.document import DocumentParser
+from pyargdown.parser.flat import FlatCodeblock
+from pyargdown.parser.lazy import LazyArgdown
+from pyargdown.parser.limits import ArgdownLimitError, ParseLimits, _Budget
+from pyargdown.sourcemap import SourceMap
 
 logger = logging.getLogger(__name__)
 
-def parse_argdown(texts: str | list[str]) -> Argdown:
-    """
-    Parse an Argdown text document as an argument map.
+# Lark parsers (and the indenter postlexer of the argument map parser) keep
+# state while parsing, so each thread gets its own parser instances. All other
+# module-level state of the parser package (grammars, error examples, label
+# constants) is immutable, and every call of `parse_argdown` builds its own
+# argument map, so parsing is safe in concurrent threads -- also on
+# free-threaded (no-GIL) builds of Python.
+_thread_local = threading.local()
 
-    Args:
-        text (str | list[str]): The Argdown code snippet(s) to parse.
 
-    Returns:
-        Argdown: The parsed argument map.
-    """
-
-    if isinstance(texts, str):
-        texts = [texts]
-
-    argdown = ArgdownMultiDiGraph()
+def _make_preprocessor() -> Preprocessor:
     preprocessor = Preprocessor()
     preprocessor.add_handler(
         RemoveCommentsHandler()
@@ -44,34 +55,501 @@ def parse_argdown(texts: str | list[str]) -> Argdown:
     ).add_handler(
         RemoveTrailingWhitespaceHandler()
     )
+    return preprocessor
 
-    # splitting
-    codeblocks: list[ArgumentMapBlock | ArgumentBlock] = []
-    for text in texts:
-        codeblocks.extend(Preprocessor.split_blocks(text))
 
+def _get_parsers() -> tuple[Preprocessor, ArgumentMapParser, ArgumentParser]:
+    parsers = getattr(_thread_local, "parsers", None)
+    if parsers is None:
+        parsers = (_make_preprocessor(), ArgumentMapParser(), ArgumentParser())
+        _thread_local.parsers = parsers
+    return parsers
 
-    # preprocess and parse each codeblock
-    argument_parser = ArgumentParser()
-    argument_map_parser = ArgumentMapParser()
+
+def _get_document_parser() -> DocumentParser:
+    parser = getattr(_thread_local, "document_parser", None)
+    if parser is None:
+        parser = _thread_local.document_parser = DocumentParser()
+    return parser
+
+
+class _ParsedCodeblock(NamedTuple):
+    parser_class: type[ArgumentMapParser] | type[ArgumentParser]
+    tree: Tree
+    span: BlockSpan | None = None
+    # lines of the parsed text in the original codeblock, if tracked
+    line_map: LineMap | None = None
+
+
+def _parse_codeblock(
+    codeblock: ArgdownCodeBlock,
+    preprocessed: bool = False,
+) -> _ParsedCodeblock | None:
+    """
+    Preprocesses (unless `preprocessed`) and parses a single codeblock, independently
+    of any argument map. Returns the class of the parser used (for ingestion) and
+    the parse tree, or None if the codeblock is empty after preprocessing.
+    """
+    preprocessor, argument_map_parser, argument_parser = _get_parsers()
+    logger.debug(f"Found codeblock of type {type(codeblock)} starting with {str(codeblock)[:20]}...")
+    if not preprocessed:
+        with profile_stage("preprocess"):
+            codeblock = preprocessor.process(codeblock)
+    if not codeblock.strip("\n "):
+        return None
+    # parsing
+    parser: ArgumentMapParser | ArgumentParser
+    if isinstance(codeblock, ArgumentMapBlock):
+        parser = argument_map_parser
+    elif isinstance(codeblock, ArgumentBlock):
+        parser = argument_parser
+    else:
+        raise ValueError(
+            f"Internal error: invalid code block type {type(codeblock)}"
+        )
+    try:
+        with profile_stage("parse"):
+            tree = parser(codeblock)
+    except (ArgdownSyntaxError, UnexpectedInput) as error:
+        # locate the error in the original document
+        error.span = codeblock.span  # type: ignore
+        raise
+    line_map = codeblock.line_map
+    if line_map is not None and parser is argument_parser:
+        # the argument parser strips leading whitespace
+        stripped = codeblock[:len(codeblock) - len(codeblock.lstrip())]
+        n_lines = stripped.count("\n")
+        line_map = line_map.select(list(range(n_lines, len(line_map.lines))))
+        line_map.columns[0] += len(stripped) - stripped.rfind("\n") - 1
+    return _ParsedCodeblock(type(parser), tree, codeblock.span, line_map)
+
+
+def _codeblock(span: BlockSpan, text: str, index: int = 0, source_map: bool = False) -> ArgdownCodeBlock:
+    codeblock = span._replace(text=index).codeblock(text)
+    if source_map:
+        codeblock.line_map = LineMap.identity(codeblock.count("\n") + 1)
+    return codeblock
+
+
+def _split_codeblocks(text: str, index: int = 0, source_map: bool = False) -> list[ArgdownCodeBlock]:
+    with profile_stage("split"):
+        return [_codeblock(span, text, index, source_map) for span in Preprocessor.scan_blocks(text)]
+
+
+def _parse_document(text: str, index: int = 0, source_map: bool = False) -> list[_ParsedCodeblock] | None:
+    """
+    Parses a whole document in a single pass. Returns the parse trees of its
+    codeblocks, or None if the document is to be parsed blockwise.
+    """
+    with profile_stage("parse"):
+        tree = _get_document_parser().parse(text)
+    if tree is None:
+        return None
+    # tokens hold document positions
+    span = BlockSpan(0, len(text), ArgdownCodeBlock, line=1, text=index)
+    line_map = LineMap.identity(text.count("\n") + 1) if source_map else None
+    return [
+        _ParsedCodeblock(
+            ArgumentMapParser if section.data == "argument_map" else ArgumentParser,
+            Tree("start", section.children),
+            span,
+            line_map,
+        )
+        for section in tree.children
+    ]
+
+
+def _parse_document_tolerant(
+    text: str, index: int, source_map: bool, diagnostics: list[ArgdownDiagnostic]
+) -> list[_ParsedCodeblock]:
+    """
+    Parses a whole document in a single pass, skipping invalid lines and
+    codeblocks, and adds the problems found to `diagnostics`. Codeblocks with
+    problems are parsed blockwise once more, so that valid syntax the
+    single-pass lexer does not handle is kept.
+    """
+    span = BlockSpan(0, len(text), ArgdownCodeBlock, line=1, text=index)
+    line_map = LineMap.identity(text.count("\n") + 1) if source_map else None
+    parsed = []
+    with profile_stage("parse"):
+        sections = _get_document_parser().parse_tolerant(text)
+    for section in sections:
+        # the single-pass lexer does not handle carriage returns like Lark
+        if section.diagnostics or "\r" in text[section.span.start:section.span.end]:
+            try:
+                result = _parse_codeblock(_codeblock(section.span, text, index, source_map))
+            except (ArgdownSyntaxError, LarkError):
+                if section.diagnostics:
+                    diagnostics.extend(d._replace(text=index) for d in section.diagnostics)
+                else:
+                    diagnostics.append(ArgdownDiagnostic(index, section.span.line, 1, "Invalid codeblock"))
+            else:
+                if result is not None:
+                    parsed.append(result)
+                continue
+        if section.tree is not None:
+            parser_class = ArgumentMapParser if section.tree.data == "argument_map" else ArgumentParser
+            parsed.append(_ParsedCodeblock(parser_class, Tree("start", section.tree.children), span, line_map))
+    return parsed
+
+
+class _FailedCodeblock(NamedTuple):
+    codeblock: ArgdownCodeBlock
+
+
+def _flatten_codeblock_in_pool(
+    codeblock: ArgdownCodeBlock,
+    topology_only: bool = False,
+    source_map: bool = False,
+) -> FlatCodeblock | _FailedCodeblock | None:
+    # Parse trees are flattened before they are handed back, which is much
+    # cheaper to pickle. Lark exceptions hold references to parser state and
+    # cannot be pickled, so failing codeblocks are handed back and re-parsed
+    # by the caller, which raises the very same exception as the sequential path.
+    try:
+        parsed = _parse_codeblock(codeblock)
+        if parsed is None:
+            return None
+        return FlatCodeblock.from_tree(
+            parsed.parser_class,
+            parsed.tree,
+            topology_only=topology_only,
+            mentions=source_map and parsed.line_map is not None,
+            span=parsed.span,
+            line_map=parsed.line_map,
+        )
+    except Exception:
+        return _FailedCodeblock(codeblock)
+
+
+def _document_position(result: _ParsedCodeblock | FlatCodeblock, line: int, column: int) -> tuple[int, int, int]:
+    "Document position of a position in a parsed codeblock"
+    span = result.span or BlockSpan(0, 0, ArgdownCodeBlock)
+    line_map = result.line_map
+    if line_map is None:
+        # approximate, unless the codeblock was parsed in a single pass
+        return span.text, span.line + line - 1, column
+    return span.text, span.line + line_map.lines[line - 1], column + line_map.columns[line - 1]
+
+
+def _within_budget(codeblocks: Iterable[ArgdownCodeBlock], budget: _Budget | None) -> Iterable[ArgdownCodeBlock]:
+    "Yields the codeblocks, checking the time budget (if any) before each"
     for codeblock in codeblocks:
-        logger.debug(f"Found codeblock of type {type(codeblock)} starting with {str(codeblock)[:20]}...")
-        codeblock = preprocessor.process(codeblock)
-        if not codeblock.strip("\n "):
+        if budget is not None:
+            budget.check_time()
+        yield codeblock
+
+
+def _ingest(
+    parsed: Iterable[_ParsedCodeblock | FlatCodeblock | _FailedCodeblock | None],
+    argdown: Argdown,
+    topology_only: bool = False,
+    source_map: SourceMap | None = None,
+    diagnostics: list[ArgdownDiagnostic] | None = None,
+    budget: _Budget | None = None,
+) -> Argdown:
+    """
+    Ingests parsed (or flattened) codeblocks into an argument map, in the given order.
+    Mentions of nodes and relations are added to `source_map`, and codeblocks
+    that cannot be ingested to `diagnostics`, if given. The argument map is
+    checked against the `budget` (if any) after each codeblock.
+    """
+    for result in parsed:
+        if isinstance(result, _FailedCodeblock):
+            result = _parse_codeblock(result.codeblock)
+        if result is None:
             continue
-        # parsing
-        parser: ArgumentMapParser | ArgumentParser
-        if isinstance(codeblock, ArgumentMapBlock):
-            parser = argument_map_parser
-        elif isinstance(codeblock, ArgumentBlock):
-            parser = argument_parser
+        mentions: list | None = None
+        if source_map is not None and result.line_map is not None:
+            mentions = []
+        if isinstance(result, FlatCodeblock):
+            ingested = result.ingest_in_argmap(argdown, mentions=mentions)
         else:
-            raise ValueError(
-                f"Internal error: invalid code block type {type(codeblock)}"
+            ingested = result.parser_class.ingest_in_argmap(
+                result.tree, argdown, topology_only=topology_only, mentions=mentions
             )
-        tree = parser(codeblock)
-        # ingestion
-        argdown = parser.ingest_in_argmap(tree, argdown)  # type: ignore
+        if ingested is argdown:
+            if diagnostics is not None:
+                if isinstance(result, FlatCodeblock):
+                    position = result.position
+                else:
+                    token = next(result.tree.scan_values(lambda v: isinstance(v, Token)), None)
+                    position = (token.line, token.column) if token else (1, 1)
+                text, line, column = _document_position(result, *position)
+                diagnostics.append(ArgdownDiagnostic(text, line, column, "Codeblock could not be ingested"))
+            continue
+        if mentions:
+            for key, line, column in mentions:
+                source_map.add(key, *_document_position(result, line, column))  # type: ignore
+        argdown = ingested
+        if budget is not None:
+            budget.check_argdown(argdown)
+    return argdown
+
+
+@overload
+def parse_argdown(
+    texts: str | list[str],
+    axiomatic_closure: bool = True,
+    executor: Executor | None = None,
+    lazy: Literal[False] = False,
+    topology_only: bool = False,
+    source_map: bool = False,
+    single_pass: bool = False,
+    tolerant: bool = False,
+    limits: ParseLimits | None = None,
+) -> Argdown: ...
+
+
+@overload
+def parse_argdown(
+    texts: str | list[str],
+    axiomatic_closure: bool = True,
+    executor: Executor | None = None,
+    *,
+    lazy: Literal[True],
+    topology_only: bool = False,
+    source_map: bool = False,
+    single_pass: bool = False,
+    tolerant: bool = False,
+    limits: ParseLimits | None = None,
+) -> LazyArgdown: ...
 
 
+@overload
+def parse_argdown(
+    texts: str | list[str],
+    axiomatic_closure: bool = True,
+    executor: Executor | None = None,
+    lazy: bool = False,
+    topology_only: bool = False,
+    source_map: bool = False,
+    single_pass: bool = False,
+    tolerant: bool = False,
+    limits: ParseLimits | None = None,
+) -> Argdown | LazyArgdown: ...
+
+
+def parse_argdown(
+    texts: str | list[str],
+    axiomatic_closure: bool = True,
+    executor: Executor | None = None,
+    lazy: bool = False,
+    topology_only: bool = False,
+    source_map: bool = False,
+    single_pass: bool = False,
+    tolerant: bool = False,
+    limits: ParseLimits | None = None,
+) -> Argdown | LazyArgdown:
+    """
+    Parse an Argdown text document as an argument map.
+
+    Args:
+        text (str | list[str]): The Argdown code snippet(s) to parse.
+        axiomatic_closure (bool): Whether dialectical relations are grounded in
+            chains of axiomatic relations between propositions, or only in
+            direct ones.
+        executor (Executor | None): If given, codeblocks are preprocessed and
+            parsed concurrently in this thread or process pool, and handed
+            back flattened (see `FlatCodeblock`). They are ingested in
+            document order, so the resulting argument map is the same as when
+            parsing sequentially.
+        lazy (bool): If True, return a `LazyArgdown` that parses codeblocks
+            only when they are needed to look up a proposition or argument.
+        topology_only (bool): If True, skip texts, gists and inline yaml data
+            (including inference information), and only build the propositions,
+            arguments with their PCS and the dialectical relations.
+        source_map (bool): If True, record the document positions at which
+            propositions, arguments and relations are mentioned in a `SourceMap`,
+            available as `source_map` of the returned argument map.
+        single_pass (bool): If True, parse each document in a single pass with
+            a document grammar instead of splitting, preprocessing and parsing
+            its codeblocks separately. Documents that cannot be parsed in a
+            single pass (in particular invalid ones) are parsed blockwise.
+        tolerant (bool): If True, parse in a single pass and recover from syntax
+            errors instead of raising them: invalid lines (in argument maps,
+            together with their children) and codeblocks that cannot be
+            completed or ingested are skipped, and everything valid is
+            ingested. The problems found are available as a list of
+            `ArgdownDiagnostic` in `diagnostics` of the returned argument map.
+        limits (ParseLimits | None): Limits of the size, number of codeblocks,
+            nesting depth, number of nodes and parsing time of the document.
+            They are checked between stages and codeblocks, and
+            `ArgdownLimitError` is raised as soon as one is exceeded.
+
+    Returns:
+        Argdown | LazyArgdown: The parsed argument map.
+    """
+
+    if isinstance(texts, str):
+        texts = [texts]
+
+    if (single_pass or tolerant) and (lazy or executor is not None):
+        raise ValueError("Single-pass parsing does not support executors and lazy parsing.")
+    if lazy and limits is not None:
+        raise ValueError("Lazy parsing does not support limits.")
+
+    budget = None
+    if limits is not None:
+        budget = _Budget(limits)
+        budget.check_texts(texts)
+
+    parsed: Iterable[_ParsedCodeblock | FlatCodeblock | _FailedCodeblock | None]
+
+    if tolerant:
+        diagnostics: list[ArgdownDiagnostic] = []
+        parsed = []
+        for i, text in enumerate(texts):
+            document = _parse_document_tolerant(text, i, source_map, diagnostics)
+            if budget is not None:
+                budget.add_blocks(len(document))
+                budget.check_time()
+            parsed.extend(document)
+        argdown = _ingest_documents(parsed, axiomatic_closure, topology_only, source_map, diagnostics, budget)
+        argdown.diagnostics = diagnostics  # type: ignore
+        return argdown
+
+    if single_pass:
+        parsed = []
+        for i, text in enumerate(texts):
+            document = _parse_document(text, i, source_map=source_map)
+            if document is None:
+                codeblocks = _split_codeblocks(text, i, source_map=source_map)
+                if budget is not None:
+                    budget.add_blocks(len(codeblocks))
+                document = map(_parse_codeblock, _within_budget(codeblocks, budget))  # type: ignore
+            elif budget is not None:
+                budget.add_blocks(len(document))
+                budget.check_time()
+            parsed.extend(document)  # type: ignore
+        return _ingest_documents(parsed, axiomatic_closure, topology_only, source_map, budget=budget)
+
+    # splitting
+    codeblocks: list[ArgdownCodeBlock] = []
+    for i, text in enumerate(texts):
+        codeblocks.extend(_split_codeblocks(text, i, source_map=source_map))
+    if budget is not None:
+        budget.add_blocks(len(codeblocks))
+        budget.check_time()
+
+    if lazy:
+        if executor is not None or source_map:
+            raise ValueError("Lazy parsing does not support executors and source maps.")
+        return LazyArgdown(
+            codeblocks, axiomatic_closure=axiomatic_closure, topology_only=topology_only
+        )
+
+    # preprocess and parse each codeblock
+    if executor is None:
+        parsed = map(_parse_codeblock, _within_budget(codeblocks, budget))
+    else:
+        flatten = functools.partial(
+            _flatten_codeblock_in_pool, topology_only=topology_only, source_map=source_map
+        )
+        parsed = executor.map(flatten, codeblocks, chunksize=max(1, len(codeblocks) // 32))
+
+    return _ingest_documents(parsed, axiomatic_closure, topology_only, source_map, budget=budget)
+
+
+def _ingest_documents(
+    parsed: Iterable[_ParsedCodeblock | FlatCodeblock | _FailedCodeblock | None],
+    axiomatic_closure: bool,
+    topology_only: bool,
+    source_map: bool,
+    diagnostics: list[ArgdownDiagnostic] | None = None,
+    budget: _Budget | None = None,
+) -> Argdown:
+    sources = SourceMap() if source_map else None
+    argdown = _ingest(
+        parsed,
+        ArgdownMultiDiGraph(axiomatic_closure=axiomatic_closure),
+        topology_only=topology_only,
+        source_map=sources,
+        diagnostics=diagnostics,
+        budget=budget,
+    )
+    if sources is not None:
+        argdown.source_map = sources  # type: ignore
     return argdown
+
+
+def stream_argdown(
+    texts: str | list[str],
+    handler: ArgdownHandler,
+    topology_only: bool = False,
+) -> ArgdownHandler:
+    """
+    Parse Argdown text documents and report their propositions, arguments and
+    relations to a handler as they are found, codeblock by codeblock, without
+    building an argument map (unless the handler is one).
+
+    Codeblocks are reported one after the other and are not rolled back: if a
+    codeblock cannot be parsed, or the handler raises an error while handling it,
+    the error is passed to `handler.on_error` (which raises it by default), and
+    items of the codeblock may have been reported already. GROUNDED relations,
+    which depend on the whole argument map, are not reported.
+
+    Args:
+        texts (str | list[str]): The Argdown code snippet(s) to parse.
+        handler (ArgdownHandler): The handler to report to.
+        topology_only (bool): If True, skip texts, gists and inline yaml data.
+
+    Returns:
+        ArgdownHandler: The handler.
+    """
+    if isinstance(texts, str):
+        texts = [texts]
+    for i, text in enumerate(texts):
+        for codeblock in _split_codeblocks(text, i):
+            try:
+                parsed = _parse_codeblock(codeblock)
+                if parsed is not None:
+                    with profile_stage("transform"):
+                        parsed.parser_class.transform(parsed.tree, handler, topology_only=topology_only)
+            except Exception as error:
+                handler.on_error(error)
+    return handler
+
+
+def _parse_in_batch(texts: str | list[str], skip_limited: bool = False, **kwargs) -> Argdown | None:
+    try:
+        return parse_argdown(texts, **kwargs)
+    except ArgdownLimitError as e:
+        if not skip_limited:
+            raise
+        logger.warning(f"Skipping document in batch: {e}.")
+        return None
+
+
+def parse_argdown_batch(
+    documents: Iterable[str | list[str]],
+    executor: Executor | None = None,
+    max_workers: int | None = None,
+    skip_limited: bool = False,
+    **kwargs,
+) -> list[Argdown | None]:
+    """
+    Parse many Argdown documents concurrently, each into a separate argument map.
+
+    By default, documents are parsed in a thread pool. On free-threaded (no-GIL)
+    builds of Python, threads parse in parallel and no argument maps need to be
+    pickled; with the GIL, pass a `ProcessPoolExecutor` to parse in parallel.
+
+    Args:
+        documents (Iterable[str | list[str]]): The Argdown documents to parse.
+        executor (Executor | None): Executor to use instead of a new thread pool.
+        max_workers (int | None): Number of threads of the new thread pool.
+        skip_limited (bool): If True, documents that exceed the `limits` passed
+            to `parse_argdown` are skipped, with None in their place, instead of
+            raising `ArgdownLimitError` and losing the other results.
+        **kwargs: Further keyword arguments passed to `parse_argdown`.
+
+    Returns:
+        list[Argdown | None]: The parsed argument maps, in the order of
+            `documents`, and None for skipped documents.
+    """
+    parse = functools.partial(_parse_in_batch, skip_limited=skip_limited, **kwargs)
+    if executor is not None:
+        return list(executor.map(parse, documents))
+    with ThreadPoolExecutor(max_workers=max_workers) as thread_pool:
+        return list(thread_pool.map(parse, documents))
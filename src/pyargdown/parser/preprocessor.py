@@ -1,7 +1,9 @@
 "preprocessor.py"
 
 from abc import ABC
+from array import array
 import re
+from typing import NamedTuple
 
 # TODO:
 # Define the preprocessor class
@@ -9,7 +11,10 @@ import re
 # handlers / chain of responsibility for processing blocks
 
 class ArgdownCodeBlock(str):
-    pass
+    # position of the block in the original document, if known
+    span: "BlockSpan | None" = None
+    # origin of the lines of a preprocessed block, if tracked
+    line_map: "LineMap | None" = None
 
 class ArgumentMapBlock(ArgdownCodeBlock):
     pass
@@ -18,6 +23,61 @@ class ArgumentBlock(ArgdownCodeBlock):
     pass
 
 
+class LineMap:
+    """
+    Maps the lines of a preprocessed codeblock back to the original codeblock:
+    line i (0-based) of the preprocessed block starts at line `lines[i]` of the
+    original block, with `columns[i]` leading characters removed. Handlers
+    that drop, strip or join lines derive a new map from the map of their input.
+    """
+    __slots__ = ("lines", "columns")
+
+    def __init__(self, lines: array, columns: array):
+        self.lines = lines
+        self.columns = columns
+
+    @staticmethod
+    def identity(n_lines: int) -> "LineMap":
+        return LineMap(array("l", range(n_lines)), array("l", bytes(8 * n_lines)))
+
+    def select(self, indices: list[int]) -> "LineMap":
+        """
+        Returns the map of the lines at `indices`.
+        """
+        return LineMap(
+            array("l", (self.lines[i] for i in indices)),
+            array("l", (self.columns[i] for i in indices)),
+        )
+
+    def shift(self, columns: list[int]) -> "LineMap":
+        """
+        Returns the map after removing `columns[i]` leading characters from line i.
+        """
+        return LineMap(
+            array("l", self.lines),
+            array("l", (c + d for c, d in zip(self.columns, columns))),
+        )
+
+
+class BlockSpan(NamedTuple):
+    """
+    Position of a codeblock in the original document, which spans
+    `text[start:end]` and starts at (1-based) line number `line`.
+    If several documents are parsed together, `text` is the index
+    of the document.
+    """
+    start: int
+    end: int
+    kind: type[ArgdownCodeBlock]
+    line: int = 1
+    text: int = 0
+
+    def codeblock(self, text: str) -> ArgdownCodeBlock:
+        codeblock = self.kind(text[self.start:self.end])
+        codeblock.span = self
+        return codeblock
+
+
 def remove_html_comments(text: str) -> str:
     # Regular expression pattern to match HTML comments
     multiline_pattern = re.compile(r'<!--(.*?)-->', re.DOTALL)
@@ -60,23 +120,29 @@ def remove_js_comments(text: str) -> str:
     return "\n".join(clean_lines)
 
 
-def _maybe_remove_initial_comment(lines: list[str]) -> list[str]:
-    if lines[0].strip().startswith("//"):
-        return lines[1:]
-    return lines    
-    
-def _next_non_comment_line(block: str) -> str:
-    lines = block.split("\n")
-    lines = [line for line in lines if line.strip()]
-    while lines:
-        lines = _maybe_remove_initial_comment(lines)
-        if lines and lines[0].strip():
-            return lines[0]
-        lines = [line for line in lines if line.strip()]
+_NON_WHITESPACE = re.compile(r"\S")
+
+
+def _next_non_comment_line(text: str, start: int = 0, end: int | None = None) -> str | None:
+    """
+    Returns the first non-empty line in `text[start:end]`, skipping an
+    initial comment line, without copying the block.
+    """
+    end = len(text) if end is None else end
+    skipped_comment = False
+    while start < end:
+        line_end = text.find("\n", start, end)
+        if line_end == -1:
+            line_end = end
+        line = text[start:line_end]
+        if line.strip():
+            if skipped_comment or not line.strip().startswith("//"):
+                return line
+            skipped_comment = True
+        start = line_end + 1
     return None
 
 
-
 def _maybe_pcs_line(line: str) -> bool:
     line = line.strip()
     regex = r"^\([A-Z]*\d+\)\s"
@@ -112,15 +178,21 @@ class RemoveWhitespaceHandler(AbstractPreprocessorHandler):
     def __call__(self, block: ArgdownCodeBlock) -> ArgdownCodeBlock:
         if isinstance(block, ArgumentMapBlock):
             return block
-        lines = [line.strip() for line in block.split("\n")]
-        return ArgumentBlock("\n".join(lines))
+        lines = block.split("\n")
+        result = ArgumentBlock("\n".join(line.strip() for line in lines))
+        line_map = getattr(block, "line_map", None)
+        if line_map is not None:
+            result.line_map = line_map.shift([len(line) - len(line.lstrip()) for line in lines])
+        return result
 
 class RemoveTrailingWhitespaceHandler(AbstractPreprocessorHandler):
     def __call__(self, block: ArgdownCodeBlock) -> ArgdownCodeBlock:
         if isinstance(block, ArgumentMapBlock):
             return block
         lines = [line.rstrip() for line in block.split("\n")]
-        return ArgumentBlock("\n".join(lines))
+        result = ArgumentBlock("\n".join(lines))
+        result.line_map = getattr(block, "line_map", None)
+        return result
 
 # NOTE: needs to be applied twice: before and after collapsing lines
 class RemoveCommentsHandler(AbstractPreprocessorHandler):
@@ -130,7 +202,8 @@ class RemoveCommentsHandler(AbstractPreprocessorHandler):
         regex_html_comment = r"<!--.*?-->"
         regex_js_comment = r"/\*.*?\*/"
         cleaned_lines = []
-        for line in block.split("\n"):
+        kept = []
+        for i, line in enumerate(block.split("\n")):
             if line.strip().startswith("//"):
                 continue
             cleaned_line = re.sub(regex_html_comment, "", line)
@@ -140,16 +213,25 @@ class RemoveCommentsHandler(AbstractPreprocessorHandler):
             if "//" in cleaned_line:
                 cleaned_line = cleaned_line.split("//")[0].rstrip()
             cleaned_lines.append(cleaned_line)
-        return block_class("\n".join(cleaned_lines))
+            kept.append(i)
+        result = block_class("\n".join(cleaned_lines))
+        line_map = getattr(block, "line_map", None)
+        if line_map is not None:
+            # an empty result still has one (empty) line
+            result.line_map = line_map.select(kept or [0])
+        return result
 
 class CollapseLinesHandler(AbstractPreprocessorHandler):
     def __call__(self, block: ArgdownCodeBlock) -> ArgdownCodeBlock:
         block_class = type(block)
         collapsed_lines = []
-        for line in block.split("\n"):
+        # indices of the lines that start a collapsed line
+        kept = []
+        for i, line in enumerate(block.split("\n")):
             empty_line = not line.strip()
             if not collapsed_lines or empty_line:
                 collapsed_lines.append(line)
+                kept.append(i)
             elif (
                 _maybe_pcs_line(line) or 
                 _maybe_reason_line(line) or
@@ -157,37 +239,53 @@ class CollapseLinesHandler(AbstractPreprocessorHandler):
                 _maybe_inference_line(collapsed_lines[-1])
             ):
                 collapsed_lines.append(line)
+                kept.append(i)
             else:
                 collapsed_lines[-1] = collapsed_lines[-1].rstrip() + " " + line.lstrip()
-        return block_class("\n".join(collapsed_lines))
+        result = block_class("\n".join(collapsed_lines))
+        line_map = getattr(block, "line_map", None)
+        if line_map is not None:
+            result.line_map = line_map.select(kept)
+        return result
             
 
 class Preprocessor:
 
+    @staticmethod
+    def scan_blocks(text: str) -> list[BlockSpan]:
+        """
+        scans text for blocks separated by empty lines ("\\n\\n"),
+        unless empty lines are succeeded by a PCS line, and returns
+        their spans without copying the text
+        """
+        spans: list[BlockSpan] = []
+        start = 0
+        line = 1
+        line_counted_to = 0
+        while start <= len(text):
+            end = text.find("\n\n", start)
+            if end == -1:
+                end = len(text)
+
+            if _NON_WHITESPACE.search(text, start, end):
+                next_content_line = _next_non_comment_line(text, start, end)
+                if spans and next_content_line and _maybe_pcs_line(next_content_line):
+                    spans[-1] = spans[-1]._replace(end=end, kind=ArgumentBlock)
+                else:
+                    line += text.count("\n", line_counted_to, start)
+                    line_counted_to = start
+                    spans.append(BlockSpan(start, end, ArgumentMapBlock, line))
+
+            start = end + 2
+        return spans
+
     @staticmethod
     def split_blocks(text: str) -> list[ArgumentBlock | ArgumentMapBlock]:
         """
         splits text into blocks at empty lines,
         unless empty lines are succeeded by a PCS line
         """
-        codeblocks = []
-        for block in text.split("\n\n"):
-            if not block.strip():
-                continue
-
-            if not codeblocks:
-                codeblocks.append(ArgumentMapBlock(block))
-                continue
-
-            next_content_line = _next_non_comment_line(block)
-            if next_content_line and _maybe_pcs_line(next_content_line):
-                codeblocks[-1] = ArgumentBlock(str(codeblocks[-1]) + "\n\n" + block)
-                continue
-
-            codeblocks.append(ArgumentMapBlock(block))
-
-        codeblocks = [block for block in codeblocks if block.strip("\n ")]
-        return codeblocks
+        return [span.codeblock(text) for span in Preprocessor.scan_blocks(text)]  # type: ignore
 
     def __init__(self):
         self.handlers: AbstractPreprocessorHandler = []
@@ -197,6 +295,8 @@ class Preprocessor:
         return self
 
     def process(self, block: ArgumentBlock | ArgumentMapBlock) -> ArgumentBlock | ArgumentMapBlock:
+        span = block.span
         for handler in self.handlers:
             block = handler(block)
+        block.span = span
         return block
\ No newline at end of file
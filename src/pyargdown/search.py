@@ -0,0 +1,192 @@
+"Full-text search over propositions and arguments in many argument maps"
+
+from abc import ABC, abstractmethod
+import os
+import re
+import sqlite3
+from typing import Iterable, Iterator
+
+from pyargdown.model import Argdown, Argument, Proposition
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> list[str]:
+    """
+    Splits a text into lowercase word tokens.
+    """
+    return _TOKEN_PATTERN.findall(text.lower())
+
+
+class ArgdownSearchIndex(ABC):
+    """
+    Inverted token index over proposition texts, argument gists and the keys
+    of inline yaml data, spanning many argument maps. Hits are returned as
+    (map id, label) pairs.
+    """
+
+    @staticmethod
+    def postings(argdown: Argdown) -> Iterator[tuple[str, str]]:
+        """
+        Yields all (token, label) pairs of an argument map.
+        """
+        # node payloads are read in place, without building propositions and
+        # arguments from them; propositions are indexed before arguments
+        nodes = argdown.nodes(data=True)  # type: ignore
+        for label, data in nodes:
+            if data["type"] == Proposition.__name__:
+                yield from ArgdownSearchIndex._node_postings(label, data["texts"], data["data"])
+        for label, data in nodes:
+            if data["type"] == Argument.__name__:
+                yield from ArgdownSearchIndex._node_postings(label, data["gists"], data["data"])
+
+    @staticmethod
+    def _node_postings(label: str | None, texts: Iterable[str], data: dict) -> Iterator[tuple[str, str]]:
+        if label is None:
+            return
+        tokens: dict[str, None] = {}
+        for text in texts:
+            tokens.update(dict.fromkeys(tokenize(text)))
+        for key in data:
+            tokens.update(dict.fromkeys(tokenize(str(key))))
+        for token in tokens:
+            yield token, label
+
+    @abstractmethod
+    def add_map(self, map_id: str, argdown: Argdown):
+        """
+        Indexes an argument map under `map_id`, replacing any map
+        previously indexed under the same id.
+        """
+
+    @abstractmethod
+    def remove_map(self, map_id: str):
+        """
+        Removes an argument map from the index.
+        """
+
+    @abstractmethod
+    def search(self, query: str) -> list[tuple[str, str]]:
+        """
+        Returns all (map id, label) pairs of propositions and arguments
+        that mention every token in `query`.
+        """
+
+    def __contains__(self, map_id: str) -> bool:
+        return map_id in self.map_ids()
+
+    @abstractmethod
+    def map_ids(self) -> list[str]:
+        """
+        Returns the ids of all indexed maps.
+        """
+
+
+class InMemorySearchIndex(ArgdownSearchIndex):
+
+    def __init__(self):
+        self._postings: dict[str, dict[tuple[str, str], None]] = {}
+        self._map_tokens: dict[str, list[tuple[str, str]]] = {}
+
+    def add_map(self, map_id: str, argdown: Argdown):
+        self.remove_map(map_id)
+        postings = list(self.postings(argdown))
+        self._map_tokens[map_id] = postings
+        for token, label in postings:
+            self._postings.setdefault(token, {})[(map_id, label)] = None
+
+    def remove_map(self, map_id: str):
+        for token, label in self._map_tokens.pop(map_id, []):
+            hits = self._postings[token]
+            del hits[(map_id, label)]
+            if not hits:
+                del self._postings[token]
+
+    def search(self, query: str) -> list[tuple[str, str]]:
+        tokens = set(tokenize(query))
+        if not tokens:
+            return []
+        hit_lists = sorted(
+            (self._postings.get(token, {}) for token in tokens), key=len
+        )
+        return [
+            hit for hit in hit_lists[0]
+            if all(hit in hits for hits in hit_lists[1:])
+        ]
+
+    def map_ids(self) -> list[str]:
+        return list(self._map_tokens)
+
+    def __contains__(self, map_id: str) -> bool:
+        return map_id in self._map_tokens
+
+
+class SqliteSearchIndex(ArgdownSearchIndex):
+    """
+    Search index persisted in an SQLite database file. Changes are
+    committed after every `add_map` and `remove_map`.
+    """
+
+    def __init__(self, path: str | os.PathLike):
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS maps (map_id TEXT PRIMARY KEY);
+            CREATE TABLE IF NOT EXISTS postings (
+                token TEXT NOT NULL,
+                map_id TEXT NOT NULL,
+                label TEXT NOT NULL,
+                PRIMARY KEY (token, map_id, label)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS postings_by_map ON postings (map_id);
+            """
+        )
+
+    def add_map(self, map_id: str, argdown: Argdown):
+        with self.connection:
+            self._remove_map(map_id)
+            self.connection.execute("INSERT INTO maps VALUES (?)", (map_id,))
+            self.connection.executemany(
+                "INSERT OR IGNORE INTO postings VALUES (?, ?, ?)",
+                ((token, map_id, label) for token, label in self.postings(argdown)),
+            )
+
+    def _remove_map(self, map_id: str):
+        self.connection.execute("DELETE FROM postings WHERE map_id = ?", (map_id,))
+        self.connection.execute("DELETE FROM maps WHERE map_id = ?", (map_id,))
+
+    def remove_map(self, map_id: str):
+        with self.connection:
+            self._remove_map(map_id)
+
+    def search(self, query: str) -> list[tuple[str, str]]:
+        tokens = sorted(set(tokenize(query)))
+        if not tokens:
+            return []
+        placeholders = ", ".join("?" for _ in tokens)
+        rows = self.connection.execute(
+            f"""
+            SELECT map_id, label FROM postings
+            WHERE token IN ({placeholders})
+            GROUP BY map_id, label
+            HAVING COUNT(*) = ?
+            """,
+            (*tokens, len(tokens)),
+        )
+        return [(map_id, label) for map_id, label in rows]
+
+    def map_ids(self) -> list[str]:
+        return [map_id for (map_id,) in self.connection.execute("SELECT map_id FROM maps")]
+
+    def __contains__(self, map_id: str) -> bool:
+        row = self.connection.execute("SELECT 1 FROM maps WHERE map_id = ?", (map_id,)).fetchone()
+        return row is not None
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self) -> "SqliteSearchIndex":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,97 @@
+"Positions of propositions, arguments and relations in Argdown documents"
+
+from array import array
+from typing import NamedTuple
+
+from pyargdown.model import Valence
+
+
+class SourcePosition(NamedTuple):
+    """
+    A mention in the `text`-th parsed document (0-based) at
+    1-based `line` and `column`.
+    """
+    text: int
+    line: int
+    column: int
+
+
+_Key = str | tuple[str, str, str]
+
+
+class SourceMap:
+    """
+    Document positions at which propositions, arguments and dialectical relations
+    are mentioned, built while parsing with `parse_argdown(..., source_map=True)`.
+
+    Mentions are stored in parallel arrays of machine integers and chained per
+    node or relation, so that the first mention is found in O(1) and all
+    mentions in time linear in their number.
+    """
+
+    def __init__(self):
+        self._texts = array("l")
+        self._lines = array("l")
+        self._columns = array("l")
+        # index of the next mention of the same node or relation, or -1
+        self._next = array("l")
+        self._first: dict[_Key, int] = {}
+        self._last: dict[_Key, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._lines)
+
+    def add(self, key: _Key, text: int, line: int, column: int):
+        """
+        Records a mention of a node (key: label) or of a dialectical
+        relation (key: source, target and valence name).
+        """
+        i = len(self._lines)
+        self._texts.append(text)
+        self._lines.append(line)
+        self._columns.append(column)
+        self._next.append(-1)
+        last = self._last.get(key)
+        if last is None:
+            self._first[key] = i
+        else:
+            self._next[last] = i
+        self._last[key] = i
+
+    def _position(self, i: int) -> SourcePosition:
+        return SourcePosition(self._texts[i], self._lines[i], self._columns[i])
+
+    def _mentions(self, key: _Key) -> list[SourcePosition]:
+        positions = []
+        i = self._first.get(key, -1)
+        while i != -1:
+            positions.append(self._position(i))
+            i = self._next[i]
+        return positions
+
+    def node_position(self, label: str) -> SourcePosition | None:
+        """
+        Returns the position of the first mention of proposition or argument `label`.
+        """
+        i = self._first.get(label)
+        return None if i is None else self._position(i)
+
+    def node_mentions(self, label: str) -> list[SourcePosition]:
+        """
+        Returns the positions of all mentions of proposition or argument `label`.
+        """
+        return self._mentions(label)
+
+    def relation_position(self, source: str, target: str, valence: Valence) -> SourcePosition | None:
+        """
+        Returns the position of the first mention of a dialectical relation.
+        Only relations stated in the documents are mentioned, grounded ones are not.
+        """
+        i = self._first.get((source, target, valence.name))
+        return None if i is None else self._position(i)
+
+    def relation_mentions(self, source: str, target: str, valence: Valence) -> list[SourcePosition]:
+        """
+        Returns the positions of all mentions of a dialectical relation.
+        """
+        return self._mentions((source, target, valence.name))
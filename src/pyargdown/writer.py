@@ -0,0 +1,108 @@
+"Serializing argument maps as Argdown text"
+
+import io
+from typing import TextIO
+
+import yaml  # type: ignore
+
+from pyargdown.model import (
+    ArgdownMultiDiGraph,
+    Argument,
+    Conclusion,
+    DialecticalType,
+    Proposition,
+    Valence,
+)
+
+_INDENT = "    "
+
+# relations are written as children of their target, so that
+# the child is the source of the relation
+_LEFT_RELATIONS = {
+    Valence.SUPPORT: "<+",
+    Valence.ATTACK: "<-",
+    Valence.UNDERCUT: "<_",
+    Valence.CONTRADICT: "><",
+}
+
+
+def _yaml(data: dict) -> str:
+    return yaml.safe_dump(
+        data, default_flow_style=True, width=float("inf"), sort_keys=False, allow_unicode=True
+    ).strip()
+
+
+def _reason(label: str, is_proposition: bool, text: str = "", data: dict | None = None) -> str:
+    line = f"[{label}]" if is_proposition else f"<{label}>"
+    content = " ".join(part for part in [text, _yaml(data) if data else ""] if part)
+    if content:
+        line += f": {content}"
+    return line
+
+
+def _write_definition(item: Proposition | Argument, file: TextIO):
+    is_proposition = isinstance(item, Proposition)
+    texts = item.texts if isinstance(item, Proposition) else item.gists
+    lines = [
+        _reason(item.label, is_proposition, text, item.data if i == 0 else None)  # type: ignore
+        for i, text in enumerate(texts or [""])
+    ]
+    file.write("\n".join(lines) + "\n\n")
+
+
+def _write_pcs(argument: Argument, file: TextIO):
+    file.write(f"<{argument.label}>\n\n")
+    for pr in argument.pcs:
+        if isinstance(pr, Conclusion):
+            info = " ".join(
+                part for part in [
+                    pr.inference_info or "",
+                    _yaml(pr.inference_data) if pr.inference_data else "",
+                ] if part
+            )
+            file.write(f"-- {info} --\n" if info else "----\n")
+        file.write(f"({pr.label}) [{pr.proposition_label}]\n")
+    file.write("\n")
+
+
+def write_argdown(argdown: ArgdownMultiDiGraph, file: TextIO):
+    """
+    Writes an argument map as Argdown text to a file-like object.
+
+    The map is streamed node by node in three sections: map blocks that define
+    the texts, gists and data of all propositions and arguments; map blocks with
+    the sketched and axiomatic relations into each node; and the premise
+    conclusion structures of all arguments (last, because mentioning an argument
+    in a map block resets its PCS). Grounded relations and edge data are not
+    written, as they are derived again when the text is parsed.
+    """
+    for label in argdown.nodes:
+        item = argdown.get_proposition(label) or argdown.get_argument(label)
+        _write_definition(item, file)  # type: ignore
+
+    for label in argdown.nodes:
+        children = []
+        for source, _, key, edge_data in argdown.in_edges(label, keys=True, data=True):
+            if not set(edge_data["dialectics"]) - {DialecticalType.GROUNDED.name}:
+                continue
+            relation = _LEFT_RELATIONS[Valence[key]]
+            reason = _reason(source, argdown.nodes[source]["type"] == Proposition.__name__)
+            children.append(f"{_INDENT}{relation} {reason}\n")
+        if children:
+            file.write(_reason(label, argdown.nodes[label]["type"] == Proposition.__name__) + "\n")
+            file.writelines(children)
+            file.write("\n")
+
+    for label in argdown.nodes:
+        argument = argdown.get_argument(label)
+        if argument is not None and argument.pcs:
+            _write_pcs(argument, file)
+
+
+def dump_argdown(argdown: ArgdownMultiDiGraph) -> str:
+    """
+    Returns an argument map as Argdown text.
+    """
+    file = io.StringIO()
+    write_argdown(argdown, file)
+    return file.getvalue()
@@ -0,0 +1,40 @@
+"shared fixtures of the tests"
+
+import pytest
+
+from snippets import load_snippets
+
+SNIPPETS = load_snippets()
+
+
+@pytest.fixture(scope="session")
+def corpus_snippets() -> list[dict]:
+    "All snippets of the offline corpus"
+    return SNIPPETS
+
+
+def pytest_addoption(parser):
+    parser.addoption("--run-slow", action="store_true", help="run tests marked as slow")
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "slow: timing-dependent test, run only with --run-slow")
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--run-slow"):
+        return
+    skip = pytest.mark.skip(reason="timing-dependent, needs --run-slow")
+    for item in items:
+        if "slow" in item.keywords:
+            item.add_marker(skip)
+
+
+def pytest_generate_tests(metafunc):
+    # tests taking a `corpus_snippet` run on each snippet of the corpus, tests
+    # taking a `valid_corpus_snippet` on each valid one
+    if "corpus_snippet" in metafunc.fixturenames:
+        metafunc.parametrize("corpus_snippet", SNIPPETS, ids=[s["id"] for s in SNIPPETS])
+    if "valid_corpus_snippet" in metafunc.fixturenames:
+        valid = [s for s in SNIPPETS if s["valid"]]
+        metafunc.parametrize("valid_corpus_snippet", valid, ids=[s["id"] for s in valid])
@@ -0,0 +1,12 @@
+"Offline corpus of realistic Argdown snippets for tests and benchmarks"
+
+import json
+import os
+
+SNIPPETS = os.path.join(os.path.dirname(__file__), "data", "snippets.jsonl")
+
+
+def load_snippets(path: str = SNIPPETS) -> list[dict]:
+    "Loads the snippets of the corpus, with keys id, kind, valid and argdown"
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
@@ -0,0 +1,31 @@
+"Synthetic Argdown documents for tests and benchmarks"
+
+import random
+
+
+def make_document(n_blocks: int, seed: int = 0) -> str:
+    """
+    Returns an Argdown document with `n_blocks` argument map blocks, each
+    followed by the premise conclusion structure of one of its arguments.
+    """
+    rng = random.Random(seed)
+    blocks = []
+    for i in range(n_blocks):
+        j = rng.randrange(max(1, i))
+        blocks.append(
+            f"[Claim {i}]: Claim number {i} is true. {{certainty: {rng.random():.2f}}}\n"
+            f"    <+ <Reason {i}>: Reason {i} supports claim {i}.\n"
+            f"        <- <Objection {i}>: An objection to reason {i}.\n"
+            f"    <- [Claim {j}]\n"
+            f"    >< [Counterclaim {i}]: Claim {i} is false."
+        )
+        blocks.append(
+            f"<Reason {i}>\n\n"
+            f"(1) [Premise {i}]: The first premise of reason {i}.\n"
+            f"(2) The second premise of reason {i}, which is\n"
+            f"    spread over two lines.\n"
+            f"    <+ [Evidence {i}]: Evidence for the second premise.\n"
+            f"-- {{uses: [1, 2]}} --\n"
+            f"(3) [Claim {i}]"
+        )
+    return "\n\n".join(blocks) + "\n"
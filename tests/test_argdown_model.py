@@ -194,3 +194,179 @@ def test_update_argdown():
     assert rels[0].dialectics == [DialecticalType.GROUNDED]
 
 
+
+def test_texts_and_gists_ordered_set():
+    argdown = ArgdownMultiDiGraph()
+    argdown.add_proposition(Proposition("P1", ["b", "a"]))
+    argdown.update_proposition("P1", Proposition("P1", ["c", "a", "b", "d"]))
+    argdown.add_proposition(Proposition("P1", ["a", "e"]), allow_exists=True)
+    assert argdown.get_proposition("P1").texts == ["b", "a", "c", "d", "e"]
+    assert argdown.propositions[0].texts == ["b", "a", "c", "d", "e"]
+
+    argdown.add_argument(Argument("A1", ["g2", "g1", "g2"]))
+    argdown.update_argument("A1", Argument("A1", ["g3", "g1"]))
+    assert argdown.get_argument("A1").gists == ["g2", "g1", "g3"]
+    assert argdown.arguments[0].gists == ["g2", "g1", "g3"]
+
+
+def test_structural_queries(propositions1, arguments1, edges1):
+    argdown = ArgdownMultiDiGraph()
+    for prop in propositions1:
+        argdown.add_proposition(prop)
+    for arg in arguments1:
+        argdown.add_argument(arg)
+    for edge in edges1:
+        argdown.add_dialectical_relation(edge)
+    argdown.add_argument(Argument("A4", pcs=[PropositionReference("P1", "1"), Conclusion("P3", "2")]))
+
+    assert argdown.arguments_using_premise("P1") == ["A3", "A4"]
+    assert argdown.arguments_using_premise("P2") == []
+    assert argdown.arguments_concluding("P2") == ["A3"]
+    assert argdown.arguments_concluding("P3", final_only=True) == ["A4"]
+
+    argdown.update_argument("A4", Argument("A4", pcs=[PropositionReference("P2", "1"), Conclusion("P3", "2")]))
+    assert argdown.arguments_using_premise("P1") == ["A3"]
+    assert argdown.arguments_using_premise("P2") == ["A4"]
+
+    rels = argdown.find_dialectical_relations(target="A2", valence=Valence.ATTACK)
+    assert [(r.source, r.target) for r in rels] == [("A3", "A2")]
+    rels = argdown.find_dialectical_relations(dialectic=DialecticalType.SKETCHED)
+    assert {(r.source, r.target) for r in rels} == {("A1", "P2"), ("A3", "A2")}
+    assert argdown.find_dialectical_relations(source="A1", valence=Valence.ATTACK) == []
+    assert len(argdown.find_dialectical_relations(valence=Valence.SUPPORT)) == 2
+    assert len(argdown.find_dialectical_relations()) == 3
+
+
+def test_structural_index_tracks_grounding():
+    argdown = ArgdownMultiDiGraph()
+    for label in ["P1", "P2", "P3", "P4"]:
+        argdown.add_proposition(Proposition(label))
+    argdown.add_argument(Argument("A1", pcs=[PropositionReference("P1", "1"), Conclusion("P2", "2")]))
+    argdown.add_argument(Argument("A2", pcs=[PropositionReference("P2", "1"), Conclusion("P3", "2")]))
+    argdown._update()
+    grounded = argdown.find_dialectical_relations(dialectic=DialecticalType.GROUNDED)
+    assert {(r.source, r.target, r.valence) for r in grounded} == {
+        (r.source, r.target, r.valence) for r in argdown.dialectical_relations
+    }
+    assert ("A1", "A2", Valence.SUPPORT) in {(r.source, r.target, r.valence) for r in grounded}
+
+    argdown.update_argument("A2", Argument("A2", pcs=[PropositionReference("P4", "1"), Conclusion("P3", "2")]))
+    argdown._update()
+    assert argdown.find_dialectical_relations(source="A1", target="A2") == []
+    assert {r.source for r in argdown.find_dialectical_relations(target="A2")} == {
+        r.source for r in argdown.dialectical_relations if r.target == "A2"
+    }
+
+
+def _build(propositions, arguments, edges):
+    argdown = ArgdownMultiDiGraph()
+    for prop in propositions:
+        argdown.add_proposition(prop, allow_exists=True)
+    for arg in arguments:
+        argdown.add_argument(arg, allow_exists=True)
+    for edge in edges:
+        argdown.add_dialectical_relation(edge)
+    argdown._update()
+    return argdown
+
+
+def test_fingerprint(propositions1, arguments1, edges1):
+    argdown = _build(propositions1, arguments1, edges1)
+    fingerprint = argdown.fingerprint()
+    assert fingerprint == argdown.fingerprint()
+
+    # independent of insertion order of nodes, edges, texts and data keys
+    shuffled = _build(
+        [
+            Proposition("P3", ["Proposition 3"], data={"k": 3}),
+            Proposition("P2", ["Proposition 2"], data={"k": 2}),
+            Proposition("P1", ["Proposition 1"], data={"k": 1}),
+        ],
+        arguments1[::-1],
+        edges1[::-1],
+    )
+    assert shuffled.fingerprint() == fingerprint
+    argdown.update_proposition("P1", Proposition("P1", ["Alternative"], data={"l": 0}))
+    shuffled.update_proposition("P1", Proposition("P1", ["Alternative"], data={"l": 0}))
+    shuffled.update_proposition("P1", Proposition("P1", ["Proposition 1"]))
+    assert shuffled.fingerprint() == argdown.fingerprint() != fingerprint
+
+    # subhashes
+    assert argdown.node_fingerprint("P2") == shuffled.node_fingerprint("P2")
+    assert argdown.node_fingerprint("P1") != argdown.node_fingerprint("P2")
+    assert argdown.node_fingerprint("P4") is None
+    assert argdown.relation_fingerprint("A3", "A2", Valence.ATTACK) is not None
+    assert argdown.relation_fingerprint("A3", "A2", Valence.SUPPORT) is None
+
+
+def test_fingerprint_incremental(propositions1, arguments1, edges1):
+    argdown = _build(propositions1, arguments1, edges1)
+    argdown.fingerprint()
+    argdown.add_proposition(Proposition("P4", ["Proposition 4"]))
+    argdown.add_dialectical_relation(
+        ArgdownEdge("P4", "P1", valence=Valence.SUPPORT, dialectics=[DialecticalType.AXIOMATIC])
+    )
+    argdown.update_argument("A1", Argument("A1", pcs=[PropositionReference("P4", "1"), Conclusion("P2", "2")]))
+    argdown._update()
+    incremental = argdown.fingerprint()
+
+    # rehash from scratch
+    for label in argdown.nodes:
+        argdown._fingerprint.mark_node(label)
+    for s, t, key in argdown.edges(keys=True):
+        argdown._fingerprint.mark_edge(s, t, key)
+    assert argdown.fingerprint() == incremental
+    assert incremental == _build(
+        [*propositions1, Proposition("P4", ["Proposition 4"])],
+        [*arguments1[1:], Argument("A1", ["Argument 1"], data={"k": 1}, pcs=[PropositionReference("P4", "1"), Conclusion("P2", "2")])],
+        [*edges1, ArgdownEdge("P4", "P1", valence=Valence.SUPPORT, dialectics=[DialecticalType.AXIOMATIC])],
+    ).fingerprint()
+
+
+def test_structural_index_tracks_networkx_removals(propositions1, arguments1, edges1):
+    argdown = _build(propositions1, arguments1, edges1)
+    argdown.add_argument(Argument("A4", pcs=[PropositionReference("P1", "1"), Conclusion("P3", "2")]))
+    argdown.remove_node("A3")
+    assert argdown.arguments_using_premise("P1") == ["A4"]
+    assert argdown.arguments_concluding("P2") == []
+    assert argdown.find_dialectical_relations(target="A2") == []
+    argdown.remove_edge("A1", "P2")
+    assert argdown.find_dialectical_relations(source="A1") == []
+    argdown.remove_nodes_from(["A4"])
+    assert argdown.arguments_using_premise("P1") == []
+    argdown.clear_edges()
+    assert argdown.find_dialectical_relations() == []
+
+
+def test_fingerprint_tracks_networkx_removals(propositions1, arguments1, edges1):
+    argdown = _build(propositions1, arguments1, edges1)
+    fingerprint = argdown.fingerprint()
+    argdown.remove_edge("A3", "A2")
+    assert argdown.fingerprint() != fingerprint
+    assert argdown.relation_fingerprint("A3", "A2", Valence.ATTACK) is None
+    assert argdown.fingerprint() == _build(propositions1, arguments1, edges1[:2]).fingerprint()
+
+    argdown.remove_node("P3")
+    assert argdown.node_fingerprint("P3") is None
+    expected = _build(propositions1[:2], arguments1, edges1[:1])
+    assert argdown.fingerprint() == expected.fingerprint()
+
+
+def test_make_label_unique_after_removals():
+    def add_unnamed_one_by_one(argdown, n):
+        labels = []
+        for _ in range(n):
+            labels.append(argdown.make_label_unique("UNNAMED_PROPOSITION"))
+            argdown.add_proposition(Proposition(label=labels[-1]))
+        return labels
+
+    argdown = ArgdownMultiDiGraph()
+    add_unnamed_one_by_one(argdown, 3)
+    argdown.clear()
+    assert add_unnamed_one_by_one(argdown, 2) == ["UNNAMED_PROPOSITION", "UNNAMED_PROPOSITION_1"]
+
+    add_unnamed_one_by_one(argdown, 3)
+    argdown.remove_nodes_from(["UNNAMED_PROPOSITION_1", "UNNAMED_PROPOSITION_3"])
+    assert add_unnamed_one_by_one(argdown, 3) == [
+        "UNNAMED_PROPOSITION_1", "UNNAMED_PROPOSITION_3", "UNNAMED_PROPOSITION_5",
+    ]
@@ -57,3 +57,18 @@ def test_equiv12(argdown_block1, argdown_block2):
         assert argdown1.nodes[node] == argdown2.nodes[node]
     for source, target, _ in argdown1.edges:
         assert argdown1.get_dialectical_relation(source,target) == argdown2.get_dialectical_relation(source,target)
+
+@pytest.mark.parametrize("fast_path", [True, False])
+def test_ingest_deep_nesting(fast_path):
+    # far deeper than the recursion limit
+    depth = 3000
+    block = "[R0]: Root.\n" + "".join(
+        " " * i + ("<+ " if i % 2 else "<- ") + (f"<R{i}>" if i % 3 else f"[R{i}]") + f": Reason {i}.\n"
+        for i in range(1, depth)
+    )
+    parser = ArgumentMapParser(fast_path=fast_path)
+    argdown = parser.ingest_in_argmap(parser(block), ArgdownMultiDiGraph())
+    assert list(argdown.nodes) == [f"R{i}" for i in range(depth)]
+    assert argdown.get_argument("R1999").gists == ["Reason 1999."]
+    assert argdown.get_dialectical_relation("R1999", "R1998")[0].valence.name == "SUPPORT"
+    assert argdown.get_dialectical_relation("R2998", "R2997")[0].valence.name == "ATTACK"
@@ -0,0 +1,115 @@
+"test closure of axiomatic relations"
+
+import itertools
+import random
+
+import networkx as nx  # type: ignore
+
+from pyargdown import (
+    ArgdownMultiDiGraph,
+    ArgdownEdge,
+    Argument,
+    Conclusion,
+    DialecticalType,
+    Proposition,
+    PropositionReference,
+    Valence,
+)
+from pyargdown.closure import AxiomaticClosure
+
+
+def test_closure_matches_brute_force():
+    rng = random.Random(0)
+    for _ in range(50):
+        labels = [f"P{i}" for i in range(8)]
+        closure = AxiomaticClosure()
+        support = nx.DiGraph()
+        support.add_nodes_from(labels)
+        conflicts = set()
+        for _ in range(rng.randint(0, 14)):
+            s, t = rng.choice(labels), rng.choice(labels)
+            valence = rng.choice([Valence.SUPPORT, Valence.ATTACK, Valence.CONTRADICT])
+            closure.add_relation(s, t, valence)
+            if valence == Valence.SUPPORT:
+                support.add_edge(s, t)
+            else:
+                conflicts |= {(s, t), (t, s)}
+
+        def reach(a):
+            return nx.descendants(support, a) | {a}
+
+        for a, b in itertools.product(labels, labels):
+            assert closure.entails(a, b) == (b in reach(a))
+            expected = any((x, y) in conflicts for x in reach(a) for y in reach(b))
+            assert closure.contradicts(a, b) == expected
+        for a in labels:
+            assert set(closure.consequences(a)) == reach(a)
+            assert set(closure.antecedents(a)) == nx.ancestors(support, a) | {a}
+            assert set(closure.conflicts(a)) == {b for b in labels if closure.contradicts(a, b)}
+
+
+def test_closure_discard_relation():
+    closure = AxiomaticClosure()
+    closure.add_relation("A", "B", Valence.SUPPORT)
+    closure.add_relation("B", "C", Valence.SUPPORT)
+    closure.add_relation("C", "D", Valence.ATTACK)
+    closure.add_relation("C", "D", Valence.CONTRADICT)
+    assert closure.entails("A", "C")
+    assert closure.contradicts("D", "A")
+    closure.discard_relation("C", "D", Valence.ATTACK)
+    assert closure.contradicts("D", "A")
+    closure.discard_relation("C", "D", Valence.CONTRADICT)
+    assert not closure.contradicts("D", "A")
+    closure.discard_relation("B", "C", Valence.SUPPORT)
+    assert not closure.entails("A", "C")
+
+
+def _chain_argdown(**kwargs):
+    argdown = ArgdownMultiDiGraph(**kwargs)
+    for label in ["P1", "P2", "A", "B", "C", "D"]:
+        argdown.add_proposition(Proposition(label, [label]))
+    argdown.add_argument(Argument("A1", pcs=[PropositionReference("P1", "1"), Conclusion("A", "2")]))
+    argdown.add_argument(Argument("A2", pcs=[PropositionReference("C", "1"), Conclusion("P2", "2")]))
+    argdown.add_argument(Argument("A3", pcs=[PropositionReference("D", "1"), Conclusion("P2", "2")]))
+    for s, t, valence in [("A", "B", Valence.SUPPORT), ("B", "C", Valence.SUPPORT), ("B", "D", Valence.CONTRADICT)]:
+        argdown.add_dialectical_relation(ArgdownEdge(s, t, valence, [DialecticalType.AXIOMATIC]))
+    argdown._update()
+    return argdown
+
+
+def test_grounding_with_axiomatic_closure():
+    argdown = _chain_argdown()
+    rels = argdown.get_dialectical_relation("A1", "A2")
+    assert [r.valence for r in rels] == [Valence.SUPPORT]
+    assert rels[0].dialectics == [DialecticalType.GROUNDED]
+    rels = argdown.get_dialectical_relation("A1", "A3")
+    assert [r.valence for r in rels] == [Valence.ATTACK]
+    assert [r.valence for r in argdown.get_dialectical_relation("A1", "C")] == [Valence.SUPPORT]
+
+
+def test_grounding_direct_only():
+    argdown = _chain_argdown(axiomatic_closure=False)
+    assert argdown.get_dialectical_relation("A1", "A2") is None
+    assert argdown.get_dialectical_relation("A1", "A3") is None
+    assert [r.valence for r in argdown.get_dialectical_relation("A1", "B")] == [Valence.SUPPORT]
+
+
+def test_closure_tracks_networkx_removals():
+    argdown = _chain_argdown()
+    assert argdown._axiomatic.entails("A", "C")
+    argdown.remove_edge("B", "C")
+    assert not argdown._axiomatic.entails("A", "C")
+    assert argdown._axiomatic.contradicts("A", "D")
+    argdown.remove_node("B")
+    assert not argdown._axiomatic.contradicts("A", "D")
+    assert len(argdown._axiomatic) == 0
+    argdown._update()
+    assert argdown.get_dialectical_relation("A1", "A3") is None
+
+    argdown = _chain_argdown()
+    argdown.remove_nodes_from(["A", "X"])
+    assert not argdown._axiomatic.entails("A", "B")
+    argdown.clear_edges()
+    assert len(argdown._axiomatic) == 0
+    argdown.clear()
+    assert len(argdown._axiomatic) == 0 and argdown._axiomatic.transitive
@@ -0,0 +1,135 @@
+"test that pathological inputs are processed in (near) linear time"
+
+import time
+
+import pytest
+
+from pyargdown import ArgdownMultiDiGraph, parse_argdown
+from pyargdown.model import (
+    ArgdownEdge,
+    Argument,
+    Conclusion,
+    DialecticalType,
+    Proposition,
+    PropositionReference,
+    Valence,
+)
+from pyargdown.parser.base import ArgdownParser
+from pyargdown.parser.preprocessor import Preprocessor
+
+# linear time quadruples when the input quadruples, quadratic time grows 16-fold;
+# tests of the scaling of wall-clock time are marked as slow (see conftest.py)
+MAX_RATIO = 8
+
+
+def _best_time(func, arg, repeat=3):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(arg)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def _scaling(func, make_input, n, repeat=3, attempts=3):
+    """
+    Returns the ratio of the times `func` takes on inputs of sizes 4n and n,
+    measured again (up to `attempts` times) while the ratio looks superlinear,
+    which may be due to a busy machine.
+    """
+    small, large = make_input(n), make_input(4 * n)
+    func(small)
+    ratio = float("inf")
+    for _ in range(attempts):
+        ratio = min(ratio, _best_time(func, large, repeat) / _best_time(func, small, repeat))
+        if ratio < MAX_RATIO:
+            break
+    return ratio
+
+
+def test_extract_yaml_many_braces():
+    text, data = ArgdownParser.extract_yaml("a {" * 100 + "}")
+    assert text == ("a {" * 100)[:-1].rstrip() and data == {}
+
+
+@pytest.mark.slow
+def test_extract_yaml_many_braces_scaling():
+    for make_input in [
+        lambda n: "a {" * n + "}",
+        lambda n: "{ a: '" * n + "}",
+        lambda n: "x" + "{}" * n + " }",
+        lambda n: "{b: 1} " * n + "{a: 1}",
+    ]:
+        assert _scaling(ArgdownParser.extract_yaml, make_input, 1000) < MAX_RATIO
+
+
+def test_extract_yaml_deep_nesting():
+    assert ArgdownParser.extract_yaml("text " + "{a: " * 5000 + "}" * 5000) == (
+        "text " + "{a: " * 5000 + "}" * 5000, {}
+    )
+
+
+def _many_premises(n):
+    premises = "\n\n".join(f"({i}) Premise {i}." for i in range(1, n))
+    return f"<Argument>\n\n{premises}\n-----\n({n}) Conclusion."
+
+
+def test_split_blocks_many_premises():
+    assert len(Preprocessor.split_blocks(_many_premises(100))) == 1
+
+
+@pytest.mark.slow
+def test_split_blocks_many_premises_scaling():
+    assert _scaling(Preprocessor.split_blocks, _many_premises, 2000) < MAX_RATIO
+
+
+def _fan_out(n):
+    argdown = ArgdownMultiDiGraph()
+    argdown.add_proposition(Proposition(label="C", texts=["Claim."]))
+    for i in range(n):
+        argdown.add_proposition(Proposition(label=f"P{i}", texts=[f"Premise {i}."]))
+        argdown.add_proposition(Proposition(label=f"O{i}", texts=[f"Objection {i}."]))
+        argdown.add_argument(Argument(
+            label=f"A{i}",
+            pcs=[PropositionReference(f"P{i}", "1"), Conclusion("C", "2")],
+        ))
+        argdown.add_dialectical_relation(ArgdownEdge(f"A{i}", "C", Valence.SUPPORT, [DialecticalType.SKETCHED]))
+        argdown.add_dialectical_relation(ArgdownEdge(f"O{i}", f"P{i}", Valence.ATTACK, [DialecticalType.AXIOMATIC]))
+    return argdown
+
+
+def test_update_wide_fan_out():
+    argdown = _fan_out(10)
+    argdown._update()
+    assert any(
+        edge.valence == Valence.ATTACK and DialecticalType.GROUNDED in edge.dialectics
+        for edge in argdown.get_dialectical_relation("O3", "A3")
+    )
+
+
+@pytest.mark.slow
+def test_update_wide_fan_out_scaling():
+    assert _scaling(ArgdownMultiDiGraph._update, _fan_out, 200) < MAX_RATIO
+
+
+def _add_unnamed(n):
+    argdown = ArgdownMultiDiGraph()
+    for _ in range(n):
+        label = argdown.make_label_unique("UNNAMED_PROPOSITION")
+        argdown.add_proposition(Proposition(label=label))
+    return argdown
+
+
+def _many_unnamed_reasons(n):
+    return "[C]: Claim.\n" + "    <+ An unnamed reason.\n" * n
+
+
+def test_make_label_unique_many_unnamed_labels():
+    assert list(_add_unnamed(3).nodes) == ["UNNAMED_PROPOSITION", "UNNAMED_PROPOSITION_1", "UNNAMED_PROPOSITION_2"]
+    assert len(parse_argdown(_many_unnamed_reasons(100)).nodes) == 101
+
+
+@pytest.mark.slow
+def test_make_label_unique_many_unnamed_labels_scaling():
+    assert _scaling(_add_unnamed, int, 2000) < MAX_RATIO
+    assert _scaling(parse_argdown, _many_unnamed_reasons, 200, repeat=2) < MAX_RATIO
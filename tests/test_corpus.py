@@ -0,0 +1,45 @@
+"test main parser on the offline corpus of realistic snippets"
+
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+from pyargdown import parse_argdown
+
+
+@pytest.fixture(scope="module")
+def benchmark():
+    "The corpus benchmark script, loaded from its file"
+    path = Path(__file__).parents[1] / "benchmarks" / "corpus.py"
+    spec = importlib.util.spec_from_file_location("corpus_benchmark", path)
+    module = importlib.util.module_from_spec(spec)  # type: ignore
+    spec.loader.exec_module(module)  # type: ignore
+    return module
+
+
+def test_corpus(corpus_snippet):
+    if corpus_snippet["valid"]:
+        argdown = parse_argdown(corpus_snippet["argdown"])
+        assert argdown.nodes
+        single_pass = parse_argdown(corpus_snippet["argdown"], single_pass=True)
+        assert list(single_pass.nodes) == list(argdown.nodes)
+        assert list(single_pass.edges(keys=True)) == list(argdown.edges(keys=True))
+    else:
+        with pytest.raises(Exception):
+            parse_argdown(corpus_snippet["argdown"])
+    tolerant = parse_argdown(corpus_snippet["argdown"], tolerant=True)
+    assert bool(tolerant.diagnostics) != corpus_snippet["valid"]
+
+
+def test_corpus_benchmark(benchmark, corpus_snippets):
+    run, compare = benchmark.run, benchmark.compare
+    metrics = run(corpus_snippets[:4] + [s for s in corpus_snippets if not s["valid"]])
+    assert metrics["documents"] == 8
+    assert metrics["error_rate"] == 0.5
+    assert metrics["p50_ms"] <= metrics["p99_ms"]
+    assert compare(metrics, metrics, 0.2) == []
+
+    slower = dict(metrics, documents_per_second=metrics["documents_per_second"] * 2, p99_ms=metrics["p99_ms"] / 2)
+    assert [r.split(":")[0] for r in compare(metrics, slower, 0.2)] == ["documents_per_second", "p99_ms"]
+    assert compare(metrics, dict(metrics, error_rate=0.25), 0.2)[0].startswith("error_rate")
@@ -0,0 +1,63 @@
+"test structural diff of argument maps"
+
+from textwrap import dedent
+
+from pyargdown import Valence, diff_argdown, parse_argdown
+
+OLD = dedent("""
+[A]: Claim A.
+    <+ <Arg1>: Reason.
+    <- [B]: Claim B.
+
+<Arg1>
+
+(1) [P]: Premise.
+-----
+(2) [A]
+""")
+
+NEW = dedent("""
+[A]: Claim A, revised.
+    <+ [C]: Claim C.
+
+<Arg1>: Reason.
+
+(1) [P]: Premise.
+(2) [Q]: Another premise.
+-----
+(3) [A]
+""")
+
+
+def test_diff_identical():
+    argdown = parse_argdown(OLD)
+    diff = diff_argdown(argdown, parse_argdown(OLD))
+    assert not diff
+
+
+def test_diff():
+    diff = diff_argdown(parse_argdown(OLD), parse_argdown(NEW))
+    assert diff
+    assert diff.added_propositions == ["C", "Q"]
+    assert diff.removed_propositions == ["B"]
+    assert diff.changed_propositions == ["A"]
+    assert diff.added_arguments == diff.removed_arguments == []
+    assert diff.changed_arguments == diff.changed_pcs == ["Arg1"]
+    assert ("C", "A", Valence.SUPPORT) in diff.added_relations
+    assert ("Q", "Arg1", Valence.SUPPORT) in diff.added_relations
+    assert ("B", "A", Valence.ATTACK) in diff.removed_relations
+    # sketched relation is now only grounded
+    assert diff.changed_relations == [("Arg1", "A", Valence.SUPPORT)]
+
+
+def test_diff_ignore_grounded():
+    diff = diff_argdown(parse_argdown(OLD), parse_argdown(NEW), include_grounded=False)
+    assert ("Q", "Arg1", Valence.SUPPORT) not in diff.added_relations
+    assert ("Arg1", "A", Valence.SUPPORT) in diff.removed_relations
+    assert diff.changed_relations == []
+
+
+def test_diff_type_change():
+    diff = diff_argdown(parse_argdown("[A]: Claim.\n"), parse_argdown("<A>: Gist.\n"))
+    assert diff.removed_propositions == ["A"]
+    assert diff.added_arguments == ["A"]
@@ -0,0 +1,193 @@
+"test fast-path parsers against the Lark parsers"
+
+import random
+from textwrap import dedent
+
+import pytest
+from lark import Token, Tree
+
+from pyargdown import ArgdownMultiDiGraph
+from pyargdown.parser import ArgumentMapParser, ArgumentParser
+from pyargdown.parser.argument_map_parser import _ERROR_EXAMPLES as _MAP_ERROR_EXAMPLES
+from pyargdown.parser.argument_parser import _ERROR_EXAMPLES as _ARGUMENT_ERROR_EXAMPLES
+from pyargdown.parser.fastpath import parse_argument, parse_argument_map
+from pyargdown.parser.main import _make_preprocessor
+from pyargdown.parser.preprocessor import ArgumentBlock, ArgumentMapBlock
+
+from synthetic import make_document
+
+
+def _tokens(tree: Tree) -> list:
+    "Tree structure with token types, values and positions"
+    return [
+        (
+            (c.type, str(c), c.line, c.column, c.end_line, c.end_column, c.start_pos, c.end_pos)
+            if isinstance(c, Token) else (str(c.data), _tokens(c))
+        )
+        for c in tree.children
+    ]
+
+
+def _assert_same_as_lark(parser, fast_parse, text: str):
+    tree = fast_parse(text)
+    assert tree is not None
+    assert _tokens(tree) == _tokens(parser.parse(text))
+    assert tree == parser.parse(text)
+
+
+def _synthetic_blocks(block_class) -> list[str]:
+    preprocessor = _make_preprocessor()
+    blocks = preprocessor.split_blocks(make_document(50))
+    return [preprocessor.process(b) for b in blocks if isinstance(b, block_class)]
+
+
+@pytest.fixture(scope="module")
+def map_parser():
+    return ArgumentMapParser(fast_path=False).parser
+
+
+@pytest.fixture(scope="module")
+def argument_parser():
+    return ArgumentParser(fast_path=False).parser
+
+
+MAP_BLOCKS = [
+    dedent("""
+    [A]: A
+        + [B]: B
+            - [C]: C
+                >< [D]: D
+            + [E]: E
+        + [F]: F
+            - [G]: G
+    \t
+    """),
+    dedent("""
+    [A]: A
+    \t+ [B]: B
+    \t\t- [C]: C
+    \t\t\t>< [D]: D
+    \t\t+ [E]: E
+    \t+ [F]: F
+    \t\t- [G]: G
+    """),
+    dedent("""
+    [C]: Claim.
+        +> <Pro1>: Pro1. {a: 1}
+        -> Con1 has no label
+          <_ [Rbt1] : Rebuttal1.
+          _> <Rbt2>
+
+    <Other root>
+        <- [C]
+    """).strip(),
+    "  [Indented first line]\n  <+ [Child]\n",
+    "- not a relation: a root reason",
+]
+
+
+@pytest.mark.parametrize("block", MAP_BLOCKS)
+def test_argument_map_fixtures(map_parser, block):
+    _assert_same_as_lark(map_parser, parse_argument_map, block + "\n")
+
+
+def test_argument_map_synthetic(map_parser):
+    map_blocks = _synthetic_blocks(ArgumentMapBlock)
+    assert map_blocks
+    for block in map_blocks:
+        _assert_same_as_lark(map_parser, parse_argument_map, block + "\n")
+
+
+def test_argument_map_errors_fall_back():
+    for examples in _MAP_ERROR_EXAMPLES.values():
+        for example in examples:
+            assert parse_argument_map(example + "\n") is None
+
+
+def test_argument_map_random(map_parser):
+    pieces = [
+        "[A]", "<X>", ": ", ":", " ", "\t", "text", "+ ", "<+ ", "- ", "-> ", "+> ", "<_ ", "_> ",
+        "><", ">< ", "\n", "\n    ", "\n        ", "\n  ", "\n\t", "[", "<", "]", ">", "[]", "\n\n",
+    ]
+    rng = random.Random(0)
+    for _ in range(2000):
+        text = "".join(rng.choice(pieces) for _ in range(rng.randint(1, 12))) + "\n"
+        tree = parse_argument_map(text)
+        if tree is not None:
+            assert _tokens(tree) == _tokens(map_parser.parse(text)), repr(text)
+
+
+ARGUMENT_BLOCKS = [
+    dedent("""
+    <Argument>: Argument
+
+    (1) Premise.
+    ----
+    (2) Conclusion.
+    """),
+    dedent("""
+    <Argument>
+
+    \t
+    (1) [P1]: Premise. {a: 1}
+    (P2) [P2]
+        <+ [Support]: Support.
+        <- <Objection>
+        >< Contradiction
+    -- {uses: [1, 2]} --
+    (C3) [C] : Intermediary conclusion.
+    (4) <not a label> premise
+    -----
+      (5) Conclusion.
+    """),
+]
+
+
+@pytest.mark.parametrize("block", ARGUMENT_BLOCKS)
+def test_argument_fixtures(argument_parser, block):
+    _assert_same_as_lark(argument_parser, parse_argument, block.strip())
+
+
+def test_argument_synthetic(argument_parser):
+    argument_blocks = _synthetic_blocks(ArgumentBlock)
+    assert argument_blocks
+    for block in argument_blocks:
+        _assert_same_as_lark(argument_parser, parse_argument, block.strip())
+
+
+def test_argument_ingestion():
+    fast_parser = ArgumentParser()
+    lark_parser = ArgumentParser(fast_path=False)
+    for block in _synthetic_blocks(ArgumentBlock)[:10]:
+        fast = fast_parser.ingest_in_argmap(fast_parser.parse(block), ArgdownMultiDiGraph())
+        expected = lark_parser.ingest_in_argmap(lark_parser.parse(block), ArgdownMultiDiGraph())
+        assert fast.arguments == expected.arguments
+        assert fast.propositions == expected.propositions
+        assert list(fast.edges(keys=True, data=True)) == list(expected.edges(keys=True, data=True))
+
+
+def test_argument_errors_fall_back():
+    for examples in _ARGUMENT_ERROR_EXAMPLES.values():
+        for example in examples:
+            assert parse_argument(example.strip()) is None
+
+
+def test_argument_random(argument_parser):
+    pieces = [
+        "<A>", "<A>: gist", "[P]", "[P]: ", ": ", " ", "\t", "text", "(1) ", "(2)", "(C3) ", "(a) ",
+        "\n", "\n  ", "\n\n", "----", "-----", "-- info --", "--", "+ ", "<+ ", "- ", "><", ">< ",
+        "[", "<", "]", ">", "[]",
+    ]
+    template = [
+        "<A>: gist\n\n", "(1) ", "text", "\n", "(2) [P]: t", "\n----\n", "(3) [Q]", "\n  <+ [R]: r",
+        "\n-- x --\n", "(4) x",
+    ]
+    rng = random.Random(0)
+    for _ in range(2000):
+        pieces_ = list(template)
+        for _ in range(rng.randint(0, 3)):
+            pieces_.insert(rng.randrange(len(pieces_) + 1), rng.choice(pieces))
+        text = "".join(pieces_).strip()
+        tree = parse_argument(text)
+        if tree is not None:
+            assert _tokens(tree) == _tokens(argument_parser.parse(text)), repr(text)
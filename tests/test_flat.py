@@ -0,0 +1,117 @@
+"test flat representation of parsed codeblocks"
+
+import pickle
+from textwrap import dedent
+
+import pytest
+
+from pyargdown import ArgdownMultiDiGraph, Valence, parse_argdown
+from pyargdown.parser.flat import FlatCodeblock
+from pyargdown.parser.main import (
+    _FailedCodeblock,
+    _flatten_codeblock_in_pool,
+    _ingest,
+    _parse_codeblock,
+    _split_codeblocks,
+)
+from pyargdown.sourcemap import SourceMap
+
+DOCUMENT = dedent("""
+[Claim]: A claim. {source: web}
+    <+ <Reason>: A reason.
+        <- An unnamed objection.
+    <+ An unnamed reason.
+
+<Reason>
+
+(1) [Premise]: A premise.
+    <+ Unnamed evidence.
+(2) Another premise.
+-- modus ponens {uses: [1, 2]} --
+(3) [Claim]
+
+[Claim]
+    >< Another unnamed proposition.
+""")
+
+
+def _flatten(text, **kwargs):
+    return [_flatten_codeblock_in_pool(codeblock, **kwargs) for codeblock in _split_codeblocks(text, source_map=True)]
+
+
+def _state(argdown):
+    return list(argdown.nodes(data=True)), list(argdown.edges(keys=True, data=True))
+
+
+@pytest.mark.parametrize("topology_only", [False, True])
+def test_ingest_flat_codeblocks(topology_only):
+    expected = parse_argdown(DOCUMENT, topology_only=topology_only)
+    flat = _flatten(DOCUMENT, topology_only=topology_only)
+    assert all(isinstance(codeblock, FlatCodeblock) for codeblock in flat)
+    argdown = _ingest(flat, ArgdownMultiDiGraph())
+    assert _state(argdown) == _state(expected)
+    assert "UNNAMED_PROPOSITION_3" in argdown.nodes
+
+
+def test_flat_codeblock_mentions():
+    expected = parse_argdown(DOCUMENT, source_map=True).source_map
+    source_map = SourceMap()
+    _ingest(_flatten(DOCUMENT, source_map=True), ArgdownMultiDiGraph(), source_map=source_map)
+    assert len(source_map) == len(expected)
+    for label in ["Claim", "UNNAMED_PROPOSITION_1", "UNNAMED_PROPOSITION_3", "Reason_UNNAMED_PREMISE_2"]:
+        assert source_map.node_mentions(label) == expected.node_mentions(label)
+    assert source_map.relation_mentions("Reason", "Claim", Valence.SUPPORT) == expected.relation_mentions(
+        "Reason", "Claim", Valence.SUPPORT
+    )
+
+
+def test_flat_codeblock_tables():
+    text = "[Claim]: A claim.\n    <+ An unnamed reason.\n    <- [Claim]"
+    (codeblock,) = _flatten(text)
+    assert codeblock.labels == ("Claim", "UNNAMED_PROPOSITION")
+    assert list(codeblock.generated) == [1]
+    assert len(codeblock.nodes) == 3 * 4 and codeblock.node_payloads[0] == (("A claim.",), {})
+    assert len(codeblock.edges) == 2 * 4
+    assert len(codeblock.mentions) == 0
+
+
+@pytest.mark.parametrize("protocol", [4, 5])
+def test_pickle_flat_codeblocks(protocol):
+    flat = _flatten(DOCUMENT, source_map=True)
+    restored = [pickle.loads(pickle.dumps(codeblock, protocol=protocol)) for codeblock in flat]
+    assert _state(_ingest(restored, ArgdownMultiDiGraph())) == _state(parse_argdown(DOCUMENT))
+    assert [list(r.mentions) for r in restored] == [list(c.mentions) for c in flat]
+    assert restored[0].span == flat[0].span
+
+
+def test_pickle_flat_codeblock_out_of_band():
+    codeblock = _flatten(DOCUMENT, source_map=True)[1]
+    buffers: list[pickle.PickleBuffer] = []
+    data = pickle.dumps(codeblock, protocol=5, buffer_callback=buffers.append)
+    assert len(buffers) == 5
+    assert len(data) < len(pickle.dumps(codeblock, protocol=5))
+    restored = pickle.loads(data, buffers=[bytes(buffer) for buffer in buffers])
+    for name in ["generated", "nodes", "pcs", "edges", "mentions"]:
+        assert getattr(restored, name) == getattr(codeblock, name)
+    assert restored.labels == codeblock.labels
+    with pytest.raises(pickle.UnpicklingError):
+        pickle.loads(data)
+
+
+def test_flatten_failing_codeblocks():
+    (codeblock,) = _flatten("[A]\n    ~> [B]")
+    assert isinstance(codeblock, _FailedCodeblock)
+    assert _flatten("// only a comment") == [None]
+    # flattened, but cannot be ingested
+    (codeblock,) = _flatten("<Argument>\n\n(1) [Argument]\n-----\n(2) [C]")
+    argdown = ArgdownMultiDiGraph()
+    assert codeblock.ingest_in_argmap(argdown) is argdown
+
+
+def test_ingest_flat_codeblock_fails_in_argument_map():
+    # [A] is an argument in the map, so the proposition [A] cannot be ingested
+    argdown = parse_argdown("<A>: An argument.")
+    (codeblock,) = _flatten("[A]: A proposition.\n    <+ [B]")
+    assert codeblock.ingest_in_argmap(argdown) is argdown
+    tree = _parse_codeblock(_split_codeblocks("[A]: A proposition.\n    <+ [B]")[0])
+    assert tree.parser_class.ingest_in_argmap(tree.tree, argdown) is argdown
@@ -0,0 +1,105 @@
+"test reporting parsed items to handlers"
+
+from textwrap import dedent
+
+import pytest
+
+from pyargdown import (
+    ArgdownHandler,
+    ArgdownMultiDiGraph,
+    Conclusion,
+    DialecticalType,
+    MemoryProfile,
+    Valence,
+    parse_argdown,
+    stream_argdown,
+)
+
+DOCUMENT = dedent("""
+[Claim]: A claim. {source: web}
+    <+ <Reason>: A reason.
+        <- An unnamed objection.
+    <+ [Support]: Support.
+
+<Reason>
+
+(1) [Premise]: A premise.
+    <+ Unnamed evidence.
+(2) Another premise.
+-- modus ponens --
+(3) [Claim]
+""")
+
+
+class Recorder(ArgdownHandler):
+
+    def __init__(self):
+        super().__init__()
+        self.events = []
+
+    def on_proposition(self, proposition):
+        self.events.append(("proposition", proposition.label, proposition.texts))
+
+    def on_argument(self, argument):
+        self.events.append(("argument", argument.label, len(argument.pcs)))
+
+    def on_pcs_item(self, argument_label, item):
+        self.events.append(("pcs", argument_label, item.proposition_label, isinstance(item, Conclusion)))
+
+    def on_relation(self, edge):
+        self.events.append(("relation", edge.source, edge.target, edge.valence, edge.dialectics))
+
+    def on_error(self, error):
+        self.events.append(("error", type(error).__name__))
+
+
+def test_stream_argdown_events():
+    events = stream_argdown(DOCUMENT, Recorder()).events
+    assert events == [
+        ("proposition", "Claim", ["A claim."]),
+        ("argument", "Reason", 0),
+        ("proposition", "UNNAMED_PROPOSITION", ["An unnamed objection."]),
+        ("relation", "UNNAMED_PROPOSITION", "Reason", Valence.ATTACK, [DialecticalType.SKETCHED]),
+        ("proposition", "Support", ["Support."]),
+        ("relation", "Reason", "Claim", Valence.SUPPORT, [DialecticalType.SKETCHED]),
+        ("relation", "Support", "Claim", Valence.SUPPORT, [DialecticalType.AXIOMATIC]),
+        ("proposition", "Premise", ["A premise."]),
+        ("proposition", "UNNAMED_PROPOSITION_1", ["Unnamed evidence."]),
+        ("proposition", "Reason_UNNAMED_PREMISE_2", ["Another premise."]),
+        ("proposition", "Claim", []),
+        ("relation", "UNNAMED_PROPOSITION_1", "Premise", Valence.SUPPORT, [DialecticalType.SKETCHED]),
+        ("argument", "Reason", 3),
+        ("pcs", "Reason", "Premise", False),
+        ("pcs", "Reason", "Reason_UNNAMED_PREMISE_2", False),
+        ("pcs", "Reason", "Claim", True),
+    ]
+    assert stream_argdown(DOCUMENT, Recorder(), topology_only=True).events[0] == ("proposition", "Claim", [])
+
+
+def test_stream_argdown_errors():
+    document = "[A]: a\n\n[B]\n    ~> [C]\n\n[D]: d"
+    events = stream_argdown(document, Recorder()).events
+    assert [event[0] for event in events] == ["proposition", "error", "proposition"]
+    assert events[2] == ("proposition", "D", ["d"])
+    with pytest.raises(SyntaxError):
+        stream_argdown(document, ArgdownHandler())
+
+
+def test_make_label_unique():
+    handler = ArgdownHandler()
+    assert [handler.make_label_unique(label) for label in ["A", "A", "B", "A"]] == ["A", "A_1", "B", "A_2"]
+
+
+def test_argument_map_as_handler(valid_corpus_snippet):
+    expected = parse_argdown(valid_corpus_snippet["argdown"])
+    argdown = stream_argdown(valid_corpus_snippet["argdown"], ArgdownMultiDiGraph())
+    argdown._update()
+    assert list(argdown.nodes(data=True)) == list(expected.nodes(data=True))
+    assert list(argdown.edges(keys=True, data=True)) == list(expected.edges(keys=True, data=True))
+
+
+def test_stream_argdown_builds_no_graph():
+    with MemoryProfile(top=0) as profile:
+        stream_argdown(DOCUMENT, ArgdownHandler())
+    assert "transform" in profile.stages
+    assert "deepcopy" not in profile.stages and "grounding" not in profile.stages
@@ -0,0 +1,100 @@
+"test resource limits of parsing documents"
+
+from concurrent.futures import ProcessPoolExecutor
+import itertools
+import pickle
+from textwrap import dedent
+
+import pytest
+
+from pyargdown import ArgdownLimitError, ParseLimits, parse_argdown, parse_argdown_batch
+from pyargdown.parser.limits import _Budget, nesting_depth
+
+DOCUMENT = dedent("""
+[Claim]: A claim.
+    <+ <Reason>: A reason.
+        <- [Objection]: An objection.
+
+<Reason>
+
+(1) [Premise]: A premise.
+(2) Another premise.
+-----
+(3) [Claim]
+
+[Other claim]: Another claim.
+""")
+
+MODES = [{}, {"single_pass": True}, {"tolerant": True}]
+
+
+def test_nesting_depth():
+    assert nesting_depth("") == 0
+    assert nesting_depth(DOCUMENT) == 3
+    assert nesting_depth("a\n    b\n  c\n      d\n e\n") == 3
+
+
+@pytest.mark.parametrize("kwargs", MODES)
+def test_within_limits(kwargs):
+    expected = parse_argdown(DOCUMENT, **kwargs)
+    limits = ParseLimits(max_chars=len(DOCUMENT), max_blocks=3, max_depth=3, max_nodes=6, timeout=60)
+    argdown = parse_argdown(DOCUMENT, limits=limits, **kwargs)
+    assert list(argdown.nodes) == list(expected.nodes)
+    assert list(argdown.edges(keys=True)) == list(expected.edges(keys=True))
+
+
+@pytest.mark.parametrize("kwargs", MODES)
+@pytest.mark.parametrize("limits, limit, value", [
+    (ParseLimits(max_chars=100), "max_chars", len(DOCUMENT)),
+    (ParseLimits(max_blocks=2), "max_blocks", 3),
+    (ParseLimits(max_depth=2), "max_depth", 3),
+    (ParseLimits(max_nodes=5), "max_nodes", 6),
+])
+def test_limit_exceeded(kwargs, limits, limit, value):
+    with pytest.raises(ArgdownLimitError) as info:
+        parse_argdown(DOCUMENT, limits=limits, **kwargs)
+    assert (info.value.limit, info.value.value) == (limit, value)
+    assert str(info.value) == f"Document exceeds {limit}={getattr(limits, limit)} ({value})"
+
+
+def test_limits_apply_to_all_texts():
+    parse_argdown([DOCUMENT, DOCUMENT], limits=ParseLimits(max_chars=len(DOCUMENT) * 2))
+    with pytest.raises(ArgdownLimitError):
+        parse_argdown([DOCUMENT, DOCUMENT], limits=ParseLimits(max_blocks=5))
+
+
+@pytest.mark.parametrize("kwargs", MODES)
+def test_timeout(kwargs, monkeypatch):
+    # every reading of the clock takes a second
+    clock = itertools.count()
+    monkeypatch.setattr(_Budget, "clock", staticmethod(lambda: next(clock)))
+    with pytest.raises(ArgdownLimitError) as info:
+        parse_argdown(DOCUMENT, limits=ParseLimits(timeout=3.5), **kwargs)
+    assert info.value.limit == "timeout"
+    assert info.value.value == 4
+
+
+def test_limit_error_pickles():
+    error = ArgdownLimitError("max_nodes", 6, 5)
+    restored = pickle.loads(pickle.dumps(error))
+    assert (restored.limit, restored.value, restored.maximum) == ("max_nodes", 6, 5)
+    assert str(restored) == str(error)
+
+
+def test_lazy_limits():
+    with pytest.raises(ValueError):
+        parse_argdown(DOCUMENT, lazy=True, limits=ParseLimits(max_nodes=5))
+
+
+def test_batch_skips_limited_documents():
+    documents = [DOCUMENT, DOCUMENT + "\n[Yet another claim]: More.", "[A]: a"]
+    limits = ParseLimits(max_nodes=6)
+    with pytest.raises(ArgdownLimitError):
+        parse_argdown_batch(documents, limits=limits)
+    argdowns = parse_argdown_batch(documents, limits=limits, skip_limited=True)
+    assert argdowns[1] is None
+    assert list(argdowns[0].nodes) == list(parse_argdown(DOCUMENT).nodes)
+    assert list(argdowns[2].nodes) == ["A"]
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        argdowns = parse_argdown_batch(documents, executor=executor, limits=limits, skip_limited=True)
+    assert [argdown is None for argdown in argdowns] == [False, True, False]
@@ -1,12 +1,16 @@
 "test main parser"
 
 import pytest
+from lark import UnexpectedInput
 
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from textwrap import dedent
 
 from pyargdown.model import Conclusion, DialecticalType, Valence
-from pyargdown import parse_argdown
-from pyargdown.parser.base import ArgdownParser
+from pyargdown import parse_argdown, parse_argdown_batch
+from pyargdown.parser.base import ArgdownParser, ArgdownSyntaxError
+from pyargdown.parser.lazy import LazyArgdown
+from pyargdown.parser.main import _get_document_parser
 
 
 @pytest.fixture
@@ -214,3 +218,399 @@ def test_unnamed_premises(argdown_snippet1):
     print(argument.label.replace(" ","_"))
     print(argument.pcs)
     assert all(pr.proposition_label.startswith(argument.label.replace(" ","_")) for pr in argument.pcs)
+
+
+def test_axiomatic_closure():
+    snippet = dedent("""
+    [A]
+        +> [B]
+            +> [C]
+
+    <Arg1>
+
+    (1) P.
+    -----
+    (2) [A]
+
+    <Arg2>
+
+    (1) [C]
+    -----
+    (2) Q.
+    """)
+    argdown = parse_argdown(snippet)
+    rel = argdown.get_dialectical_relation("Arg1", "Arg2")
+    assert len(rel) == 1
+    assert rel[0].valence == Valence.SUPPORT
+    assert rel[0].dialectics == [DialecticalType.GROUNDED]
+
+    argdown = parse_argdown(snippet, axiomatic_closure=False)
+    assert argdown.get_dialectical_relation("Arg1", "Arg2") is None
+
+
+def _argdown_document(n_blocks):
+    blocks = []
+    for i in range(n_blocks):
+        blocks.append(dedent(f"""
+        [Claim {i}]: Claim {i}.
+            + <Reason {i}>
+            - [Claim {i + 1}]
+
+        <Reason {i}>
+
+        (1) [Premise {i}]: Premise.
+        -- {{uses: [1]}} --
+        (2) [Claim {i}]
+        """))
+    return "\n".join(blocks)
+
+
+@pytest.mark.parametrize("executor_class", [ThreadPoolExecutor, ProcessPoolExecutor])
+def test_parallel_parsing(executor_class):
+    document = _argdown_document(30)
+    expected = parse_argdown(document)
+    with executor_class(max_workers=2) as executor:
+        argdown = parse_argdown(document, executor=executor)
+    assert list(argdown.nodes(data=True)) == list(expected.nodes(data=True))
+    assert list(argdown.edges(keys=True, data=True)) == list(expected.edges(keys=True, data=True))
+
+
+@pytest.mark.parametrize("executor_class", [ThreadPoolExecutor, ProcessPoolExecutor])
+def test_parallel_parsing_error(executor_class):
+    document = _argdown_document(5) + "\n\n[A]\n    ~> [B]\n\n" + _argdown_document(5)
+    with pytest.raises(Exception) as expected:
+        parse_argdown(document)
+    with executor_class(max_workers=2) as executor:
+        with pytest.raises(expected.type) as error:
+            parse_argdown(document, executor=executor)
+    assert str(error.value) == str(expected.value)
+
+
+def test_parsing_error_location():
+    document = _argdown_document(3) + "\n\n[A]: claim\n    + [L] text\n"
+    with pytest.raises(ArgdownSyntaxError) as error:
+        parse_argdown(document)
+    span = error.value.span
+    assert document[span.start:span.end].strip().startswith("[A]: claim")
+    assert f"of the codeblock starting at line {span.line}" in str(error.value)
+    # line numbers of the error are relative to the codeblock
+    _, line, _ = error.value.args
+    assert span.line + line - 1 == document[:document.index("+ [L] text")].count("\n") + 1
+
+
+def _normalized(argdown):
+    nodes = {label: data for label, data in argdown.nodes(data=True)}
+    edges = {
+        (u, v, key, tuple(sorted(data["dialectics"])), repr(data["data"]))
+        for u, v, key, data in argdown.edges(keys=True, data=True)
+    }
+    return nodes, edges
+
+
+@pytest.mark.parametrize("shards", [
+    ["argdown_snippet1", "argdown_snippet2"],
+    ["argdown_snippet1", "argdown_snippet4", "argdown_snippet4", "argdown_snippet3"],
+    ["argdown_snippet5", "argdown_snippet5", "argdown_snippet3"],
+    ["argdown_map_freewill", "argdown_snippet6", "argdown_snippet2"],
+])
+def test_merge(shards, request):
+    texts = [request.getfixturevalue(name) for name in shards]
+    expected = parse_argdown(texts)
+    argdown = parse_argdown(texts[0])
+    for text in texts[1:]:
+        argdown.merge(parse_argdown(text))
+    assert _normalized(argdown) == _normalized(expected)
+
+
+def test_merge_grounds_across_shards():
+    shard1 = dedent("""
+    <A1>
+
+    (1) P.
+    -----
+    (2) [A]: A.
+
+    <A2>
+
+    (1) [C]: C.
+    -----
+    (2) Q.
+    """)
+    shard2 = dedent("""
+    [A]
+        +> [B]
+            +> [C]
+    """)
+    argdown = parse_argdown(shard1)
+    renamed = argdown.merge(parse_argdown(shard2))
+    assert renamed == {}
+    rel = argdown.get_dialectical_relation("A1", "A2")
+    assert [r.valence for r in rel] == [Valence.SUPPORT]
+    assert rel[0].dialectics == [DialecticalType.GROUNDED]
+    assert _normalized(argdown) == _normalized(parse_argdown([shard1, shard2]))
+
+
+def test_parse_batch():
+    documents = [_argdown_document(n) for n in range(1, 12)]
+    expected = [parse_argdown(document) for document in documents]
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        argdowns_processes = parse_argdown_batch(documents, executor=executor)
+    for argdowns in [
+        parse_argdown_batch(documents, max_workers=4),
+        argdowns_processes,
+    ]:
+        assert len(argdowns) == len(expected)
+        for argdown, expected_argdown in zip(argdowns, expected):
+            assert list(argdown.nodes(data=True)) == list(expected_argdown.nodes(data=True))
+            assert _normalized(argdown) == _normalized(expected_argdown)
+
+
+def test_concurrent_parsing_threads():
+    documents = [_argdown_document(n % 5 + 1) + "\n\n[X]\n    ~> [Y]\n" * (n % 2) for n in range(40)]
+
+    def outcome(document):
+        try:
+            return _normalized(parse_argdown(document))
+        except Exception as e:
+            return type(e), str(e)
+
+    expected = [outcome(document) for document in documents]
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        assert list(executor.map(outcome, documents)) == expected
+
+
+@pytest.mark.parametrize("fixture", [
+    "argdown_snippet1",
+    "argdown_snippet3",
+    "argdown_snippet5",
+    "argdown_map_freewill",
+    "argdown_snippet6",
+])
+def test_lazy_parsing(fixture, request):
+    document = request.getfixturevalue(fixture)
+    expected = parse_argdown(document)
+    for label in expected.nodes:
+        lazy = parse_argdown(document, lazy=True)
+        assert isinstance(lazy, LazyArgdown)
+        assert lazy.get_proposition(label) == expected.get_proposition(label)
+        assert lazy.get_argument(label) == expected.get_argument(label)
+    lazy = parse_argdown(document, lazy=True)
+    assert _normalized(lazy.materialize()) == _normalized(expected)
+
+
+def test_lazy_parsing_parses_needed_blocks():
+    document = _argdown_document(20) + "\n\nUnlabeled claim.\n    <+ [Claim 3]\n"
+    expected = parse_argdown(document)
+    lazy = parse_argdown(document, lazy=True)
+    assert lazy.argument_labels == [f"Reason {i}" for i in range(20)]
+    assert set(lazy.proposition_labels) == {
+        label for label in expected.nodes
+        if expected.get_proposition(label) and not label.startswith("UNNAMED")
+    }
+    assert "Claim 20" in lazy and "Claim 21" not in lazy
+    assert lazy.get_argument("Reason 5") == expected.get_argument("Reason 5")
+    assert len(lazy._trees) == 2
+    assert lazy.get_proposition("Claim 3") == expected.get_proposition("Claim 3")
+    assert lazy.get_proposition("UNNAMED_PROPOSITION") == expected.get_proposition("UNNAMED_PROPOSITION")
+    assert lazy.get_proposition("Claim 21") is None
+
+
+@pytest.mark.parametrize("fixture", [
+    "argdown_snippet1",
+    "argdown_snippet3",
+    "argdown_snippet5",
+    "argdown_map_freewill",
+    "argdown_snippet6",
+])
+def test_topology_only(fixture, request):
+    document = request.getfixturevalue(fixture)
+    expected = parse_argdown(document)
+    argdown = parse_argdown(document, topology_only=True)
+    assert list(argdown.nodes) == list(expected.nodes)
+    assert list(argdown.edges(keys=True)) == list(expected.edges(keys=True))
+    for label, data in argdown.nodes(data=True):
+        assert not data.get("texts") and not data.get("gists") and not data["data"]
+        expected_pcs = [
+            {key: value for key, value in pr.items() if key not in ["inference_info", "inference_data"]}
+            for pr in expected.nodes[label].get("pcs", [])
+        ]
+        for pr in data.get("pcs", []):
+            assert pr.get("inference_info") is None and not pr.get("inference_data")
+        assert [
+            {key: value for key, value in pr.items() if key not in ["inference_info", "inference_data"]}
+            for pr in data.get("pcs", [])
+        ] == expected_pcs
+
+
+@pytest.mark.parametrize("fixture", [
+    "argdown_snippet1",
+    "argdown_snippet2",
+    "argdown_snippet3",
+    "argdown_snippet4",
+    "argdown_snippet5",
+    "argdown_snippet6",
+    "argdown_map_freewill",
+])
+def test_single_pass(fixture, request):
+    document = request.getfixturevalue(fixture)
+    assert _get_document_parser().parse(document) is not None
+    expected = parse_argdown(document)
+    argdown = parse_argdown(document, single_pass=True)
+    assert list(argdown.nodes(data=True)) == list(expected.nodes(data=True))
+    assert list(argdown.edges(keys=True, data=True)) == list(expected.edges(keys=True, data=True))
+
+
+def test_single_pass_comments_and_several_texts():
+    texts = [
+        _argdown_document(3) + dedent("""
+        // a comment line
+        [Claim 7]: A claim <!-- html comment -->
+          that spans two lines. /* js comment */
+            <+ [Claim 8] // trailing comment
+
+        <Reason 7>
+
+        (1) [Premise 7]: First
+            premise.
+        ----
+        (2) [Claim 7]
+        """),
+        _argdown_document(2),
+    ]
+    assert _get_document_parser().parse(texts[0]) is not None
+    expected = parse_argdown(texts)
+    argdown = parse_argdown(texts, single_pass=True)
+    assert list(argdown.nodes(data=True)) == list(expected.nodes(data=True))
+    assert list(argdown.edges(keys=True, data=True)) == list(expected.edges(keys=True, data=True))
+
+
+def test_single_pass_falls_back():
+    # inference information spanning lines
+    document = _argdown_document(2) + "\n\n<Reason 1>\n\n(1) [P]\n--\n{uses: [1]}\n--\n(2) [C]\n"
+    assert _get_document_parser().parse(document) is None
+    argdown = parse_argdown(document, single_pass=True)
+    assert list(argdown.nodes(data=True)) == list(parse_argdown(document).nodes(data=True))
+
+    document = _argdown_document(3) + "\n\n[A]: claim\n    + [L] text\n"
+    with pytest.raises(ArgdownSyntaxError) as expected:
+        parse_argdown(document)
+    with pytest.raises(ArgdownSyntaxError) as error:
+        parse_argdown(document, single_pass=True)
+    assert str(error.value) == str(expected.value)
+
+    with pytest.raises(ValueError):
+        parse_argdown(document, single_pass=True, lazy=True)
+
+
+@pytest.mark.parametrize("kwargs", [{}, {"single_pass": True}])
+def test_deep_nesting(kwargs):
+    depth = 2000
+    document = "[R0]: Root.\n" + "".join(" " * i + f"<+ <R{i}>: Reason {i}.\n" for i in range(1, depth))
+    argdown = parse_argdown([document, "\n<R1999>\n\n(1) [P]: Premise.\n-----\n(2) [R0]\n"], **kwargs)
+    assert len(argdown.nodes) == depth + 1
+    assert argdown.get_dialectical_relation("R1999", "R1998")[0].valence == Valence.SUPPORT
+    assert argdown.get_argument("R1999").pcs[-1].proposition_label == "R0"
+
+
+@pytest.mark.parametrize("fixture", [
+    "argdown_snippet1",
+    "argdown_snippet5",
+    "argdown_snippet6",
+    "argdown_map_freewill",
+])
+def test_tolerant_valid(fixture, request):
+    document = request.getfixturevalue(fixture)
+    expected = parse_argdown(document)
+    argdown = parse_argdown(document, tolerant=True)
+    assert argdown.diagnostics == []
+    assert list(argdown.nodes(data=True)) == list(expected.nodes(data=True))
+    assert list(argdown.edges(keys=True, data=True)) == list(expected.edges(keys=True, data=True))
+    assert parse_argdown(document).diagnostics is None
+
+
+def test_tolerant_recovers():
+    document = dedent("""
+    [A]: Claim A.
+        <+ [B]: Claim B.
+        <+ [X] Missing colon.
+            <+ [Y]: Child of the invalid line.
+        <- [D]: Claim D.
+
+    <Arg>: Argument.
+
+    (1) [P1]: Premise one.
+    (2) [P2]: Premise two.
+    ----
+    <+ [R]: Reason after the inference line.
+    (3) [A]
+    -----
+
+    <Broken>
+
+    (1) [Q] Missing colon.
+    """)
+    with pytest.raises(UnexpectedInput):
+        parse_argdown(document)
+    argdown = parse_argdown(document, tolerant=True)
+    assert sorted(argdown.nodes) == ["A", "Arg", "B", "D", "P1", "P2"]
+    assert argdown.get_dialectical_relation("D", "A") is not None
+    assert [c.proposition_label for c in argdown.get_argument("Arg").pcs if isinstance(c, Conclusion)] == ["A"]
+
+    lines = document.split("\n")
+    assert [(d.text, d.line, d.message) for d in argdown.diagnostics] == [
+        (0, 4, "Missing colon after label"),
+        (0, 5, "Child of invalid line skipped"),
+        (0, 13, "Unexpected LEFT_PRO token"),
+        (0, 15, "Inference line without conclusion"),
+        (0, 17, "Invalid codeblock skipped"),
+        (0, 19, "Missing colon after label"),
+    ]
+    for diagnostic in argdown.diagnostics:
+        assert diagnostic.context == lines[diagnostic.line - 1]
+    assert argdown.diagnostics[1].column == 9
+
+
+def test_tolerant_several_texts():
+    texts = [_argdown_document(2), "[A]: a\n    + [B] b\n    + [C]: c\n"]
+    argdown = parse_argdown(texts, tolerant=True, source_map=True)
+    assert [(d.text, d.line) for d in argdown.diagnostics] == [(1, 2)]
+    assert argdown.source_map.node_position("C") == (1, 3, 7)
+    assert "Claim 1" in argdown.nodes
+
+    # valid syntax beyond the single-pass parser is kept
+    document = _argdown_document(2) + "\n\n<Reason 1>\n\n(1) [P]\n--\n{uses: [1]}\n--\n(2) [C]\n"
+    argdown = parse_argdown(document, tolerant=True)
+    assert argdown.diagnostics == []
+    assert list(argdown.nodes(data=True)) == list(parse_argdown(document).nodes(data=True))
+
+    with pytest.raises(ValueError):
+        parse_argdown(document, tolerant=True, lazy=True)
+
+
+@pytest.mark.parametrize("document", [
+    "<_ <E>: e\n    <+ [A]: a",
+    "<+ [A]: a\n    <- [C]: c\n\n[C]\n    +> <Reason>",
+    "[A]: a\n\n<- <B>\n    <+ [A]",
+])
+def test_lazy_parsing_relation_on_first_line(document):
+    expected = parse_argdown(document)
+    for label in expected.nodes:
+        lazy = parse_argdown(document, lazy=True)
+        assert lazy.get_proposition(label) == expected.get_proposition(label)
+        assert lazy.get_argument(label) == expected.get_argument(label)
+    lazy = parse_argdown(document, lazy=True)
+    labels = [label for label in expected.nodes if not label.startswith("UNNAMED")]
+    assert sorted(lazy.proposition_labels + lazy.argument_labels) == sorted(labels)
+    assert all(label in lazy for label in labels)
+    assert _normalized(lazy.materialize()) == _normalized(expected)
+
+
+def test_lazy_parsing_caches_partial_maps():
+    document = _argdown_document(5)
+    lazy = parse_argdown(document, lazy=True)
+    argdown = lazy._partial_map("Reason 2")
+    assert lazy._partial_map("Reason 2") is argdown
+    assert lazy.get_argument("Reason 2") == parse_argdown(document).get_argument("Reason 2")
+    assert len(lazy._partial_maps) == 1
+    lazy.materialize()
+    assert lazy._partial_map("Reason 2") is lazy.materialize()
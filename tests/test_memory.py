@@ -0,0 +1,80 @@
+"test memory accounting of argument maps and memory profiles of parsing"
+
+import threading
+import tracemalloc
+from textwrap import dedent
+
+import pytest
+
+from pyargdown import MemoryProfile, parse_argdown
+from pyargdown.memory import _Sizer, profile_stage
+
+DOCUMENT = dedent("""
+[Claim]: A claim. {source: web}
+    <+ <Reason>: A reason.
+    <- [Objection]: An objection.
+
+<Reason>
+
+(1) [Premise]: A premise.
+(2) Another premise.
+-- {uses: [1, 2]} --
+(3) [Claim]
+""")
+
+
+def test_sizer_counts_shared_objects_once():
+    shared = ["x" * 100]
+    sizer = _Sizer()
+    first = sizer.size({"a": shared})
+    assert first > 100
+    assert sizer.size({"b": shared}) < first
+    assert _Sizer().size(shared, shared) == _Sizer().size(shared)
+
+
+def test_memory_usage():
+    argdown = parse_argdown(DOCUMENT)
+    usage = argdown.memory_usage()
+    assert list(usage) == ["labels", "texts", "data", "pcs", "edges", "indexes", "source_map", "graph", "total"]
+    assert usage["total"] == sum(v for k, v in usage.items() if k != "total")
+    assert all(usage[k] > 0 for k in usage if k != "source_map")
+    assert usage["source_map"] == 0
+    assert parse_argdown(DOCUMENT, source_map=True).memory_usage()["source_map"] > 0
+
+    longer = parse_argdown(DOCUMENT.replace("A premise.", "A premise. " + "Long text. " * 100))
+    assert longer.memory_usage()["texts"] > usage["texts"] + 1000
+
+
+def test_memory_profile():
+    assert not tracemalloc.is_tracing()
+    with MemoryProfile() as profile:
+        argdown = parse_argdown(DOCUMENT)
+    assert not tracemalloc.is_tracing()
+    assert list(profile.stages) == ["split", "preprocess", "parse", "deepcopy", "transform", "grounding"]
+    assert profile.stages["parse"].calls == 2
+    assert profile.stages["deepcopy"].calls == 2
+    assert all(stage.peak >= 0 for stage in profile.stages.values())
+    assert profile.peak > 0
+    assert profile.top_allocations
+    assert "deepcopy" in profile.format()
+    assert "Claim" in argdown.nodes
+
+    with MemoryProfile(top=0) as profile:
+        parse_argdown(DOCUMENT, single_pass=True)
+    assert profile.stages["parse"].calls == 1
+    assert "preprocess" not in profile.stages
+    assert profile.top_allocations == []
+
+
+def test_memory_profile_scope():
+    with MemoryProfile(top=0) as profile:
+        with pytest.raises(RuntimeError):
+            with MemoryProfile():
+                pass
+        # other threads are not profiled
+        thread = threading.Thread(target=parse_argdown, args=(DOCUMENT,))
+        thread.start()
+        thread.join()
+    assert profile.stages == {}
+    with profile_stage("parse"):
+        pass
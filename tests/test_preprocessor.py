@@ -12,7 +12,10 @@ from pyargdown.parser.preprocessor import (
     ArgumentMapBlock,
     remove_html_comments,
     remove_js_comments,
+    LineMap,
 )
+from pyargdown.parser.document import preprocess_lines
+from pyargdown.parser.main import _make_preprocessor
 
 
 @pytest.fixture
@@ -257,6 +260,30 @@ def test_split_blocks(argdown_text_1, argdown_text_2):
     assert isinstance(blocks[4], ArgumentMapBlock)
 
 
+def test_scan_blocks(argdown_text_1, argdown_text_2):
+    text = argdown_text_1 + "\n\n" + argdown_text_1 + "\n\n" + argdown_text_2
+    text = remove_js_comments(text)
+    text = remove_html_comments(text)
+    spans = Preprocessor.scan_blocks(text)
+    blocks = Preprocessor.split_blocks(text)
+    assert [span.kind for span in spans] == [type(block) for block in blocks]
+    for span, block in zip(spans, blocks):
+        assert block == text[span.start:span.end]
+        assert block.span == span
+        assert span.line == text[:span.start].count("\n") + 1
+    assert all(spans[i].end < spans[i + 1].start for i in range(len(spans) - 1))
+
+
+def test_scan_blocks_long_argument():
+    # continuation blocks extend the span of the argument block
+    text = "<A>\n\n" + "\n\n".join(f"(1) Premise {i}." for i in range(1000)) + "\n\n[B]"
+    spans = Preprocessor.scan_blocks(text)
+    assert len(spans) == 2
+    assert spans[0].kind is ArgumentBlock and spans[1].kind is ArgumentMapBlock
+    assert spans[0].start == 0 and text[spans[1].start:] == "[B]"
+    assert spans[1].line == 2 * 1001 + 1
+
+
 def test_split_blocks2(argument_blocks_with_multiple_args):
     for text in argument_blocks_with_multiple_args:
         print(text)
@@ -317,3 +344,17 @@ def test_parse_argdown(argdown_text_1, argdown_text_2):
         "    <- [Child]: Child.\n"
         "[Root2]: Root2.\n"
     )
+
+
+def test_preprocess_lines(argdown_text_1, argdown_text_2, argument_blocks_with_reasons):
+    preprocessor = _make_preprocessor()
+    texts = [argdown_text_1, argdown_text_2, *argument_blocks_with_reasons, "// comment only\n// block"]
+    for text in texts:
+        for span in Preprocessor.scan_blocks(text):
+            block = span.codeblock(text)
+            block.line_map = LineMap.identity(block.count("\n") + 1)
+            expected = preprocessor.process(block)
+            lines = preprocess_lines(block.split("\n"), argument=span.kind is ArgumentBlock)
+            assert "\n".join(line for line, _, _ in lines) == expected
+            assert [i for _, i, _ in lines] == list(expected.line_map.lines)
+            assert [shift for _, _, shift in lines] == list(expected.line_map.columns)
@@ -0,0 +1,91 @@
+"test full-text search index"
+
+import pytest
+
+from textwrap import dedent
+
+from pyargdown import Argument, Proposition, parse_argdown
+from pyargdown.search import ArgdownSearchIndex, InMemorySearchIndex, SqliteSearchIndex, tokenize
+
+
+@pytest.fixture
+def argdown_maps():
+    return {
+        "map1": parse_argdown(dedent("""
+            [Claim]: Cats are mammals.
+                + <Reason>: Cats give birth to live young. {source: wiki}
+            """)),
+        "map2": parse_argdown(dedent("""
+            <Argument>: Dogs are loyal.
+
+            (1) Dogs are mammals.
+            (2) [Loyal]: Mammals can be loyal.
+            -----
+            (3) Dogs are loyal.
+            """)),
+    }
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def search_index(request, tmp_path):
+    if request.param == "memory":
+        yield InMemorySearchIndex()
+    else:
+        index = SqliteSearchIndex(tmp_path / "index.sqlite")
+        yield index
+        index.close()
+
+
+def test_tokenize():
+    assert tokenize("Cats, dogs & MAMMALS!") == ["cats", "dogs", "mammals"]
+
+
+def test_search(search_index, argdown_maps):
+    for map_id, argdown in argdown_maps.items():
+        search_index.add_map(map_id, argdown)
+
+    assert sorted(search_index.search("mammals")) == [
+        ("map1", "Claim"),
+        ("map2", "Argument_UNNAMED_PREMISE_1"),
+        ("map2", "Loyal"),
+    ]
+    assert search_index.search("cats mammals") == [("map1", "Claim")]
+    assert search_index.search("source") == [("map1", "Reason")]
+    assert sorted(search_index.search("LOYAL dogs")) == [
+        ("map2", "Argument"),
+        ("map2", "Argument_UNNAMED_CONCLUSION_3"),
+    ]
+    assert search_index.search("unicorns") == []
+    assert search_index.search("") == []
+
+    search_index.remove_map("map1")
+    assert "map1" not in search_index
+    assert search_index.search("cats") == []
+    search_index.add_map("map2", argdown_maps["map1"])
+    assert search_index.map_ids() == ["map2"]
+    assert search_index.search("dogs") == []
+    assert search_index.search("cats mammals") == [("map2", "Claim")]
+
+
+def test_sqlite_persistence(tmp_path, argdown_maps):
+    with SqliteSearchIndex(tmp_path / "index.sqlite") as index:
+        index.add_map("map1", argdown_maps["map1"])
+    with SqliteSearchIndex(tmp_path / "index.sqlite") as index:
+        assert "map1" in index
+        assert index.search("live young") == [("map1", "Reason")]
+
+
+def test_postings_read_node_payloads(argdown_maps, monkeypatch):
+    argdown = argdown_maps["map2"]
+    expected = [
+        (token, node.label)
+        for node, texts in [(p, p.texts) for p in argdown.propositions] + [(a, a.gists) for a in argdown.arguments]
+        for token in dict.fromkeys(t for text in texts for t in tokenize(text))
+    ]
+
+    def fail(data):
+        raise AssertionError("postings build propositions or arguments")
+
+    monkeypatch.setattr(Proposition, "from_dict", staticmethod(fail))
+    monkeypatch.setattr(Argument, "from_dict", staticmethod(fail))
+    assert list(ArgdownSearchIndex.postings(argdown)) == expected
@@ -0,0 +1,97 @@
+"test source maps of parsed argument maps"
+
+from concurrent.futures import ProcessPoolExecutor
+from textwrap import dedent
+
+from pyargdown import parse_argdown, Valence
+from pyargdown.sourcemap import SourceMap
+
+DOCUMENT = dedent("""
+// A comment
+[Claim A]: Claim A
+    spans two lines. <!-- comment -->
+    <+ <Reason 1>: Gist of
+        reason 1.
+    /* another comment */
+    <- [Claim B]
+
+<Reason 1>
+
+    (1) [P1]: Premise
+        one.
+        // comment
+        <+ [E]: Evidence.
+    (2) Unlabeled premise.
+    -----
+    (3) [Claim A]
+
+[Claim B]
+    >< [Claim A]
+""")
+
+
+def _at(texts, position):
+    line = texts[position.text].split("\n")[position.line - 1]
+    return line[position.column - 1:]
+
+
+def test_source_map():
+    argdown = parse_argdown(DOCUMENT, source_map=True)
+    source_map = argdown.source_map
+    assert isinstance(source_map, SourceMap)
+
+    for label in argdown.nodes:
+        mentions = source_map.node_mentions(label)
+        assert mentions, label
+        assert source_map.node_position(label) == mentions[0]
+        for position in mentions:
+            if "UNNAMED" in label:
+                assert _at([DOCUMENT], position).startswith("Unlabeled premise.")
+            else:
+                assert _at([DOCUMENT], position)[1:].startswith(label + ("]" if argdown.get_proposition(label) else ">"))
+
+    assert [p.line for p in source_map.node_mentions("Claim A")] == [3, 18, 21]
+    assert [p.line for p in source_map.node_mentions("Reason 1")] == [5, 10]
+    assert source_map.node_position("P1").line == 12
+    assert source_map.node_position("E").line == 15
+
+    for (s, t, v), line in [
+        (("Reason 1", "Claim A", Valence.SUPPORT), 5),
+        (("Claim B", "Claim A", Valence.ATTACK), 8),
+        (("E", "P1", Valence.SUPPORT), 15),
+        (("Claim A", "Claim B", Valence.CONTRADICT), 21),
+    ]:
+        position = source_map.relation_position(s, t, v)
+        assert position is not None and position.line == line
+        assert _at([DOCUMENT], position)[:2] in ["<+", "<-", "><"]
+    # grounded relations are not mentioned
+    assert argdown.get_dialectical_relation("P1", "Reason 1") is not None
+    assert source_map.relation_position("P1", "Reason 1", Valence.SUPPORT) is None
+
+
+def test_source_map_several_texts():
+    texts = ["[A]: a\n    <+ [B]: b\n", "\n\n<Arg>\n\n(1) [B]\n-----\n(2) [A]\n"]
+    argdown = parse_argdown(texts, source_map=True)
+    assert argdown.source_map.node_mentions("B") == [(0, 2, 8), (1, 5, 5)]
+    assert argdown.source_map.node_position("Arg") == (1, 3, 1)
+    assert parse_argdown(texts).source_map is None
+
+
+def test_source_map_parallel():
+    expected = parse_argdown(DOCUMENT, source_map=True).source_map
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        source_map = parse_argdown(DOCUMENT, source_map=True, executor=executor).source_map
+    for label in ["Claim A", "Reason 1", "P1", "E"]:
+        assert source_map.node_mentions(label) == expected.node_mentions(label)
+
+
+def test_source_map_single_pass():
+    expected = parse_argdown(DOCUMENT, source_map=True)
+    argdown = parse_argdown(DOCUMENT, source_map=True, single_pass=True)
+    for label in expected.nodes:
+        assert argdown.source_map.node_mentions(label) == expected.source_map.node_mentions(label)
+    for source, target, key in expected.edges(keys=True):
+        assert (
+            argdown.source_map.relation_mentions(source, target, Valence[key])
+            == expected.source_map.relation_mentions(source, target, Valence[key])
+        )
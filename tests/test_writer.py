@@ -0,0 +1,85 @@
+"test argdown writer"
+
+import io
+from textwrap import dedent
+
+import pytest
+
+from pyargdown import dump_argdown, parse_argdown, write_argdown
+
+from synthetic import make_document
+
+
+def _normalized(argdown):
+    nodes = [
+        (label, {key: list(value) if key in ["texts", "gists"] else value for key, value in data.items()})
+        for label, data in argdown.nodes(data=True)
+    ]
+    edges = {
+        (u, v, key, tuple(sorted(data["dialectics"])))
+        for u, v, key, data in argdown.edges(keys=True, data=True)
+    }
+    return nodes, edges
+
+
+@pytest.mark.parametrize("snippet", [
+    dedent("""
+    [Claim A]: Claim A. {certainty: 0.9, tags: [a, b]}
+      + <Reason 1>: Gist of reason 1.
+      - <Reason 2>
+        <_ Undercutter.
+      >< [Claim B]: Claim B.
+
+    [Claim A]: Alternative wording.
+      + [Claim C]
+
+    <Reason 1>: Another gist. {k: v}
+
+    (1) Premise 1. {uses: []}
+        <+ [E1]: Evidence.
+    (2) [Claim C]: Claim C.
+    -- Modus ponens {uses: [1, 2]} --
+    (3) Intermediary.
+    -- {uses: [3]} --
+    (4) [Claim A]
+
+    <Reason 2>
+
+    (P1) [Claim B]
+    ----
+    (C1) Conclusion.
+        -> [Claim A]
+    """),
+    dedent("""
+    Unlabeled claim.
+        <+ Unlabeled reason.
+
+    <Argument>
+
+    (1) Premise.
+    ----
+    (2) Conclusion.
+    """),
+    make_document(8),
+])
+def test_round_trip(snippet):
+    argdown = parse_argdown(snippet)
+    text = dump_argdown(argdown)
+    assert _normalized(parse_argdown(text)) == _normalized(argdown)
+    assert dump_argdown(parse_argdown(text)) == text
+    assert parse_argdown(text).fingerprint() == argdown.fingerprint()
+
+
+def test_write_to_file():
+    argdown = parse_argdown(make_document(3))
+    file = io.StringIO()
+    write_argdown(argdown, file)
+    assert file.getvalue() == dump_argdown(argdown)
+    assert dump_argdown(parse_argdown("")) == ""
+
+
+def test_round_trip_corpus(valid_corpus_snippet):
+    argdown = parse_argdown(valid_corpus_snippet["argdown"])
+    text = dump_argdown(argdown)
+    assert _normalized(parse_argdown(text)) == _normalized(argdown)
+    assert parse_argdown(text).fingerprint() == argdown.fingerprint()